@@ -120,38 +120,74 @@ WEAPONS = {
     }
 }
 
-# Ajustes de enemigos
+# Ajustes de enemigos (única fuente de estadísticas, ver enemies.get_template)
+# Cada estadística escala con el nivel: base + por_nivel * nivel
 ENEMY_TYPES = {
     "guard": {
         "health_base": 50,
+        "health_per_level": 10,
         "damage": 5,
+        "damage_per_level": 1,
         "speed": 1.0,
+        "speed_per_level": 0.2,
         "attack_cooldown": 50,
-        "value": 10
+        "value": 10,
+        "drop_chance": 0.3,
+        "knockback_resistance": 1.0,
+        "health_bar": "damaged"  # always | damaged | never (ver HEALTH_BAR_SETTINGS)
     },
     "robot": {
         "health_base": 80,
+        "health_per_level": 10,
         "damage": 8,
+        "damage_per_level": 1,
         "speed": 0.7,
+        "speed_per_level": 0.2,
         "attack_cooldown": 60,
-        "value": 20
+        "value": 20,
+        "drop_chance": 0.3,
+        "knockback_resistance": 2.0,
+        "health_bar": "damaged"  # always | damaged | never (ver HEALTH_BAR_SETTINGS)
     },
     "chef": {
         "health_base": 60,
+        "health_per_level": 10,
         "damage": 12,
+        "damage_per_level": 1,
         "speed": 1.2,
+        "speed_per_level": 0.2,
         "attack_cooldown": 70,
-        "value": 30
+        "value": 30,
+        "drop_chance": 0.5,
+        "knockback_resistance": 1.0,
+        "health_bar": "damaged"  # always | damaged | never (ver HEALTH_BAR_SETTINGS)
     },
     "minion": {
         "health_base": 30,
+        "health_per_level": 5,
         "damage": 3,
+        "damage_per_level": 1,
         "speed": 1.5,
+        "speed_per_level": 0.1,
         "attack_cooldown": 40,
-        "value": 5
+        "value": 5,
+        "drop_chance": 0.3,
+        "knockback_resistance": 1.0,
+        "health_bar": "damaged"  # always | damaged | never (ver HEALTH_BAR_SETTINGS)
     }
 }
 
+# Barras de vida de los enemigos (tiras precalculadas, ver render.bar_strip)
+#   always  -> siempre visible
+#   damaged -> visible un rato tras recibir daño o con el ratón encima
+#   never   -> nunca
+HEALTH_BAR_SETTINGS = {
+    "width": 40,
+    "height": 5,
+    "states": 41,  # Estados de relleno de la tira (0 %, 2.5 %, ..., 100 %)
+    "show_frames": 120  # Frames visible tras recibir daño
+}
+
 # Boss para cada nivel múltiplo de 5
 BOSSES = {
     5: "chef_supremo",
@@ -160,6 +196,141 @@ BOSSES = {
     20: "robot_jefe_ultimate"
 }
 
+# Jefes: estadísticas y línea de tiempo de ataques de cada fase
+# Cada paso de la línea de tiempo se ejecuta en tres etapas:
+#   telegraph -> frames de aviso (el jefe brilla y prepara los proyectiles)
+#   fire      -> el ataque se lanza
+#   recover   -> frames de espera antes del siguiente paso
+# Ataques: fan, ring, missiles (proyectiles), shockwave, leap, summon (ver enemies.Boss)
+# "extends" copia la definición de otro jefe y sobrescribe las claves indicadas
+BOSS_TYPES = {
+    "chef_supremo": {
+        "name": "Chef Supremo Crustini",
+        "base": "chef",  # Tipo de enemigo del que toma sonidos y plantilla
+        "sprite": ["assets/images/characters/chef_boss_right.png",
+                   "assets/images/characters/chef_boss_left.png", [80, 80]],
+        "health_base": 300,
+        "health_per_level": 30,
+        "health_bar": "always",
+        "damage": 15,
+        "damage_per_level": 2,
+        "speed": 1.2,
+        "value": 200,
+        "phase_thresholds": [0.6, 0.3],  # Fracción de salud a la que cambia de fase
+        "music": "assets/sounds/music/boss_music.mp3",
+        "phase_sound": "assets/sounds/sfx/boss_phase.wav",
+        "victory_sound": "assets/sounds/sfx/victory.wav",
+        "phases": [
+            [
+                {"attack": "fan", "projectile": "utensil", "count": 3, "spread": 0.2, "damage": 15,
+                 "telegraph": 30, "recover": 60}
+            ],
+            [
+                {"attack": "leap", "damage": 30, "duration": 100, "telegraph": 45, "recover": 150},
+                {"attack": "fan", "projectile": "utensil", "count": 5, "spread": 0.2, "damage": 15,
+                 "telegraph": 30, "recover": 60}
+            ],
+            [
+                {"attack": "summon", "enemy": "chef", "count": 2, "spread": 100,
+                 "telegraph": 60, "recover": 300},
+                {"attack": "fan", "projectile": "utensil", "count": 7, "spread": 0.18, "damage": 15,
+                 "telegraph": 25, "recover": 45},
+                {"attack": "leap", "damage": 30, "duration": 100, "telegraph": 40, "recover": 120}
+            ]
+        ]
+    },
+    "robot_jefe": {
+        "name": "Exprimidor-9000",
+        "base": "robot",
+        "sprite": ["assets/images/characters/robot_boss_right.png",
+                   "assets/images/characters/robot_boss_left.png", [90, 90]],
+        "health_base": 400,
+        "health_per_level": 25,
+        "health_bar": "always",
+        "damage": 20,
+        "damage_per_level": 3,
+        "speed": 0.8,
+        "value": 250,
+        "phase_thresholds": [0.6, 0.3],
+        "phases": [
+            [
+                {"attack": "shockwave", "damage": 15, "radius": 200, "telegraph": 40, "recover": 60}
+            ],
+            [
+                {"attack": "missiles", "count": 3, "damage": 20, "speed": 8, "telegraph": 45, "recover": 150},
+                {"attack": "shockwave", "damage": 15, "radius": 200, "telegraph": 40, "recover": 60}
+            ],
+            [
+                {"attack": "ring", "projectile": "bullet", "count": 8, "damage": 15, "speed": 12,
+                 "telegraph": 30, "recover": 90},
+                {"attack": "missiles", "count": 3, "damage": 20, "speed": 8, "telegraph": 40, "recover": 120},
+                {"attack": "ring", "projectile": "bullet", "count": 8, "damage": 15, "speed": 12,
+                 "offset": 0.39, "telegraph": 20, "recover": 150}
+            ]
+        ]
+    },
+    "chef_supremo_enraged": {
+        "extends": "chef_supremo",
+        "name": "Crustini Enfurecido",
+        "health_base": 450,
+        "speed": 1.5,
+        "value": 350,
+        "phase_thresholds": [0.7, 0.4],
+        "phases": [
+            [
+                {"attack": "fan", "projectile": "utensil", "count": 5, "spread": 0.2, "damage": 18,
+                 "telegraph": 25, "recover": 45}
+            ],
+            [
+                {"attack": "leap", "damage": 35, "duration": 120, "telegraph": 35, "recover": 90},
+                {"attack": "fan", "projectile": "utensil", "count": 7, "spread": 0.18, "damage": 18,
+                 "telegraph": 25, "recover": 45}
+            ],
+            [
+                {"attack": "summon", "enemy": "chef", "count": 3, "spread": 120,
+                 "telegraph": 45, "recover": 200},
+                {"attack": "ring", "projectile": "utensil", "count": 10, "damage": 18,
+                 "telegraph": 30, "recover": 60},
+                {"attack": "leap", "damage": 35, "duration": 120, "telegraph": 30, "recover": 90}
+            ]
+        ]
+    },
+    "robot_jefe_ultimate": {
+        "extends": "robot_jefe",
+        "name": "Exprimidor-9000 Ultimate",
+        "health_base": 600,
+        "health_per_level": 30,
+        "speed": 1.0,
+        "value": 500,
+        "phase_thresholds": [0.75, 0.5, 0.25],
+        "phases": [
+            [
+                {"attack": "shockwave", "damage": 18, "radius": 240, "telegraph": 35, "recover": 50},
+                {"attack": "ring", "projectile": "bullet", "count": 8, "damage": 15, "speed": 12,
+                 "telegraph": 25, "recover": 60}
+            ],
+            [
+                {"attack": "missiles", "count": 4, "damage": 20, "speed": 9, "telegraph": 40, "recover": 120},
+                {"attack": "shockwave", "damage": 18, "radius": 240, "telegraph": 35, "recover": 50}
+            ],
+            [
+                {"attack": "ring", "projectile": "bullet", "count": 12, "damage": 15, "speed": 12,
+                 "telegraph": 25, "recover": 40},
+                {"attack": "ring", "projectile": "bullet", "count": 12, "damage": 15, "speed": 12,
+                 "offset": 0.26, "telegraph": 10, "recover": 90},
+                {"attack": "missiles", "count": 5, "damage": 20, "speed": 9, "telegraph": 35, "recover": 100}
+            ],
+            [
+                {"attack": "summon", "enemy": "robot", "count": 2, "spread": 150,
+                 "telegraph": 45, "recover": 150},
+                {"attack": "ring", "projectile": "bullet", "count": 16, "damage": 18, "speed": 13,
+                 "telegraph": 25, "recover": 45},
+                {"attack": "missiles", "count": 6, "damage": 22, "speed": 10, "telegraph": 30, "recover": 90}
+            ]
+        ]
+    }
+}
+
 # Colores
 WHITE = (255, 255, 255)
 BLACK = (0, 0, 0)
@@ -187,6 +358,51 @@ XP_SETTINGS = {
     "skill_points_per_level": 1
 }
 
+# Nivel de detalle de los enemigos (frecuencia de actualización)
+LOD_SETTINGS = {
+    "screen_margin": 100,  # Margen fuera de pantalla que aún cuenta como visible
+    "near_distance": 600,  # Distancia al jugador para considerar un enemigo cercano
+    "near_interval": 2,  # Frames entre actualizaciones de enemigos cercanos no visibles
+    "far_interval": 4  # Frames entre actualizaciones de enemigos lejanos
+}
+
+# Campo de flujo compartido para la navegación de enemigos
+FLOW_FIELD_SETTINGS = {
+    "cell_size": 40,  # Tamaño de cada celda de la rejilla en píxeles
+    "recompute_interval": 10,  # Frames entre recálculos del campo
+    "obstacle_padding": 20  # Margen alrededor de los obstáculos (radio de los enemigos)
+}
+
+# Separación entre enemigos para que no se amontonen
+SEPARATION_SETTINGS = {
+    "radius": 40,  # Distancia mínima deseada entre enemigos
+    "strength": 0.5,  # Desplazamiento máximo por vecino y frame
+    "max_neighbors": 6  # Vecinos más cercanos que se tienen en cuenta
+}
+
+# Director de oleadas (generación de enemigos)
+WAVE_SETTINGS = {
+    "wave_size": 3,  # Enemigos por oleada en el nivel 1
+    "wave_growth": 0.35,  # Enemigos extra por oleada en cada nivel
+    "wave_pause": 180,  # Frames de pausa entre oleadas
+    "group_levels": 8,  # Cada cuántos niveles aparece un enemigo más a la vez
+    "max_alive_base": 8,  # Enemigos vivos simultáneos en el nivel 1
+    "max_alive_per_level": 1,  # Enemigos vivos extra por nivel
+    "max_alive_limit": 40,  # Tope absoluto de enemigos vivos
+    "ramp_per_level": 0.03,  # Reducción del intervalo entre apariciones por nivel
+    "min_rate_factor": 0.4,  # Intervalo mínimo respecto a spawn_rate
+    "throttle_ratio": 0.9,  # Fracción del presupuesto de frame a partir de la cual se frena
+    "max_throttle": 60  # Frames seguidos que se puede frenar como mucho
+}
+
+# Ritmo de frames (el objetivo es FPS)
+PACING_SETTINGS = {
+    "idle_fps": 10,  # FPS en escenas estáticas (pausa, game over, pantallas quietas)
+    "menu_fps": 30,  # FPS de los menús animados sin nada señalado
+    "spin_ms": 1.5,  # Milisegundos finales de cada espera hechos activamente (sleep es impreciso)
+    "vsync": False  # Crear la ventana sincronizada al refresco (si el sistema no lo respeta, se espera por tiempo)
+}
+
 # Rutas de archivos importantes
 SAVE_FILE = "assets/save/progress.json"
 HIGHSCORE_FILE = "assets/save/highscores.json"
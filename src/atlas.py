@@ -0,0 +1,280 @@
+"""
+Módulo de atlas de texturas para Killer Potato
+Empaqueta los sprites pequeños en unas pocas hojas grandes y los sirve en tiempo de ejecución
+
+Uso offline (desde la raíz del proyecto):
+    python src/atlas.py
+    python src/atlas.py comprobar  (falla si el atlas está desfasado)
+
+Genera assets/images/atlas/atlas_N.png y assets/images/atlas/atlas.json. El
+índice guarda un hash de cada PNG de origen y de cada hoja generada;
+atlas_is_current() los compara con los archivos del disco (lo hacen las
+pruebas, no el juego al arrancar), así que un sprite editado sin regenerar
+el atlas no pasa desapercibido.
+En el juego, load_sprite() recorta subsuperficies de las hojas en lugar de abrir
+cada PNG por separado, y guarda en caché el resultado escalado.
+"""
+
+import os
+import json
+import hashlib
+import pygame
+
+# Directorios que se empaquetan en el atlas (los fondos se cargan aparte)
+SPRITE_DIRS = [
+    "assets/images/characters",
+    "assets/images/items",
+    "assets/images/ui",
+    "assets/images/effects",
+    "assets/images/obstacles"
+]
+
+ATLAS_DIR = "assets/images/atlas"
+ATLAS_INDEX = os.path.join(ATLAS_DIR, "atlas.json").replace("\\", "/")
+ATLAS_VERSION = 2
+
+SHEET_SIZE = 2048  # Tamaño de cada hoja del atlas
+MAX_SPRITE_SIZE = 256  # Lado máximo con el que se guarda cada sprite
+PADDING = 1  # Separación entre sprites dentro de la hoja
+
+# Clase que representa el atlas cargado en memoria
+class TextureAtlas:
+    def __init__(self, index_path=ATLAS_INDEX):
+        self.index_path = index_path
+        self.sheets = []
+        self.converted = []  # Hojas ya convertidas al formato de la pantalla
+        self.sprites = {}
+        self.loaded = False
+
+    def load(self):
+        """Cargar el índice y las hojas del atlas (una sola vez)"""
+        if self.loaded:
+            return self.sprites
+        self.loaded = True  # Las hojas se convierten al usarlas (ver sheet())
+
+        try:
+            with open(self.index_path, 'r') as file:
+                index = json.load(file)
+        except (FileNotFoundError, json.JSONDecodeError):
+            # Sin atlas: se cargarán los PNG individuales
+            return self.sprites
+
+        if index.get("version") != ATLAS_VERSION:
+            print(f"Atlas con versión incompatible en {self.index_path}, se ignora.")
+            return self.sprites
+
+        base_dir = os.path.dirname(self.index_path)
+        try:
+            for sheet_name in index.get("sheets", []):
+                self.sheets.append(pygame.image.load(os.path.join(base_dir, sheet_name)))
+        except (pygame.error, FileNotFoundError) as e:
+            print(f"No se pudo cargar el atlas: {e}")
+            self.sheets = []
+            return self.sprites
+
+        self.converted = [False] * len(self.sheets)
+        self.sprites = index.get("sprites", {})
+        return self.sprites
+
+    def get(self, path):
+        """Obtener la subsuperficie de un sprite o None si no está en el atlas"""
+        entry = self.load().get(_normalize(path))
+        if not entry:
+            return None
+        x, y, width, height = entry["rect"]
+        return self.sheet(entry["sheet"]).subsurface((x, y, width, height))
+
+    def sheet(self, number):
+        """Obtener una hoja, convertida al formato de la pantalla en cuanto haya ventana"""
+        if not self.converted[number] and pygame.display.get_surface():
+            self.sheets[number] = self.sheets[number].convert_alpha()
+            self.converted[number] = True
+        return self.sheets[number]
+
+    def fits(self, path, scale):
+        """Comprobar si el sprite del atlas tiene resolución suficiente para la escala pedida"""
+        entry = self.load().get(_normalize(path))
+        if not entry:
+            return False
+        if not entry.get("downscaled", False):
+            return True
+        if not scale:
+            return False
+        return scale[0] <= entry["rect"][2] and scale[1] <= entry["rect"][3]
+
+def _normalize(path):
+    return path.replace("\\", "/")
+
+def file_hash(path):
+    """Hash del contenido de un archivo"""
+    with open(path, 'rb') as file:
+        return hashlib.sha1(file.read()).hexdigest()
+
+# Atlas compartido y caché de imágenes ya escaladas
+_atlas = TextureAtlas()
+_image_cache = {}
+
+def load_sprite(path, scale=None):
+    """Cargar una imagen desde el atlas (o desde disco) con caché.
+
+    Las superficies devueltas se comparten entre todas las entidades,
+    así que no deben modificarse en sitio (usar copy() antes).
+    """
+    key = (path, tuple(scale) if scale else None)
+    image = _image_cache.get(key)
+    if image is not None:
+        return image
+
+    sprite = _atlas.get(path) if _atlas.fits(path, scale) else None
+    if sprite is not None:
+        if scale:
+            image = pygame.transform.smoothscale(sprite, scale)
+        else:
+            image = sprite
+    else:
+        image = pygame.image.load(path).convert_alpha()
+        if scale:
+            image = pygame.transform.scale(image, scale)
+
+    _image_cache[key] = image
+    return image
+
+def clear_cache():
+    """Vaciar la caché de imágenes escaladas"""
+    _image_cache.clear()
+
+def collect_sprites(directories=SPRITE_DIRS):
+    """Listar los PNG que se deben empaquetar"""
+    paths = []
+    for directory in directories:
+        if not os.path.isdir(directory):
+            continue
+        for name in sorted(os.listdir(directory)):
+            if name.lower().endswith(".png"):
+                paths.append(_normalize(os.path.join(directory, name)))
+    return paths
+
+def _prepare_sprite(path):
+    """Cargar un PNG y reducirlo al tamaño máximo permitido"""
+    source = pygame.image.load(path)
+    width, height = source.get_size()
+
+    # Copiar a una superficie de 32 bits con alfa (necesario para smoothscale)
+    image = pygame.Surface((width, height), pygame.SRCALPHA)
+    image.blit(source, (0, 0))
+
+    downscaled = False
+    largest = max(width, height)
+    if largest > MAX_SPRITE_SIZE:
+        factor = MAX_SPRITE_SIZE / largest
+        size = (max(1, int(width * factor)), max(1, int(height * factor)))
+        image = pygame.transform.smoothscale(image, size)
+        downscaled = True
+
+    return image, downscaled
+
+def pack_shelves(sizes, sheet_size=SHEET_SIZE, padding=PADDING):
+    """Empaquetar rectángulos por estanterías (de mayor a menor altura).
+
+    Recibe una lista de (clave, ancho, alto) y devuelve {clave: (hoja, x, y)}.
+    """
+    placements = {}
+    sheet = 0
+    x = y = shelf_height = 0
+
+    for key, width, height in sorted(sizes, key=lambda item: (-item[2], -item[1])):
+        if x + width + padding > sheet_size:
+            # Nueva estantería
+            x = 0
+            y += shelf_height
+            shelf_height = 0
+        if y + height + padding > sheet_size:
+            # Nueva hoja
+            sheet += 1
+            x = y = shelf_height = 0
+
+        placements[key] = (sheet, x, y)
+        x += width + padding
+        shelf_height = max(shelf_height, height + padding)
+
+    return placements
+
+def build_atlas(directories=SPRITE_DIRS, output_dir=ATLAS_DIR):
+    """Construir las hojas del atlas y su índice JSON"""
+    images = {}
+    downscaled = {}
+    for path in collect_sprites(directories):
+        try:
+            images[path], downscaled[path] = _prepare_sprite(path)
+        except (pygame.error, FileNotFoundError) as e:
+            print(f"Se omite {path}: {e}")
+
+    placements = pack_shelves([(path, *image.get_size()) for path, image in images.items()])
+    sheet_count = max((sheet for sheet, _, _ in placements.values()), default=-1) + 1
+    sheets = [pygame.Surface((SHEET_SIZE, SHEET_SIZE), pygame.SRCALPHA) for _ in range(sheet_count)]
+
+    index = {"version": ATLAS_VERSION, "sheets": [], "sheet_hashes": [], "sprites": {}}
+    for path, (sheet, x, y) in placements.items():
+        image = images[path]
+        sheets[sheet].blit(image, (x, y))
+        index["sprites"][path] = {
+            "sheet": sheet,
+            "rect": [x, y, image.get_width(), image.get_height()],
+            "downscaled": downscaled[path],
+            "hash": file_hash(path)
+        }
+
+    os.makedirs(output_dir, exist_ok=True)
+    for i, sheet in enumerate(sheets):
+        # Recortar la altura sobrante de la última hoja
+        used = sheet.get_bounding_rect()
+        height = min(SHEET_SIZE, used.bottom + PADDING) if used.height else 1
+        name = f"atlas_{i}.png"
+        pygame.image.save(sheet.subsurface((0, 0, SHEET_SIZE, height)), os.path.join(output_dir, name))
+        index["sheets"].append(name)
+        index["sheet_hashes"].append(file_hash(os.path.join(output_dir, name)))
+
+    with open(os.path.join(output_dir, "atlas.json"), 'w') as file:
+        json.dump(index, file, separators=(",", ":"))
+
+    print(f"Atlas generado: {len(index['sprites'])} sprites en {sheet_count} hojas.")
+    return index
+
+def atlas_is_current(directories=SPRITE_DIRS, index_path=ATLAS_INDEX):
+    """Comprobar que el atlas se generó con los PNG actuales y que sus hojas no han cambiado"""
+    try:
+        with open(index_path, 'r') as file:
+            index = json.load(file)
+    except (FileNotFoundError, json.JSONDecodeError):
+        return False
+    if index.get("version") != ATLAS_VERSION:
+        return False
+
+    sprites = index.get("sprites", {})
+    paths = collect_sprites(directories)
+    if set(sprites) != set(paths):
+        return False
+    if any(sprites[path].get("hash") != file_hash(path) for path in paths):
+        return False
+
+    base_dir = os.path.dirname(index_path)
+    try:
+        sheet_hashes = [file_hash(os.path.join(base_dir, name)) for name in index.get("sheets", [])]
+    except FileNotFoundError:
+        return False
+    return sheet_hashes == index.get("sheet_hashes")
+
+# Construcción offline del atlas
+if __name__ == "__main__":
+    import sys
+
+    # Comprobación para CI: falla si el atlas no coincide con los PNG
+    if sys.argv[1:] == ["comprobar"]:
+        if not atlas_is_current():
+            print(f"{ATLAS_INDEX} está desfasado: python src/atlas.py")
+            sys.exit(1)
+        sys.exit()
+
+    pygame.init()
+    build_atlas()
+    pygame.quit()
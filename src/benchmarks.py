@@ -0,0 +1,172 @@
+"""
+Módulo de pruebas de rendimiento para Killer Potato
+Compara la memoria y la velocidad de acceso de las entidades con __slots__ frente a __dict__
+y mide el coste de la colisión continua de proyectiles
+
+Para cada clase de entidad se crean N instancias reales y N copias
+equivalentes en una clase normal (con __dict__) con los mismos atributos.
+Se mide con tracemalloc los bytes por entidad y con perf_counter el tiempo
+de un bucle de lectura y escritura como el del juego (mover x/y y
+comprobar un contador).
+
+La prueba de colisiones lanza N proyectiles rápidos (cuchillo y rayo)
+contra un grupo fijo de enemigos con su rejilla y mide collision_system:
+el coste por proyectil debe mantenerse constante al crecer N.
+
+Uso: python src/benchmarks.py [número de entidades]
+     python src/benchmarks.py colisiones
+"""
+
+import gc
+import time
+import tracemalloc
+
+# Marca para slots sin asignar
+_UNSET = object()
+
+def slot_values(entity):
+    """Diccionario con los slots asignados de una entidad"""
+    values = {}
+    for klass in type(entity).__mro__:
+        slots = klass.__dict__.get("__slots__", ())
+        for name in (slots,) if isinstance(slots, str) else slots:
+            value = getattr(entity, name, _UNSET)
+            if value is not _UNSET:
+                values[name] = value
+    return values
+
+def make_dict_class(cls):
+    """Clase normal (con __dict__) que imita a una clase con slots"""
+    return type(cls.__name__ + "Dict", (), {})
+
+def measure_memory(factory, count):
+    """Bytes reservados por entidad al crear `count` entidades"""
+    gc.collect()
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    entities = [factory() for _ in range(count)]
+    used = tracemalloc.get_traced_memory()[0] - before
+    tracemalloc.stop()
+    return entities, used / count
+
+def measure_access(entities, rounds=50):
+    """Milisegundos por pasada de un bucle de actualización típico"""
+    start = time.perf_counter()
+    for _ in range(rounds):
+        for entity in entities:
+            entity.x += 0.5
+            entity.y -= 0.5
+            if entity.x > 10000:
+                entity.x = 0
+    return (time.perf_counter() - start) / rounds * 1000
+
+def compare(name, prototype, count):
+    """Comparar una clase con slots con su equivalente con __dict__"""
+    values = slot_values(prototype)
+    slotted_class = type(prototype)
+    dict_class = make_dict_class(slotted_class)
+
+    def slotted():
+        entity = slotted_class.__new__(slotted_class)
+        for key, value in values.items():
+            setattr(entity, key, value)
+        return entity
+
+    def plain():
+        entity = dict_class()
+        entity.__dict__.update(values)
+        return entity
+
+    slotted_entities, slotted_bytes = measure_memory(slotted, count)
+    plain_entities, plain_bytes = measure_memory(plain, count)
+    slotted_ms = measure_access(slotted_entities)
+    plain_ms = measure_access(plain_entities)
+
+    print(f"{name:<12} {len(values):>5} {plain_bytes:>9.0f} {slotted_bytes:>9.0f} "
+          f"{1 - slotted_bytes / plain_bytes:>7.0%} {plain_ms:>9.3f} {slotted_ms:>9.3f} "
+          f"{plain_ms / slotted_ms:>7.2f}x")
+
+def measure_collisions(projectiles, enemies, player, rounds=20):
+    """Milisegundos de collision_system y número de impactos por pasada"""
+    from ecs import World, collision_system
+    from spatial import SpatialHash
+
+    grid = SpatialHash()
+    grid.build(enemies)
+    elapsed = 0.0
+    for _ in range(rounds):
+        world = World()
+        for enemy in enemies:
+            world.spawn(enemy, "enemy")
+        for projectile in projectiles:
+            world.spawn(projectile, "projectile")
+        start = time.perf_counter()
+        collision_system(world, player, grid=grid)
+        elapsed += time.perf_counter() - start
+    return elapsed / rounds * 1000, len(world.hits)
+
+def collision_benchmark(counts=(250, 500, 1000, 2000, 4000), enemy_count=150):
+    """Coste de la colisión continua según el número de proyectiles"""
+    import math
+    import random
+    from enemies import create_enemy
+    from player import Player
+    from weapons import Projectile, BeamProjectile
+
+    random.seed(1)
+    player = Player()
+    enemies = []
+    for _ in range(enemy_count):
+        enemy = create_enemy("minion", 3)
+        enemy.x, enemy.y = random.uniform(0, 800), random.uniform(0, 600)
+        enemy.update_rect()
+        enemies.append(enemy)
+
+    shots = []
+    for index in range(max(counts)):
+        x, y, angle = random.uniform(0, 800), random.uniform(0, 600), random.uniform(0, 2 * math.pi)
+        if index % 4:
+            shots.append(Projectile(x, y, angle, 40, "player", 15))  # Cuchillo
+        else:
+            shots.append(BeamProjectile(x, y, angle, 30))
+
+    print(f"{enemy_count} enemigos; proyectiles a velocidad 15 y 30")
+    print(f"{'proyectiles':>11} {'ms':>9} {'us/proy':>9} {'impactos':>9}")
+    for count in counts:
+        ms, hit_count = measure_collisions(shots[:count], enemies, player)
+        print(f"{count:>11} {ms:>9.3f} {ms * 1000 / count:>9.2f} {hit_count:>9}")
+
+if __name__ == "__main__":
+    import os
+    import sys
+
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    sys.path.append(root)
+    os.chdir(root)
+
+    import pygame
+    pygame.init()
+    pygame.display.set_mode((1, 1))
+
+    if sys.argv[1:] == ["colisiones"]:
+        collision_benchmark()
+        pygame.quit()
+        sys.exit()
+
+    from enemies import create_enemy
+    from weapons import Projectile, ExplosiveProjectile
+    from levels import Obstacle
+    from game import Pickup
+
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+
+    print(f"{count} entidades por clase (solo atributos de instancia; los recursos se comparten)")
+    print(f"{'clase':<12} {'attrs':>5} {'dict B':>9} {'slots B':>9} {'ahorro':>7} "
+          f"{'dict ms':>9} {'slots ms':>9} {'acceso':>8}")
+    compare("Guard", create_enemy("guard", 3), count)
+    compare("Chef", create_enemy("chef", 3), count)
+    compare("Projectile", Projectile(100, 100, 0.5, 10), count)
+    compare("Explosive", ExplosiveProjectile(100, 100, 0.5, 10), count)
+    compare("Obstacle", Obstacle(100, 100, 50, 50, "crate"), count)
+    compare("Pickup", Pickup(100, 100, "health"), count)
+    pygame.quit()
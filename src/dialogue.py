@@ -1,11 +1,25 @@
 """
 Módulo de diálogos para Killer Potato
 Maneja la carga, visualización y gestión de todos los diálogos en el juego
+
+Los diálogos de cada nivel se escriben en assets/dialogue/levelN.json y se
+compilan offline (desde la raíz del proyecto) en un único paquete indexado:
+    python src/dialogue.py compilar
+    python src/dialogue.py comprobar  (falla si el paquete está desfasado)
+
+El paquete (nivel -> evento -> líneas) se carga una sola vez y cada consulta
+es un acceso a diccionario: ningún diálogo lee disco en mitad de la partida.
+Al compilar se valida el formato de cada línea y se guarda un hash de cada
+levelN.json; bundle_is_current() comprueba con esos hashes que el paquete no
+se ha quedado atrás (lo hacen las pruebas, no el juego al arrancar). Sin
+paquete se leen los JSON sueltos, también de una sola vez.
 """
 
 import pygame
 import os
+import re
 import json
+import hashlib
 
 # Inicializar pygame si no está inicializado
 if not pygame.get_init():
@@ -34,13 +48,22 @@ BLACK = (0, 0, 0)
 RED = (255, 0, 0)
 POTATO_BROWN = (139, 69, 19)
 
+# Atlas de texturas compartido (caché de sprites)
+try:
+    from src.atlas import load_sprite
+except ImportError:
+    from atlas import load_sprite
+
+# Escenas (el tutorial y las cutscenes se apilan sobre el juego)
+try:
+    from src.scenes import LoopScene
+except ImportError:
+    from scenes import LoopScene
+
 # Función para cargar imágenes con manejo de errores
 def load_image(path, scale=None):
     try:
-        image = pygame.image.load(path).convert_alpha()
-        if scale:
-            image = pygame.transform.scale(image, scale)
-        return image
+        return load_sprite(path, scale)
     except pygame.error as e:
         print(f"No se pudo cargar la imagen {path}: {e}")
         # Crear una superficie de reemplazo
@@ -50,22 +73,183 @@ def load_image(path, scale=None):
         pygame.draw.line(surface, (255, 0, 0), (100, 0), (0, 100), 2)
         return surface
 
+# Retratos ya cargados (también los de reemplazo, para no volver a buscarlos en disco)
+_portraits = {}
+
+def load_portrait(path, size=(100, 100)):
+    portrait = _portraits.get((path, size))
+    if portrait is None:
+        portrait = _portraits[(path, size)] = load_image(path, size)
+    return portrait
+
+def wrap_text(text, text_font, max_width):
+    """Partir el texto en líneas que quepan en max_width
+
+    Devuelve (línea, índice de inicio en el texto) para cada línea; cada
+    palabra lleva su espacio detrás, como al escribirse.
+    """
+    lines = []
+    current_line = ""
+    start = index = 0
+    for word in text.split(' '):
+        test_line = current_line + word + " "
+        if text_font.size(test_line)[0] < max_width:
+            current_line = test_line
+        else:
+            lines.append((current_line, start))
+            current_line = word + " "
+            start = index
+        index += len(word) + 1
+    lines.append((current_line, start))
+    return lines
+
+# Paquete de diálogos compilado
+DIALOGUE_DIR = "assets/dialogue"
+DIALOGUE_BUNDLE = os.path.join(DIALOGUE_DIR, "dialogues.json").replace("\\", "/")
+BUNDLE_VERSION = 2
+
+# Formato de cada línea de diálogo: campo -> tipo (solo "text" es obligatorio)
+LINE_FIELDS = {"text": str, "speaker": str, "portrait": str, "position": str}
+POSITIONS = ("bottom", "top", "left", "right")
+
+def validate_dialogues(events, source):
+    """Lista de errores de formato de los diálogos de un nivel (vacía si es válido)"""
+    if not isinstance(events, dict):
+        return [f"{source}: se esperaba un objeto evento -> líneas"]
+    errors = []
+    for event, lines in events.items():
+        if not isinstance(lines, list) or not lines:
+            errors.append(f"{source}[{event}]: se esperaba una lista de líneas no vacía")
+            continue
+        for i, line in enumerate(lines):
+            where = f"{source}[{event}][{i}]"
+            if not isinstance(line, dict):
+                errors.append(f"{where}: se esperaba un objeto")
+                continue
+            if "text" not in line:
+                errors.append(f"{where}: falta 'text'")
+            for field, value in line.items():
+                if field not in LINE_FIELDS:
+                    errors.append(f"{where}: campo desconocido '{field}'")
+                elif not isinstance(value, LINE_FIELDS[field]):
+                    errors.append(f"{where}: '{field}' debe ser texto")
+            if line.get("position", "bottom") not in POSITIONS:
+                errors.append(f"{where}: posición '{line['position']}' no válida")
+    return errors
+
+def missing_portraits(events):
+    """Retratos citados que no existen en disco (se dibujará uno de reemplazo)"""
+    return sorted({line["portrait"] for lines in events.values() for line in lines
+                   if isinstance(line.get("portrait"), str) and not os.path.exists(line["portrait"])})
+
+def level_files(directory=DIALOGUE_DIR):
+    """Nombres de los levelN.json de un directorio: {nivel: nombre}"""
+    if not os.path.isdir(directory):
+        return {}
+    files = {}
+    for name in sorted(os.listdir(directory)):
+        match = re.fullmatch(r"level(\d+)\.json", name)
+        if match:
+            files[int(match.group(1))] = name
+    return files
+
+def source_hashes(directory=DIALOGUE_DIR):
+    """Hash del contenido de cada levelN.json: {nombre: sha1}"""
+    hashes = {}
+    for name in level_files(directory).values():
+        with open(os.path.join(directory, name), 'rb') as file:
+            hashes[name] = hashlib.sha1(file.read()).hexdigest()
+    return hashes
+
+def read_level_files(directory=DIALOGUE_DIR):
+    """Leer los levelN.json de un directorio: {nivel: eventos}"""
+    levels = {}
+    for level, name in level_files(directory).items():
+        try:
+            with open(os.path.join(directory, name), 'r', encoding='utf-8') as file:
+                levels[level] = json.load(file)
+        except json.JSONDecodeError as e:
+            print(f"Error cargando diálogos de {name}: {e}")
+    return levels
+
+def build_bundle(directory=DIALOGUE_DIR, output=DIALOGUE_BUNDLE):
+    """Validar y empaquetar los diálogos de todos los niveles en un solo archivo"""
+    levels = read_level_files(directory)
+    errors = []
+    for level, events in levels.items():
+        errors.extend(validate_dialogues(events, f"level{level}.json"))
+    if errors:
+        raise ValueError("Diálogos no válidos:\n" + "\n".join(errors))
+    for level, events in levels.items():
+        for portrait in missing_portraits(events):
+            print(f"Aviso: level{level}.json usa un retrato que no existe: {portrait}")
+
+    bundle = {"version": BUNDLE_VERSION, "sources": source_hashes(directory),
+              "levels": {str(level): levels[level] for level in sorted(levels)}}
+    with open(output, 'w', encoding='utf-8') as file:
+        json.dump(bundle, file, ensure_ascii=False, separators=(",", ":"))
+
+    print(f"Paquete de diálogos generado: {len(levels)} niveles, "
+          f"{sum(len(events) for events in levels.values())} eventos.")
+    return bundle
+
+def bundle_is_current(directory=DIALOGUE_DIR, bundle_path=DIALOGUE_BUNDLE):
+    """Comprobar que el paquete se compiló con los levelN.json actuales"""
+    try:
+        with open(bundle_path, 'r', encoding='utf-8') as file:
+            bundle = json.load(file)
+    except (FileNotFoundError, json.JSONDecodeError):
+        return False
+    return bundle.get("version") == BUNDLE_VERSION and bundle.get("sources") == source_hashes(directory)
+
+# Clase que representa los diálogos cargados en memoria
+class DialogueBundle:
+    def __init__(self, bundle_path=DIALOGUE_BUNDLE, directory=DIALOGUE_DIR):
+        self.bundle_path = bundle_path
+        self.directory = directory
+        self.levels = {}
+        self.loaded = False
+
+    def load(self):
+        """Cargar el paquete (o los JSON sueltos si no existe) una sola vez"""
+        if self.loaded:
+            return self.levels
+        self.loaded = True
+
+        try:
+            with open(self.bundle_path, 'r', encoding='utf-8') as file:
+                bundle = json.load(file)
+            if bundle.get("version") == BUNDLE_VERSION:
+                self.levels = {int(level): events for level, events in bundle.get("levels", {}).items()}
+                return self.levels
+            print(f"Paquete de diálogos con versión incompatible en {self.bundle_path}, se ignora.")
+        except (FileNotFoundError, json.JSONDecodeError):
+            pass
+
+        # Sin paquete: leer todos los niveles ahora, no al disparar cada diálogo
+        self.levels = read_level_files(self.directory)
+        return self.levels
+
+    def events(self, level):
+        """Eventos de diálogo de un nivel (None si no tiene)"""
+        return self.load().get(level)
+
+# Paquete compartido
+_bundle = DialogueBundle()
+
 # Cargar diálogos de archivos
 def load_dialogues(level):
-    """Carga los diálogos para un nivel específico desde un archivo JSON"""
-    try:
-        file_path = f"assets/dialogue/level{level}.json"
-        with open(file_path, 'r', encoding='utf-8') as file:
-            return json.load(file)
-    except (FileNotFoundError, json.JSONDecodeError) as e:
-        print(f"Error cargando diálogos del nivel {level}: {e}")
-        # Devolver un diálogo de emergencia si no se puede cargar el archivo
-        return [{
-            "speaker": "Killer Potato",
-            "text": f"¡Nivel {level}! ¡Hora de aplastar humanos!",
-            "portrait": "assets/images/characters/killer_potato_dialog.png",
-            "position": "bottom"
-        }]
+    """Diálogos de un nivel (evento -> líneas) desde el paquete cargado en memoria"""
+    events = _bundle.events(level)
+    if events is not None:
+        return events
+    # Diálogo de emergencia si el nivel no tiene diálogos
+    return {"intro": [{
+        "speaker": "Killer Potato",
+        "text": f"¡Nivel {level}! ¡Hora de aplastar humanos!",
+        "portrait": "assets/images/characters/killer_potato_dialog.png",
+        "position": "bottom"
+    }]}
 
 # Clase para cuadros de diálogo
 class DialogBox:
@@ -84,6 +268,11 @@ class DialogBox:
         self.font = font
         self.font_name = font_name
         self.portrait = None
+        self.frame = None  # Fondo, borde y nombre del diálogo actual
+        self.full = None  # Diálogo completo ya compuesto (fondo y todo el texto)
+        self.box = None  # Lo revelado hasta ahora por la animación de escritura
+        self.layout = []  # (rectángulo en el cuadro, inicio, anchos de cada prefijo) por línea
+        self.revealed = 0
         self.display_index = 0
         self.display_speed = 2
         self.display_counter = 0
@@ -112,7 +301,7 @@ class DialogBox:
         
         if portrait:
             try:
-                self.portrait = load_image(portrait, (100, 100))
+                self.portrait = load_portrait(portrait)
             except:
                 self.portrait = None
         
@@ -134,8 +323,54 @@ class DialogBox:
             self.y = (HEIGHT - self.height) // 2
             self.width = WIDTH // 2 - 75
         
+        self.build_layout()
         self.visible = True
     
+    def build_layout(self):
+        """Componer una vez el cuadro y el texto del diálogo (saltos de línea y anchos)"""
+        # Fondo del cuadro de diálogo con su borde
+        self.frame = pygame.Surface((self.width, self.height), pygame.SRCALPHA)
+        self.frame.fill(self.bg_color)
+        pygame.draw.rect(self.frame, self.border_color, (0, 0, self.width, self.height), 2, border_radius=10)
+        
+        text_start_x = 120 if self.portrait else 20
+        
+        # Nombre del hablante
+        if self.speaker:
+            speaker_surface = self.font_name.render(self.speaker, True, RED)
+            self.frame.blit(speaker_surface, (text_start_x, 10))
+            text_start_y = 45
+        else:
+            text_start_y = 20
+        
+        # Texto completo ya partido en líneas, con el ancho de cada prefijo para revelarlo
+        self.full = self.frame.copy()
+        self.layout = []
+        for i, (line, start) in enumerate(wrap_text(self.text, self.font, self.width - text_start_x - 20)):
+            text_surface = self.font.render(line, True, self.text_color)
+            position = (text_start_x, text_start_y + i * 30)
+            self.full.blit(text_surface, position)
+            widths = [self.font.size(line[:count])[0] for count in range(len(line) + 1)]
+            self.layout.append((pygame.Rect(position, text_surface.get_size()), start, widths))
+        
+        self.box = self.frame.copy()
+        self.revealed = 0
+    
+    def reveal(self, count):
+        """Copiar al cuadro los caracteres nuevos desde el diálogo compuesto"""
+        if count <= self.revealed:
+            return
+        for rect, start, widths in self.layout:
+            last = len(widths) - 1
+            before = min(max(self.revealed - start, 0), last)
+            after = min(max(count - start, 0), last)
+            if after > before:
+                area = pygame.Rect(rect.x + widths[before], rect.y, widths[after] - widths[before], rect.height)
+                # Vaciar antes de copiar: así el resultado es idéntico al compuesto
+                self.box.fill((0, 0, 0, 0), area)
+                self.box.blit(self.full, area, area)
+        self.revealed = count
+    
     def queue_dialog(self, dialogs):
         """Añade una lista de diálogos a la cola para mostrarlos secuencialmente"""
         if not dialogs:
@@ -177,64 +412,24 @@ class DialogBox:
         if not self.visible:
             return
             
-        # Dibujar el fondo del cuadro de diálogo
-        dialog_surface = pygame.Surface((self.width, self.height), pygame.SRCALPHA)
-        dialog_surface.fill(self.bg_color)
-        
-        # Borde
-        pygame.draw.rect(dialog_surface, self.border_color, (0, 0, self.width, self.height), 2, border_radius=10)
-        
         # Dibujar retrato si existe
         if self.portrait:
             surface.blit(self.portrait, (self.x + 10, self.y + (self.height - self.portrait.get_height()) // 2))
-            text_start_x = 120
-        else:
-            text_start_x = 20
-        
-        # Dibujar nombre del hablante
-        if self.speaker:
-            speaker_surface = self.font_name.render(self.speaker, True, RED)
-            dialog_surface.blit(speaker_surface, (text_start_x, 10))
-            text_start_y = 45
-        else:
-            text_start_y = 20
-        
-        # Dibujar texto con animación de escritura
-        displayed_text = self.text[:self.display_index]
         
-        # Ajuste de texto para que no se salga del cuadro
-        max_width = self.width - text_start_x - 20
-        words = displayed_text.split(' ')
-        lines = []
-        current_line = ""
-        
-        for word in words:
-            test_line = current_line + word + " "
-            if self.font.size(test_line)[0] < max_width:
-                current_line = test_line
-            else:
-                lines.append(current_line)
-                current_line = word + " "
-        lines.append(current_line)
-        
-        # Dibujar líneas de texto
-        for i, line in enumerate(lines):
-            text_surface = self.font.render(line, True, self.text_color)
-            dialog_surface.blit(text_surface, (text_start_x, text_start_y + i * 30))
+        # Cuadro con el texto revelado hasta ahora (solo se copian los caracteres nuevos)
+        self.reveal(self.display_index)
+        surface.blit(self.box, (self.x, self.y))
         
         # Indicador de continuar
         if self.complete:
-            indicator_x = self.width - 30
-            indicator_y = self.height - 25
+            indicator_x = self.x + self.width - 30
+            indicator_y = self.y + self.height - 25
             animation_offset = abs(pygame.time.get_ticks() % 1000 - 500) / 500.0 * 5
             
-            pygame.draw.polygon(dialog_surface, WHITE, 
+            pygame.draw.polygon(surface, WHITE, 
                               [(indicator_x, indicator_y + animation_offset), 
                                (indicator_x + 20, indicator_y + animation_offset), 
                                (indicator_x + 10, indicator_y + 10 + animation_offset)])
-        
-        # Dibujar el cuadro de diálogo en la superficie principal
-        surface.blit(dialog_surface, (self.x, self.y))
     
     def handle_input(self, event):
         """Maneja la entrada del usuario para avanzar en el diálogo"""
@@ -265,8 +460,12 @@ class DialogBox:
         return False
 
 # Función para mostrar tutorial
-def show_tutorial(screen, level):
+def show_tutorial(scenes, level):
     """Muestra un tutorial específico para el nivel actual"""
+    scenes.push(LoopScene(tutorial_loop, level), fade=False)
+
+# Escena del tutorial: se dibuja encima de lo que había en pantalla
+def tutorial_loop(scenes, level):
     tutorials = {
         1: [
             "Usa WASD o las flechas para moverte.",
@@ -288,44 +487,46 @@ def show_tutorial(screen, level):
     # Obtener tutoriales para el nivel actual o usar un tutorial genérico
     tutorial_texts = tutorials.get(level, ["¡Sobrevive y acaba con tus enemigos!"])
     
+    # Componer una sola vez el tutorial sobre la imagen actual de la pantalla
+    screen = scenes.screen
+    layer = screen.copy()
+    
     # Dibujar fondo semi-transparente
     overlay = pygame.Surface((WIDTH, HEIGHT), pygame.SRCALPHA)
     overlay.fill((0, 0, 0, 180))
-    screen.blit(overlay, (0, 0))
+    layer.blit(overlay, (0, 0))
     
     # Dibujar título
     title = font_name.render(f"NIVEL {level} - CONSEJOS", True, RED)
-    screen.blit(title, (WIDTH//2 - title.get_width()//2, HEIGHT//2 - 100))
+    layer.blit(title, (WIDTH//2 - title.get_width()//2, HEIGHT//2 - 100))
     
     # Dibujar textos de tutorial
     for i, text in enumerate(tutorial_texts):
         tutorial_text = font.render(text, True, WHITE)
-        screen.blit(tutorial_text, (WIDTH//2 - tutorial_text.get_width()//2, HEIGHT//2 - 30 + i * 40))
+        layer.blit(tutorial_text, (WIDTH//2 - tutorial_text.get_width()//2, HEIGHT//2 - 30 + i * 40))
     
     # Dibujar indicación para continuar
     continue_text = font.render("Presiona ESPACIO para continuar", True, WHITE)
-    screen.blit(continue_text, (WIDTH//2 - continue_text.get_width()//2, HEIGHT//2 + 120))
-    
-    # Actualizar pantalla
-    pygame.display.flip()
+    layer.blit(continue_text, (WIDTH//2 - continue_text.get_width()//2, HEIGHT//2 + 120))
     
     # Esperar input
     waiting = True
     while waiting:
-        for event in pygame.event.get():
-            if event.type == pygame.QUIT:
-                pygame.quit()
-                exit()
+        for event in (yield):
             if event.type == pygame.KEYDOWN:
                 if event.key in (pygame.K_SPACE, pygame.K_RETURN, pygame.K_z):
                     waiting = False
-        
-        # Pequeña pausa para no consumir CPU
-        pygame.time.delay(10)
+        screen.blit(layer, (0, 0))
+        scenes.idle = True  # Imagen fija
 
 # Función para mostrar cutscenes entre niveles
-def show_cutscene(screen, level):
+def show_cutscene(scenes, level):
     """Muestra una cutscene entre niveles"""
+    scenes.push(LoopScene(cutscene_loop, level), fade=False)
+
+# Escena de la cutscene
+def cutscene_loop(scenes, level):
+    screen = scenes.screen
     cutscenes = {
         1: {
             "background": "assets/images/backgrounds/cutscene1.png",
@@ -385,10 +586,7 @@ def show_cutscene(screen, level):
     # Loop de la cutscene
     running = True
     while running:
-        for event in pygame.event.get():
-            if event.type == pygame.QUIT:
-                pygame.quit()
-                exit()
+        for event in (yield):
             if event.type == pygame.KEYDOWN:
                 if event.key in (pygame.K_SPACE, pygame.K_RETURN, pygame.K_z):
                     if complete:
@@ -432,12 +630,28 @@ def show_cutscene(screen, level):
         if complete:
             indicator_text = font.render("Presiona ESPACIO para continuar", True, WHITE)
             screen.blit(indicator_text, (WIDTH//2 - indicator_text.get_width()//2, HEIGHT - 50))
-        
-        pygame.display.flip()
-        pygame.time.delay(10)
+            scenes.idle = True  # Texto completo: la imagen ya no cambia
 
 # Ejemplo de uso:
 if __name__ == "__main__":
+    import sys
+    
+    # Compilación offline del paquete de diálogos
+    if sys.argv[1:] == ["compilar"]:
+        try:
+            build_bundle()
+        except ValueError as e:
+            print(e)
+            sys.exit(1)
+        sys.exit()
+    
+    # Comprobación para CI: falla si el paquete no coincide con los levelN.json
+    if sys.argv[1:] == ["comprobar"]:
+        if not bundle_is_current():
+            print(f"{DIALOGUE_BUNDLE} está desfasado: python src/dialogue.py compilar")
+            sys.exit(1)
+        sys.exit()
+    
     # Inicializar pantalla para pruebas
     screen = pygame.display.set_mode((WIDTH, HEIGHT))
     pygame.display.set_caption("Prueba de Diálogos")
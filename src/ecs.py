@@ -0,0 +1,370 @@
+"""
+Módulo ECS (entidades, componentes y sistemas) para Killer Potato
+Mundo con tablas por arquetipo y sistemas que recorren solo las tablas que les interesan
+
+Cada tipo de entidad (proyectil, enemigo, recogible...) es un arquetipo con
+un conjunto fijo de componentes. Los sistemas (movimiento, guiado, vida,
+colisión, daño y sonido) no preguntan a cada entidad qué sabe hacer: recorren
+las tablas cuyos componentes necesitan. Para añadir un tipo nuevo basta con
+registrar su arquetipo. El dibujo por capas está en render.py.
+
+Las entidades no se quitan de las listas en mitad de un recorrido: destroy()
+deja una lápida que los recorridos saltan y flush() compacta las tablas al
+final del frame (ver EntityTable).
+"""
+
+import pygame
+
+# Colisión continua de proyectiles
+try:
+    from src.spatial import sweep_rect
+except ImportError:
+    from spatial import sweep_rect
+
+# Daño en área y guiado de misiles resueltos por lotes
+try:
+    from src.weapons import resolve_area_damage, steer_missiles
+except ImportError:
+    from weapons import resolve_area_damage, steer_missiles
+
+# Componentes de cada arquetipo
+#   motion   -> update() cada frame
+#   expires  -> se destruye cuando is_expired()
+#   finishes -> se destruye cuando is_finished()
+#   bounded  -> se destruye cuando is_offscreen()
+#   impact   -> choca y daña al contacto (collision_system)
+#   homing   -> lo guía homing_system en bloque hacia el jugador
+#   render   -> se dibuja (render.Renderer, capa según render.KIND_LAYERS)
+ARCHETYPES = {
+    "pickup": ("motion", "expires", "render"),
+    "projectile": ("motion", "expires", "bounded", "impact", "render"),
+    "missile": ("homing", "expires", "bounded", "impact", "render"),
+    "hazard": ("motion", "finishes", "render"),
+    "enemy": ("render",),  # Los enemigos los actualiza el LODScheduler
+    "effect": ("motion", "finishes", "render")
+}
+
+PICKUP_SOUND = "assets/sounds/sfx/pickup.wav"
+
+# Bits del índice de hueco dentro de un handle (el resto es la generación)
+HANDLE_BITS = 20
+HANDLE_MASK = (1 << HANDLE_BITS) - 1
+
+# Tabla de un arquetipo: contenedor generacional con lápidas
+class EntityTable:
+    """Lista densa de entidades con handles estables.
+
+    remove() deja una lápida (None) en su sitio, así que se puede borrar
+    mientras otro sistema recorre la tabla y borrar dos veces no falla.
+    compact() rellena las lápidas al final del frame moviendo la última
+    entidad a cada hueco (O(1) por borrado, sin copiar la lista).
+
+    Un handle combina el hueco y su generación: si la entidad se destruye,
+    el hueco cambia de generación y el handle viejo deja de resolverse.
+    """
+
+    def __init__(self):
+        self.entities = []  # Denso; None = lápida hasta compact()
+        self.owners = []  # Posición densa -> hueco
+        self.slots = []  # Hueco -> posición densa
+        self.generations = []  # Hueco -> generación actual
+        self.free = []  # Huecos reutilizables
+        self.index = {}  # id(entidad) -> posición densa (solo vivas)
+        self.tombstones = 0
+
+    def add(self, entity):
+        """Añadir una entidad y devolver su handle"""
+        if self.free:
+            slot = self.free.pop()
+        else:
+            slot = len(self.slots)
+            self.slots.append(0)
+            self.generations.append(0)
+        position = len(self.entities)
+        self.entities.append(entity)
+        self.owners.append(slot)
+        self.slots[slot] = position
+        self.index[id(entity)] = position
+        return self.generations[slot] << HANDLE_BITS | slot
+
+    def get(self, handle):
+        """Entidad de un handle, o None si ya no existe"""
+        slot = handle & HANDLE_MASK
+        if slot >= len(self.slots) or self.generations[slot] != handle >> HANDLE_BITS:
+            return None
+        return self.entities[self.slots[slot]]
+
+    def handle_of(self, entity):
+        position = self.index.get(id(entity))
+        if position is None:
+            return None
+        slot = self.owners[position]
+        return self.generations[slot] << HANDLE_BITS | slot
+
+    def remove(self, entity):
+        """Poner una lápida en lugar de la entidad (False si ya no estaba)"""
+        position = self.index.pop(id(entity), None)
+        if position is None:
+            return False
+        self.entities[position] = None
+        slot = self.owners[position]
+        self.generations[slot] += 1
+        self.free.append(slot)
+        self.tombstones += 1
+        return True
+
+    def compact(self):
+        """Rellenar las lápidas con las últimas entidades"""
+        if not self.tombstones:
+            return
+        entities, owners, slots, index = self.entities, self.owners, self.slots, self.index
+        position = 0
+        while position < len(entities):
+            if entities[position] is not None:
+                position += 1
+                continue
+            last = entities.pop()
+            last_owner = owners.pop()
+            if position < len(entities):
+                entities[position] = last
+                owners[position] = last_owner
+                if last is not None:
+                    slots[last_owner] = position
+                    index[id(last)] = position
+        self.tombstones = 0
+
+    def clear(self):
+        self.__init__()
+
+    def __contains__(self, entity):
+        return id(entity) in self.index
+
+    def __len__(self):
+        return len(self.entities) - self.tombstones
+
+    def __iter__(self):
+        for entity in self.entities:
+            if entity is not None:
+                yield entity
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        del state["index"]  # Los id() cambian al restaurar una instantánea
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self.index = {id(entity): position for position, entity in enumerate(self.entities)
+                      if entity is not None}
+
+# Clase que contiene todas las entidades de la partida
+class World:
+    def __init__(self, archetypes=ARCHETYPES):
+        self.archetypes = {}
+        self.tables = {}  # Arquetipo -> EntityTable
+        self.by_component = {}  # Componente -> tablas que lo tienen
+        for kind, components in archetypes.items():
+            self.register(kind, components)
+
+        self.hits = []  # Daño pendiente: (objetivo, cantidad)
+        self.killed = []  # Enemigos muertos en este frame
+        self.sounds = []  # Sonidos pendientes de reproducir
+        self.destroyed = []  # Entidades destruidas en este frame (para la reserva)
+
+    def register(self, kind, components):
+        """Registrar un arquetipo nuevo con sus componentes"""
+        table = self.tables.setdefault(kind, EntityTable())
+        self.archetypes[kind] = tuple(components)
+        for component in components:
+            tables = self.by_component.setdefault(component, [])
+            if table not in tables:
+                tables.append(table)
+
+    def spawn(self, entity, kind=None):
+        """Añadir una entidad a la tabla de su arquetipo (por defecto entity.kind) y devolver su handle"""
+        return self.tables[kind or entity.kind].add(entity)
+
+    def spawn_result(self, result):
+        """Añadir lo que devuelve un update de enemigo (disparos, ondas, invocaciones)"""
+        if result is None:
+            return
+        if isinstance(result, (list, tuple)):
+            for item in result:
+                self.spawn_result(item)
+        elif isinstance(result, dict):
+            for enemy in result.get("enemies", ()):
+                self.spawn(enemy, "enemy")
+        else:
+            self.spawn(result)
+
+    def get(self, kind, handle):
+        return self.tables[kind].get(handle)
+
+    def destroy(self, entity):
+        """Quitar una entidad (queda una lápida hasta flush); destruir dos veces no hace nada"""
+        for table in self.tables.values():
+            if table.remove(entity):
+                self.destroyed.append(entity)
+                return True
+        return False
+
+    def alive(self, entity):
+        return any(entity in table for table in self.tables.values())
+
+    def query(self, kind):
+        return self.tables[kind]
+
+    def with_component(self, component):
+        return self.by_component.get(component, ())
+
+    def play(self, path):
+        self.sounds.append(path)
+
+    def flush(self, pool=None):
+        """Compactar las tablas al final del frame y devolver lo destruido a la reserva"""
+        for table in self.tables.values():
+            table.compact()
+        if pool is not None:
+            for entity in self.destroyed:
+                pool.release(entity)
+        self.destroyed.clear()
+        self.killed.clear()
+
+    def clear(self):
+        for table in self.tables.values():
+            table.clear()
+        self.hits.clear()
+        self.killed.clear()
+        self.sounds.clear()
+        self.destroyed.clear()
+
+def motion_system(world):
+    """Avanzar un frame las entidades con movimiento propio"""
+    for table in world.with_component("motion"):
+        for entity in table:
+            entity.update()
+
+def homing_system(world, player):
+    """Guiar todos los misiles hacia la posición actual del jugador"""
+    target = (player.x, player.y)
+    for table in world.with_component("homing"):
+        steer_missiles(table, target)
+
+def lifetime_system(world):
+    """Destruir lo que ha caducado o ha salido de la pantalla"""
+    destroy = world.destroy
+    for table in world.with_component("expires"):
+        for entity in table:
+            if entity.is_expired():
+                destroy(entity)
+    for table in world.with_component("finishes"):
+        for entity in table:
+            if entity.is_finished():
+                destroy(entity)
+    for table in world.with_component("bounded"):
+        for entity in table:
+            if entity.is_offscreen():
+                destroy(entity)
+
+def collision_system(world, player, obstacles=(), scroll_x=0, grid=None):
+    """Detectar contactos y dejar el daño pendiente para damage_system
+
+    Cada proyectil se prueba con el segmento que ha recorrido en el frame
+    (sweep_rect, desde prev_x/prev_y) y choca con lo primero que encuentra en
+    su camino, así que los disparos rápidos no atraviesan nada. Un disparo
+    creado después de motion_system aún no se ha movido: su segmento es solo
+    el punto donde nace, no un paso por detrás de quien dispara. Con `grid` (la rejilla de
+    enemigos del frame) solo se prueban los enemigos de las celdas que cruza.
+    """
+    destroy, hits = world.destroy, world.hits
+    enemies = [enemy for enemy in world.query("enemy") if enemy.lod_visible]
+    player_rect = player.rect
+
+    # Lo que sobresale un enemigo de su celda (su centro está en ella)
+    reach = max((max(enemy.rect.width, enemy.rect.height) for enemy in enemies), default=0) / 2
+
+    for table in world.with_component("impact"):
+        for projectile in table:
+            x, y = projectile.prev_x, projectile.prev_y  # Posición al empezar el frame
+            dx, dy = projectile.x - x, projectile.y - y
+            pad = projectile.radius
+            first, target, blocked = 2.0, None, False
+
+            # Obstáculos (en niveles lineales se desplazan con el scroll)
+            for obstacle in obstacles:
+                t = sweep_rect(x + scroll_x, y, dx, dy, obstacle.rect, pad)
+                if t is not None and t < first:
+                    first, target, blocked = t, obstacle, True
+
+            # Los disparos del jugador dañan enemigos; los de enemigos, al jugador
+            if projectile.owner == "player":
+                if grid is not None:
+                    candidates = grid.along(x, y, x + dx, y + dy, reach + pad)
+                else:
+                    candidates = enemies
+                for enemy in candidates:
+                    if enemy.lod_visible:
+                        t = sweep_rect(x, y, dx, dy, enemy.rect, pad)
+                        if t is not None and t < first:
+                            first, target, blocked = t, enemy, False
+            else:
+                t = sweep_rect(x, y, dx, dy, player_rect, pad)
+                if t is not None and t < first:
+                    first, target, blocked = t, player, False
+
+            if target is None:
+                continue
+            destroy(projectile)
+            if blocked:
+                if target.destructible and target.take_damage(projectile.damage):
+                    obstacles.remove(target)
+            else:
+                hits.append((target, projectile.damage))
+
+    # Ondas expansivas y áreas de efecto: las enemigas dañan al jugador y las
+    # del jugador a los enemigos, todas en una pasada por grupo
+    hazards = world.query("hazard")
+    if len(hazards):
+        hits.extend(resolve_area_damage([hazard for hazard in hazards if hazard.owner != "player"], (player,)))
+        hits.extend(resolve_area_damage([hazard for hazard in hazards if hazard.owner == "player"], enemies,
+                                        world.query("enemy").handle_of))
+
+    # Contacto cuerpo a cuerpo
+    for enemy in enemies:
+        if player_rect.colliderect(enemy.rect):
+            enemy.attack(player)
+
+    # Recogibles
+    for pickup in world.query("pickup"):
+        if pickup.is_collected(player):
+            pickup.apply_effect(player)
+            world.play(PICKUP_SOUND)
+            destroy(pickup)
+
+def damage_system(world, player):
+    """Aplicar el daño pendiente y destruir a los enemigos que mueran"""
+    for target, damage in world.hits:
+        if target is player:
+            player.take_damage(damage)
+        elif world.alive(target):
+            target.take_damage(damage)
+            if target.is_dead():
+                world.destroy(target)
+                world.killed.append(target)
+    world.hits.clear()
+    return world.killed
+
+# Caché de sonidos del sistema de sonido (ruta -> Sound o None)
+_sounds = {}
+
+def sound_system(world):
+    """Reproducir cada sonido pendiente una sola vez por frame"""
+    for path in set(world.sounds):
+        if path not in _sounds:
+            try:
+                _sounds[path] = pygame.mixer.Sound(path)
+            except (pygame.error, FileNotFoundError):
+                _sounds[path] = None
+        if _sounds[path]:
+            _sounds[path].play()
+    world.sounds.clear()
@@ -7,25 +7,65 @@ import pygame
 import random
 import math
 import os
+from dataclasses import dataclass
 from pygame.locals import *
 
 # Inicializar pygame si no está inicializado
 if not pygame.get_init():
     pygame.init()
 
-# Configuración de pantalla (tomar de config o usar valores por defecto)
+# Configuración de pantalla y enemigos (tomar de config o usar valores por defecto)
 try:
-    from config.settings import WIDTH, HEIGHT
+    from config.settings import (WIDTH, HEIGHT, ENEMY_TYPES, DIFFICULTY_SETTINGS, DIFFICULTY,
+                                 BOSSES, BOSS_TYPES, HEALTH_BAR_SETTINGS)
 except ImportError:
     WIDTH, HEIGHT = 800, 600
+    DIFFICULTY = "normal"
+    DIFFICULTY_SETTINGS = {
+        "normal": {
+            "enemy_health_multiplier": 1.0,
+            "enemy_damage_multiplier": 1.0,
+            "enemy_speed_multiplier": 1.0
+        }
+    }
+    ENEMY_TYPES = {
+        "guard": {"health_base": 50, "health_per_level": 10, "damage": 5, "damage_per_level": 1,
+                  "speed": 1.0, "speed_per_level": 0.2, "attack_cooldown": 50, "value": 10},
+        "robot": {"health_base": 80, "health_per_level": 10, "damage": 8, "damage_per_level": 1,
+                  "speed": 0.7, "speed_per_level": 0.2, "attack_cooldown": 60, "value": 20,
+                  "knockback_resistance": 2.0},
+        "chef": {"health_base": 60, "health_per_level": 10, "damage": 12, "damage_per_level": 1,
+                 "speed": 1.2, "speed_per_level": 0.2, "attack_cooldown": 70, "value": 30,
+                 "drop_chance": 0.5},
+        "minion": {"health_base": 30, "health_per_level": 5, "damage": 3, "damage_per_level": 1,
+                   "speed": 1.5, "speed_per_level": 0.1, "attack_cooldown": 40, "value": 5}
+    }
+    BOSSES = {5: "chef_supremo", 10: "robot_jefe"}
+    BOSS_TYPES = {}
+    HEALTH_BAR_SETTINGS = {"width": 40, "height": 5, "states": 41, "show_frames": 120}
+
+# Atlas de texturas compartido (caché de sprites)
+try:
+    from src.atlas import load_sprite
+except ImportError:
+    from atlas import load_sprite
+
+# Cachés de sprites derivados (tintes de daño)
+try:
+    from src.render import tinted, circle_sprite, bar_strip, draw_commands
+except ImportError:
+    from render import tinted, circle_sprite, bar_strip, draw_commands
+
+# Proyectiles y ataques de área que lanzan los enemigos
+try:
+    from src.weapons import Projectile, ThrownUtensil, HomingMissile, ShockWave, AreaEffect
+except ImportError:
+    from weapons import Projectile, ThrownUtensil, HomingMissile, ShockWave, AreaEffect
 
 # Función para cargar imágenes con manejo de errores
 def load_image(path, scale=None):
     try:
-        image = pygame.image.load(path).convert_alpha()
-        if scale:
-            image = pygame.transform.scale(image, scale)
-        return image
+        return load_sprite(path, scale)
     except pygame.error as e:
         print(f"No se pudo cargar la imagen {path}: {e}")
         # Crear una superficie de reemplazo
@@ -35,55 +75,188 @@ def load_image(path, scale=None):
         pygame.draw.line(surface, (255, 0, 0), (50, 0), (0, 50), 2)
         return surface
 
+# Sprites de cada tipo de enemigo: (derecha, izquierda, tamaño)
+ENEMY_SPRITES = {
+    "guard": ("assets/images/characters/human_right.png", "assets/images/characters/human_left.png", (50, 50)),
+    "robot": ("assets/images/characters/robot_right.png", "assets/images/characters/robot_left.png", (60, 60)),
+    "chef": ("assets/images/characters/chef_right.png", "assets/images/characters/chef_left.png", (55, 55)),
+    "minion": ("assets/images/characters/minion_right.png", "assets/images/characters/minion_left.png", (40, 40))
+}
+
+# Plantilla inmutable con las estadísticas y recursos de un tipo de enemigo
+@dataclass(frozen=True)
+class EnemyTemplate:
+    enemy_type: str
+    level: int
+    difficulty: str
+    health: float
+    speed: float
+    damage: float
+    attack_cooldown: int
+    value: int
+    drop_chance: float
+    knockback_resistance: float
+    health_bar: str
+    image_right: pygame.Surface
+    image_left: pygame.Surface
+    hit_sound: object = None
+    death_sound: object = None
+    attack_sound: object = None
+
+# Caché de sonidos (ruta -> Sound o None): cada archivo se carga una sola vez
+_sounds = {}
+
+def load_sound(path):
+    if path not in _sounds:
+        try:
+            _sounds[path] = pygame.mixer.Sound(path)
+        except (pygame.error, FileNotFoundError):
+            _sounds[path] = None
+    return _sounds[path]
+
+# Caché de plantillas por (tipo, nivel, dificultad)
+_templates = {}
+
+def get_template(enemy_type, level, difficulty=None):
+    """Obtener (o calcular una sola vez) la plantilla de un tipo de enemigo"""
+    if difficulty is None:
+        difficulty = DIFFICULTY
+    key = (enemy_type, level, difficulty)
+    template = _templates.get(key)
+    if template is not None:
+        return template
+
+    stats = ENEMY_TYPES[enemy_type]
+    multipliers = DIFFICULTY_SETTINGS.get(difficulty, DIFFICULTY_SETTINGS["normal"])
+    right_path, left_path, size = ENEMY_SPRITES[enemy_type]
+
+    template = EnemyTemplate(
+        enemy_type=enemy_type,
+        level=level,
+        difficulty=difficulty,
+        health=(stats["health_base"] + stats.get("health_per_level", 0) * level) * multipliers.get("enemy_health_multiplier", 1.0),
+        speed=(stats["speed"] + stats.get("speed_per_level", 0) * level) * multipliers.get("enemy_speed_multiplier", 1.0),
+        damage=(stats["damage"] + stats.get("damage_per_level", 0) * level) * multipliers.get("enemy_damage_multiplier", 1.0),
+        attack_cooldown=stats.get("attack_cooldown", 50),
+        value=stats.get("value", 10),
+        drop_chance=stats.get("drop_chance", 0.3),
+        knockback_resistance=stats.get("knockback_resistance", 1.0),
+        health_bar=stats.get("health_bar", "damaged"),
+        image_right=load_image(right_path, size),
+        image_left=load_image(left_path, size),
+        hit_sound=load_sound("assets/sounds/sfx/enemy_hit.wav"),
+        death_sound=load_sound("assets/sounds/sfx/enemy_death.wav"),
+        attack_sound=load_sound("assets/sounds/sfx/enemy_attack.wav")
+    )
+    _templates[key] = template
+    return template
+
+# Marca para slots sin asignar (p. ej. el arma de un guardia de nivel 1)
+_UNSET = object()
+
+# Nombres de slots de una clase y sus bases, calculados una sola vez
+_slot_cache = {}
+
+def _slot_names(cls):
+    names = _slot_cache.get(cls)
+    if names is None:
+        names = []
+        for klass in cls.__mro__:
+            slots = klass.__dict__.get("__slots__", ())
+            names.extend((slots,) if isinstance(slots, str) else slots)
+        _slot_cache[cls] = names = tuple(names)
+    return names
+
+# Jefe genérico para tipos sin definición en BOSS_TYPES
+DEFAULT_BOSS = {
+    "base": "chef",
+    "phases": [[{"attack": "fan", "projectile": "utensil", "count": 3, "spread": 0.2,
+                 "telegraph": 30, "recover": 60}]]
+}
+
+# Ataques de jefe que lanzan proyectiles (se reservan durante el aviso)
+PROJECTILE_ATTACKS = ("fan", "ring", "missiles")
+UTENSIL_TYPES = ["cuchillo", "tenedor", "sartén"]
+
+# Definiciones de jefe ya resueltas (con "extends" aplicado)
+_boss_specs = {}
+
+def get_boss_spec(boss_type):
+    """Definición completa de un jefe, heredando de su "extends" si lo tiene"""
+    spec = _boss_specs.get(boss_type)
+    if spec is None:
+        data = BOSS_TYPES.get(boss_type, DEFAULT_BOSS)
+        spec = dict(get_boss_spec(data["extends"])) if "extends" in data else {}
+        spec.update(data)
+        spec.pop("extends", None)
+        _boss_specs[boss_type] = spec
+    return spec
+
 # Clase base de enemigo
 class Enemy:
-    def __init__(self, level, enemy_type="human"):
+    # Atributos fijos por instancia (sin __dict__: menos memoria y acceso más rápido)
+    __slots__ = (
+        "radius", "speed", "health", "max_health", "damage", "attack_cooldown",
+        "attack_counter", "facing_right", "hit_effect", "enemy_type", "level", "value",
+        "drop_chance", "knockback_resistance", "hit_sound", "death_sound", "attack_sound",
+        "image_right", "image_left", "x", "y", "rect", "health_bar", "bar_timer",
+        "lod_visible", "lod_pending"  # Estado del nivel de detalle (lo gestiona LODScheduler)
+    )
+    
+    kind = "enemy"  # Arquetipo en el mundo ECS
+    always_update = False  # Actualizar siempre a frecuencia completa
+    is_boss = False
+    
+    # Campo de flujo compartido por todos los enemigos (ver pathfinding.py)
+    flow_field = None
+    
+    # Reserva de proyectiles compartida (ver pool.py)
+    projectile_pool = None
+    
+    # Posición del ratón en este frame (la actualiza el juego; muestra la barra de vida)
+    pointer = (-1, -1)
+    
+    def __init__(self, level, enemy_type="guard"):
+        # Estadísticas y recursos compartidos (ENEMY_TYPES x DIFFICULTY_SETTINGS)
+        template = get_template(enemy_type, level)
+        
         self.radius = 20
-        self.speed = 1 + level * 0.2  # Los enemigos se vuelven más rápidos con cada nivel
-        self.health = 50 + level * 10  # Los enemigos se vuelven más resistentes con cada nivel
-        self.max_health = 50 + level * 10  # Salud máxima para calcular porcentaje
-        self.damage = 5 + level  # Los enemigos hacen más daño con cada nivel
-        self.attack_cooldown = 50
+        self.speed = template.speed
+        self.health = template.health
+        self.max_health = template.health  # Salud máxima para calcular porcentaje
+        self.damage = template.damage
+        self.attack_cooldown = template.attack_cooldown
         self.attack_counter = 0
         self.facing_right = True
         self.hit_effect = 0  # Contador para efecto de daño
         self.enemy_type = enemy_type
         self.level = level
-        self.value = 10  # Puntos base que da al ser eliminado
-        self.drop_chance = 0.3  # Probabilidad de soltar un ítem
-        self.knockback_resistance = 1.0  # Resistencia al retroceso
-        
-        # Sonidos
-        self.hit_sound = None
-        self.death_sound = None
-        self.attack_sound = None
-        
-        try:
-            self.hit_sound = pygame.mixer.Sound("assets/sounds/sfx/enemy_hit.wav")
-            self.death_sound = pygame.mixer.Sound("assets/sounds/sfx/enemy_death.wav")
-            self.attack_sound = pygame.mixer.Sound("assets/sounds/sfx/enemy_attack.wav")
-        except:
-            pass
-        
-        # Cargar imágenes del enemigo según tipo
-        if enemy_type == "human":
-            self.image_right = load_image("assets/images/characters/human_right.png", (50, 50))
-            self.image_left = load_image("assets/images/characters/human_left.png", (50, 50))
-        elif enemy_type == "robot":
-            self.image_right = load_image("assets/images/characters/robot_right.png", (60, 60))
-            self.image_left = load_image("assets/images/characters/robot_left.png", (60, 60))
-            self.health += 30  # Robots más resistentes
-            self.speed -= 0.3  # Robots más lentos
-            self.value = 20  # Más puntos
-            self.knockback_resistance = 2.0  # Más resistentes al retroceso
-        elif enemy_type == "chef":
-            self.image_right = load_image("assets/images/characters/chef_right.png", (55, 55))
-            self.image_left = load_image("assets/images/characters/chef_left.png", (55, 55))
-            self.damage += 10  # Chef hace más daño
-            self.value = 30  # Aún más puntos
-            self.drop_chance = 0.5  # Mayor probabilidad de soltar ítems
+        self.value = template.value  # Puntos que da al ser eliminado
+        self.drop_chance = template.drop_chance  # Probabilidad de soltar un ítem
+        self.knockback_resistance = template.knockback_resistance  # Resistencia al retroceso
+        self.health_bar = template.health_bar  # Cuándo mostrar la barra de vida
+        self.bar_timer = 0  # Frames que la barra sigue visible tras recibir daño
+        
+        # Sonidos e imágenes (compartidos entre todos los enemigos del mismo tipo)
+        self.hit_sound = template.hit_sound
+        self.death_sound = template.death_sound
+        self.attack_sound = template.attack_sound
+        self.image_right = template.image_right
+        self.image_left = template.image_left
+        
+        # Nivel de detalle: visible y sin frames pendientes
+        self.lod_visible = True
+        self.lod_pending = 0
         
         # Posición inicial (fuera de la pantalla)
+        self.place_offscreen()
+            
+        # Obtener rectángulo para colisiones
+        self.rect = self.image_right.get_rect()
+        self.update_rect()
+        
+    def place_offscreen(self):
+        """Colocar al enemigo en un borde aleatorio fuera de la pantalla"""
         side = random.randint(0, 3)
         if side == 0:  # Superior
             self.x = random.randint(0, WIDTH)
@@ -97,15 +270,23 @@ class Enemy:
         else:  # Izquierda
             self.x = -self.radius
             self.y = random.randint(0, HEIGHT)
-            
-        # Obtener rectángulo para colisiones
-        self.rect = self.image_right.get_rect()
-        self.update_rect()
+    
+    def clone(self):
+        """Copiar el enemigo compartiendo recursos; solo se duplica el estado mutable"""
+        enemy = self.__class__.__new__(self.__class__)
+        for name in _slot_names(self.__class__):
+            value = getattr(self, name, _UNSET)
+            if value is not _UNSET:
+                setattr(enemy, name, value)
+        enemy.rect = self.rect.copy()
+        enemy.place_offscreen()
+        enemy.update_rect()
+        return enemy
         
     def update_rect(self):
         self.rect.center = (self.x, self.y)
     
-    def update(self, player_x, player_y):
+    def update(self, player_x, player_y, obstacles=None, dt=1):
         # Moverse hacia el jugador
         dx = player_x - self.x
         dy = player_y - self.y
@@ -115,8 +296,15 @@ class Enemy:
             dx /= dist
             dy /= dist
         
-        self.x += dx * self.speed
-        self.y += dy * self.speed
+        # Rodear obstáculos siguiendo el campo de flujo
+        if self.flow_field is not None:
+            direction = self.flow_field.sample(self.x, self.y)
+            if direction:
+                dx, dy = direction
+        
+        # dt: frames transcurridos desde la última actualización (ver lod.py)
+        self.x += dx * self.speed * dt
+        self.y += dy * self.speed * dt
         
         # Actualizar dirección de vista
         self.facing_right = dx > 0
@@ -126,42 +314,58 @@ class Enemy:
         
         # Actualizar contador de ataque
         if self.attack_counter > 0:
-            self.attack_counter -= 1
+            self.attack_counter -= dt
             
         # Actualizar efecto de daño
         if self.hit_effect > 0:
-            self.hit_effect -= 1
+            self.hit_effect -= dt
+        if self.bar_timer > 0:
+            self.bar_timer -= dt
     
-    def draw(self, screen):
+    def batch(self, commands):
+        """Órdenes de dibujo: el cuerpo va en el lote de imágenes; indicadores y barra, aparte"""
         # Seleccionar imagen según dirección
         enemy_image = self.image_right if self.facing_right else self.image_left
         
-        # Aplicar efecto de daño (parpadeo rojo)
+        # Aplicar efecto de daño (parpadeo rojo, teñido una sola vez por imagen)
         if self.hit_effect > 0:
-            # Crear una copia de la imagen para modificarla
-            damaged_image = enemy_image.copy()
-            damaged_image.fill((255, 0, 0, 128), special_flags=pygame.BLEND_RGBA_MULT)
-            screen.blit(damaged_image, (self.x - enemy_image.get_width() // 2, self.y - enemy_image.get_height() // 2))
-        else:
-            # Dibujar enemigo normal
-            screen.blit(enemy_image, (self.x - enemy_image.get_width() // 2, self.y - enemy_image.get_height() // 2))
-        
-        # Barra de vida (siempre visible)
-        bar_width = 40
-        health_percentage = max(0, self.health / self.max_health)
-        bar_height = 5
-        bar_y = self.y - self.radius - 10
-        
-        # Fondo de la barra (rojo)
-        pygame.draw.rect(screen, (255, 0, 0), (self.x - bar_width//2, bar_y, bar_width, bar_height))
-        # Parte de salud (verde)
-        pygame.draw.rect(screen, (0, 255, 0), (self.x - bar_width//2, bar_y, bar_width * health_percentage, bar_height))
-        # Borde de la barra
-        pygame.draw.rect(screen, (0, 0, 0), (self.x - bar_width//2, bar_y, bar_width, bar_height), 1)
+            enemy_image = tinted(enemy_image, (255, 0, 0, 128))
+        commands.append((enemy_image, (self.x - enemy_image.get_width() // 2, self.y - enemy_image.get_height() // 2)))
+        
+        # Barra de vida: un blit de la tira precalculada
+        if self.health_bar_visible():
+            width, height, states = (HEALTH_BAR_SETTINGS["width"], HEALTH_BAR_SETTINGS["height"],
+                                     HEALTH_BAR_SETTINGS["states"])
+            strip, areas = bar_strip(width, height, states)
+            state = round(max(0, min(1, self.health / self.max_health)) * (states - 1))
+            commands.append((strip, (self.x - width // 2, self.y - self.radius - 10), areas[state]))
+        
+        self.batch_overlay(commands)
+    
+    def draw(self, screen):
+        commands = []
+        self.batch(commands)
+        draw_commands(screen, commands)
+    
+    def health_bar_visible(self):
+        """La barra se ve según el tipo: siempre, nunca o tras recibir daño / con el ratón encima"""
+        if self.health_bar == "always":
+            return True
+        if self.health_bar == "never":
+            return False
+        return self.bar_timer > 0 or self.rect.collidepoint(Enemy.pointer)
+    
+    def batch_overlay(self, commands):
+        """Indicadores sobre el enemigo (los añaden los subtipos)"""
+    
+    def indicator(self, color):
+        """Punto indicador sobre la cabeza como orden de dibujo"""
+        return (circle_sprite(color, 3), (int(self.x) - 3, int(self.y - self.radius - 15) - 3))
     
     def take_damage(self, damage, knockback_x=0, knockback_y=0):
         self.health -= damage
         self.hit_effect = 5  # Duración del efecto de daño en frames
+        self.bar_timer = HEALTH_BAR_SETTINGS["show_frames"]
         
         # Aplicar retroceso (knockback)
         if knockback_x != 0 or knockback_y != 0:
@@ -214,9 +418,10 @@ class Enemy:
 
 # Clase de enemigo: Guardia
 class Guard(Enemy):
+    __slots__ = ("has_gun", "shoot_cooldown", "shoot_counter", "shoot_range")
+    
     def __init__(self, level):
-        super().__init__(level, "human")
-        self.value = 10  # Puntos base
+        super().__init__(level, "guard")
         
         # Guardias armados en niveles superiores
         if level >= 2:
@@ -227,7 +432,7 @@ class Guard(Enemy):
         else:
             self.has_gun = False
     
-    def update(self, player_x, player_y):
+    def update(self, player_x, player_y, obstacles=None, dt=1):
         dist = math.sqrt((player_x - self.x)**2 + (player_y - self.y)**2)
         
         # Si tiene arma y está en rango, intentar disparar
@@ -236,11 +441,11 @@ class Guard(Enemy):
                 self.shoot_counter = self.shoot_cooldown
                 return self.shoot(player_x, player_y)
             else:
-                self.shoot_counter -= 1
+                self.shoot_counter -= dt
                 
             # Si está en rango para disparar, moverse menos (mantener distancia)
             if dist > self.shoot_range * 0.5:
-                super().update(player_x, player_y)
+                super().update(player_x, player_y, obstacles, dt)
             else:
                 # Mantener distancia
                 dx = -(player_x - self.x) * 0.5
@@ -249,20 +454,18 @@ class Guard(Enemy):
                 dx /= dist
                 dy /= dist
                 
-                self.x += dx * self.speed * 0.5
-                self.y += dy * self.speed * 0.5
+                self.x += dx * self.speed * 0.5 * dt
+                self.y += dy * self.speed * 0.5 * dt
                 
                 # Actualizar dirección de vista y rectángulo
                 self.facing_right = player_x > self.x
                 self.update_rect()
         else:
             # Comportamiento estándar
-            super().update(player_x, player_y)
+            super().update(player_x, player_y, obstacles, dt)
             
     def shoot(self, player_x, player_y):
         """El guardia dispara al jugador"""
-        from weapons import Projectile  # Importación local para evitar ciclos
-        
         # Calcular dirección del disparo
         dx = player_x - self.x
         dy = player_y - self.y
@@ -275,38 +478,35 @@ class Guard(Enemy):
         projectile = Projectile(self.x, self.y, angle, 10, "enemy")
         
         # Reproducir sonido de disparo
-        try:
-            shoot_sound = pygame.mixer.Sound("assets/sounds/sfx/enemy_shoot.wav")
+        shoot_sound = load_sound("assets/sounds/sfx/enemy_shoot.wav")
+        if shoot_sound:
             shoot_sound.play()
-        except:
-            pass
             
         return projectile
         
-    def draw(self, screen):
-        super().draw(screen)
-        
-        # Dibujar indicador de guardia armado
+    def batch_overlay(self, commands):
+        # Indicador de guardia armado
         if self.has_gun:
-            indicator_color = (255, 100, 100)  # Rojo claro
-            pygame.draw.circle(screen, indicator_color, (int(self.x), int(self.y - self.radius - 15)), 3)
+            commands.append(self.indicator((255, 100, 100, 255)))  # Rojo claro
 
 # Clase de enemigo: Robot
 class Robot(Enemy):
+    __slots__ = ("special_attack_cooldown", "special_attack_counter",
+                 "special_attack_range", "special_attack_damage")
+    
     def __init__(self, level):
         super().__init__(level, "robot")
-        self.value = 20
         self.special_attack_cooldown = 150
         self.special_attack_counter = 0
         self.special_attack_range = 200
         self.special_attack_damage = 15 + level * 2
     
-    def update(self, player_x, player_y):
-        super().update(player_x, player_y)
+    def update(self, player_x, player_y, obstacles=None, dt=1):
+        super().update(player_x, player_y, obstacles, dt)
         
         # Actualizar contador de ataque especial
         if self.special_attack_counter > 0:
-            self.special_attack_counter -= 1
+            self.special_attack_counter -= dt
             
     def special_attack(self, player):
         """Ataque especial del robot: daño en área"""
@@ -322,19 +522,18 @@ class Robot(Enemy):
                 return True
         return False
         
-    def draw(self, screen):
-        super().draw(screen)
-        
-        # Mostrar indicador de ataque especial cargado
+    def batch_overlay(self, commands):
+        # Indicador de ataque especial cargado
         if self.special_attack_counter <= 0:
-            indicator_color = (0, 255, 255)  # Cian
-            pygame.draw.circle(screen, indicator_color, (int(self.x), int(self.y - self.radius - 15)), 3)
+            commands.append(self.indicator((0, 255, 255, 255)))  # Cian
 
 # Clase de enemigo: Chef
 class Chef(Enemy):
+    __slots__ = ("throw_cooldown", "throw_counter", "throw_range", "throw_speed",
+                 "weapon_types", "current_weapon")
+    
     def __init__(self, level):
         super().__init__(level, "chef")
-        self.value = 30
         self.throw_cooldown = 80
         self.throw_counter = 0
         self.throw_range = 250
@@ -342,7 +541,12 @@ class Chef(Enemy):
         self.weapon_types = ["cuchillo", "tenedor", "sartén"]
         self.current_weapon = random.choice(self.weapon_types)
         
-    def update(self, player_x, player_y):
+    def clone(self):
+        enemy = super().clone()
+        enemy.current_weapon = random.choice(self.weapon_types)
+        return enemy
+        
+    def update(self, player_x, player_y, obstacles=None, dt=1):
         dist = math.sqrt((player_x - self.x)**2 + (player_y - self.y)**2)
         
         # Si está en rango, intentar lanzar un utensilio
@@ -351,7 +555,7 @@ class Chef(Enemy):
                 self.throw_counter = self.throw_cooldown
                 return self.throw_utensil(player_x, player_y)
             else:
-                self.throw_counter -= 1
+                self.throw_counter -= dt
             
             # Mantener distancia si está en rango
             if dist < self.throw_range * 0.6:
@@ -361,8 +565,8 @@ class Chef(Enemy):
                 dx /= dist
                 dy /= dist
                 
-                self.x += dx * self.speed
-                self.y += dy * self.speed
+                self.x += dx * self.speed * dt
+                self.y += dy * self.speed * dt
                 
                 # Actualizar dirección y rectángulo
                 self.facing_right = player_x > self.x
@@ -370,13 +574,11 @@ class Chef(Enemy):
                 return None
                 
         # Comportamiento estándar
-        super().update(player_x, player_y)
+        super().update(player_x, player_y, obstacles, dt)
         return None
         
     def throw_utensil(self, player_x, player_y):
         """El chef lanza un utensilio de cocina"""
-        from weapons import ThrownUtensil  # Importación local para evitar ciclos
-        
         # Calcular dirección del lanzamiento
         dx = player_x - self.x
         dy = player_y - self.y
@@ -392,88 +594,64 @@ class Chef(Enemy):
         utensil = ThrownUtensil(self.x, self.y, angle, 15, utensil_type)
         
         # Reproducir sonido de lanzamiento
-        try:
-            throw_sound = pygame.mixer.Sound("assets/sounds/sfx/throw.wav")
+        throw_sound = load_sound("assets/sounds/sfx/throw.wav")
+        if throw_sound:
             throw_sound.play()
-        except:
-            pass
             
         return utensil
         
-    def draw(self, screen):
-        super().draw(screen)
-        
-        # Mostrar indicador de lanzamiento listo
+    def batch_overlay(self, commands):
+        # Indicador de lanzamiento listo
         if self.throw_counter <= 0:
-            indicator_color = (255, 165, 0)  # Naranja
-            pygame.draw.circle(screen, indicator_color, (int(self.x), int(self.y - self.radius - 15)), 3)
+            commands.append(self.indicator((255, 165, 0, 255)))  # Naranja
 
 # Clase de enemigo: Jefe (Boss)
 class Boss(Enemy):
-    def __init__(self, level, boss_type):
+    __slots__ = (
+        "boss_type", "name", "phase", "max_phases", "phases",
+        "boss_music", "phase_change_sound", "victory_sound", "phase_health_thresholds",
+        "step_index", "stage", "stage_timer", "invulnerable", "invulnerable_counter",
+        "entrance_animation", "entrance_counter"
+    )
+    
+    always_update = True  # Los jefes nunca reducen su frecuencia
+    is_boss = True
+    name_labels = {}  # Nombre -> texto ya renderizado (compartido entre jefes)
+    
+    def __init__(self, level, boss_type, timeline=None):
+        spec = get_boss_spec(boss_type)
         self.boss_type = boss_type
+        super().__init__(level, spec.get("base", "chef"))
         
-        # Configuración según tipo de jefe
-        if boss_type == "chef_supremo":
-            super().__init__(level, "chef")
-            self.name = "Chef Supremo Crustini"
-            self.health = 300 + level * 30
-            self.max_health = self.health
-            self.speed = 1.2
-            self.value = 200
-            self.damage = 15 + level * 2
-            self.phase = 1
-            self.max_phases = 3
-            self.attack_patterns = [
-                self.attack_pattern_1,
-                self.attack_pattern_2,
-                self.attack_pattern_3
-            ]
-            
-            # Cargar imágenes específicas del jefe
-            try:
-                self.image_right = load_image("assets/images/characters/chef_boss_right.png", (80, 80))
-                self.image_left = load_image("assets/images/characters/chef_boss_left.png", (80, 80))
-            except:
-                pass
-                
-            # Sonidos específicos
-            try:
-                self.boss_music = pygame.mixer.Sound("assets/sounds/music/boss_music.mp3")
-                self.phase_change_sound = pygame.mixer.Sound("assets/sounds/sfx/boss_phase.wav")
-                self.victory_sound = pygame.mixer.Sound("assets/sounds/sfx/victory.wav")
-            except:
-                pass
-                
-        elif boss_type == "robot_jefe":
-            super().__init__(level, "robot")
-            self.name = "Exprimidor-9000"
-            self.health = 400 + level * 25
-            self.max_health = self.health
-            self.speed = 0.8
-            self.value = 250
-            self.damage = 20 + level * 3
-            self.phase = 1
-            self.max_phases = 3
-            self.attack_patterns = [
-                self.attack_pattern_1,
-                self.attack_pattern_2,
-                self.attack_pattern_3
-            ]
-            
-            # Cargar imágenes específicas del jefe
-            try:
-                self.image_right = load_image("assets/images/characters/robot_boss_right.png", (90, 90))
-                self.image_left = load_image("assets/images/characters/robot_boss_left.png", (90, 90))
-            except:
-                pass
-        
-        # Timers y contadores
-        self.phase_health_thresholds = [self.max_health * 0.6, self.max_health * 0.3]
+        # Estadísticas según la definición del jefe (BOSS_TYPES en config)
+        difficulty = DIFFICULTY_SETTINGS.get(DIFFICULTY, DIFFICULTY_SETTINGS.get("normal", {}))
+        self.name = spec.get("name", boss_type)
+        self.health = int((spec.get("health_base", 300) + spec.get("health_per_level", 0) * level)
+                          * difficulty.get("boss_health_multiplier", 1.0))
+        self.max_health = self.health
+        self.speed = spec.get("speed", 1.0)
+        self.value = spec.get("value", 200)
+        self.health_bar = spec.get("health_bar", "always")
+        self.damage = spec.get("damage", 15) + spec.get("damage_per_level", 0) * level
         self.attack_cooldown = 60
         self.attack_counter = 0
-        self.special_cooldown = 150
-        self.special_counter = 0
+        
+        # Imágenes y sonidos específicos
+        if spec.get("sprite"):
+            right_path, left_path, size = spec["sprite"]
+            self.image_right = load_image(right_path, tuple(size))
+            self.image_left = load_image(left_path, tuple(size))
+            self.radius = size[0] // 2
+            self.rect = self.image_right.get_rect()
+            self.update_rect()
+        self.boss_music = load_sound(spec["music"]) if spec.get("music") else None
+        self.phase_change_sound = load_sound(spec["phase_sound"]) if spec.get("phase_sound") else None
+        self.victory_sound = load_sound(spec["victory_sound"]) if spec.get("victory_sound") else None
+        
+        # Fases y línea de tiempo de ataques (el nivel puede traer la suya)
+        self.phase = 1
+        self.phase_health_thresholds = [self.max_health * ratio for ratio in spec.get("phase_thresholds", [0.6, 0.3])]
+        self.set_timeline(timeline or spec.get("phases", []))
         self.invulnerable = False
         self.invulnerable_counter = 0
         
@@ -482,17 +660,44 @@ class Boss(Enemy):
         self.entrance_counter = 180  # 3 segundos a 60 FPS
         
         # Iniciar música de jefe si existe
-        if hasattr(self, 'boss_music'):
+        if self.boss_music:
             try:
                 pygame.mixer.music.stop()
                 self.boss_music.play(-1)
             except:
                 pass
     
-    def update(self, player_x, player_y):
+    def set_timeline(self, phases):
+        """Cambiar la línea de tiempo de ataques (una lista de pasos por fase)"""
+        self.phases = [list(steps) for steps in phases if steps]
+        self.max_phases = max(len(self.phases), len(self.phase_health_thresholds) + 1)
+        self.step_index = 0
+        self.begin_step()
+    
+    def current_step(self):
+        if not self.phases:
+            return None
+        steps = self.phases[min(self.phase, len(self.phases)) - 1]
+        return steps[self.step_index % len(steps)]
+    
+    def begin_step(self):
+        """Empezar el aviso del paso actual de la línea de tiempo"""
+        step = self.current_step()
+        self.stage = "telegraph"
+        self.stage_timer = step.get("telegraph", 30) if step else 0
+    
+    def prepare_step(self, step):
+        """Reservar poco a poco los proyectiles del próximo ataque durante el aviso"""
+        if self.projectile_pool is None or step.get("attack") not in PROJECTILE_ATTACKS:
+            return
+        cls, args = self.projectile_spec(step.get("projectile", "missile" if step["attack"] == "missiles" else "bullet"),
+                                         0, step.get("damage", self.damage), step.get("speed", 12))
+        self.projectile_pool.reserve(cls, step.get("count", 1), *args, budget=2)
+    
+    def update(self, player_x, player_y, obstacles=None, dt=1):
         # Animación de entrada
         if self.entrance_animation:
-            self.entrance_counter -= 1
+            self.entrance_counter -= dt
             if self.entrance_counter <= 0:
                 self.entrance_animation = False
             return None
@@ -504,27 +709,29 @@ class Boss(Enemy):
         
         # Si es invulnerable, no procesar más allá
         if self.invulnerable:
-            self.invulnerable_counter -= 1
+            self.invulnerable_counter -= dt
             if self.invulnerable_counter <= 0:
                 self.invulnerable = False
             return None
-            
-        # Actualizar contadores
-        if self.attack_counter > 0:
-            self.attack_counter -= 1
-            
-        if self.special_counter > 0:
-            self.special_counter -= 1
-            
-        # Elegir patrón de ataque según fase actual
-        if self.attack_counter <= 0 and self.special_counter <= 0:
-            attack_result = self.attack_patterns[self.phase - 1](player_x, player_y)
-            if attack_result:
-                return attack_result
+        
+        # Avanzar la línea de tiempo: aviso -> disparo -> recuperación
+        result = None
+        step = self.current_step()
+        if step:
+            self.stage_timer -= dt
+            if self.stage == "telegraph":
+                self.prepare_step(step)
+                if self.stage_timer <= 0:
+                    result = self.fire(step, player_x, player_y)
+                    self.stage = "recover"
+                    self.stage_timer = step.get("recover", 60)
+            elif self.stage_timer <= 0:
+                self.step_index += 1
+                self.begin_step()
         
         # Movimiento básico
-        super().update(player_x, player_y)
-        return None
+        super().update(player_x, player_y, obstacles, dt)
+        return result
         
     def change_phase(self):
         """Cambiar a la siguiente fase del jefe"""
@@ -532,8 +739,12 @@ class Boss(Enemy):
         self.invulnerable = True
         self.invulnerable_counter = 60  # 1 segundo de invulnerabilidad
         
+        # La nueva fase empieza su línea de tiempo desde el principio
+        self.step_index = 0
+        self.begin_step()
+        
         # Reproducir sonido de cambio de fase
-        if hasattr(self, 'phase_change_sound'):
+        if self.phase_change_sound:
             try:
                 self.phase_change_sound.play()
             except:
@@ -541,91 +752,72 @@ class Boss(Enemy):
                 
         # Efecto visual de cambio de fase
         return "phase_change"
-        
-    def attack_pattern_1(self, player_x, player_y):
-        """Patrón de ataque de la fase 1 - Básico"""
-        self.attack_counter = self.attack_cooldown
-        
-        # Patrón específico según el tipo de jefe
-        if self.boss_type == "chef_supremo":
-            # Lanzar 3 proyectiles en forma de abanico
-            projectiles = []
-            
-            base_angle = math.atan2(player_y - self.y, player_x - self.x)
-            for i in range(-1, 2):
-                from weapons import ThrownUtensil
-                angle = base_angle + i * 0.2  # Separación de 0.2 radianes
-                utensil = ThrownUtensil(self.x, self.y, angle, 15, random.choice(["cuchillo", "tenedor", "sartén"]))
-                projectiles.append(utensil)
-                
-            return projectiles
-            
-        elif self.boss_type == "robot_jefe":
-            # Generar una onda expansiva
-            from weapons import ShockWave
-            wave = ShockWave(self.x, self.y, 15, 200)
-            return wave
-            
-        return None
-        
-    def attack_pattern_2(self, player_x, player_y):
-        """Patrón de ataque de la fase 2 - Intermedio"""
-        self.special_counter = self.special_cooldown
-        
-        # Patrón específico según el tipo de jefe
-        if self.boss_type == "chef_supremo":
-            # Salto hacia el jugador con daño en área
-            self.x = player_x
-            self.y = player_y
-            self.update_rect()
-            
-            # Efecto visual
-            from weapons import AreaEffect
-            effect = AreaEffect(self.x, self.y, 30, 100)
-            return effect
-            
-        elif self.boss_type == "robot_jefe":
-            # Lanzar misiles teledirigidos
-            from weapons import HomingMissile
-            missiles = []
-            for _ in range(3):
-                missile = HomingMissile(self.x, self.y, 20, 8)
-                missiles.append(missile)
-            return missiles
-            
-        return None
-        
-    def attack_pattern_3(self, player_x, player_y):
-        """Patrón de ataque de la fase 3 - Avanzado (solo disponible en fase 3)"""
-        if self.phase < 3:
+    
+    def projectile_spec(self, projectile_type, angle, damage, speed, target=None):
+        """Clase y argumentos del proyectil de un ataque"""
+        if projectile_type == "utensil":
+            return ThrownUtensil, (self.x, self.y, angle, damage, random.choice(UTENSIL_TYPES))
+        if projectile_type == "missile":
+            return HomingMissile, (self.x, self.y, damage, speed, target)
+        return Projectile, (self.x, self.y, angle, damage, "enemy", speed)
+    
+    def make_projectile(self, projectile_type, angle, damage, speed, target=None):
+        """Sacar un proyectil de la reserva (o crearlo si no hay reserva)"""
+        cls, args = self.projectile_spec(projectile_type, angle, damage, speed, target)
+        if self.projectile_pool is not None:
+            return self.projectile_pool.acquire(cls, *args)
+        return cls(*args)
+    
+    def fire(self, step, player_x, player_y):
+        """Lanzar el ataque de un paso de la línea de tiempo"""
+        attack = getattr(self, "attack_" + step.get("attack", ""), None)
+        if attack is None:
             return None
-            
-        self.special_counter = self.special_cooldown * 2
-        
-        # Patrón específico según el tipo de jefe
-        if self.boss_type == "chef_supremo":
-            # Invocar ayudantes (chefs menores)
-            helpers = []
-            for _ in range(2):
-                chef = Chef(self.level)
-                # Posicionar cerca del jefe
-                chef.x = self.x + random.randint(-100, 100)
-                chef.y = self.y + random.randint(-100, 100)
-                chef.update_rect()
-                helpers.append(chef)
-            return {"type": "summon", "enemies": helpers}
-            
-        elif self.boss_type == "robot_jefe":
-            # Modo berserk: disparos rápidos en todas direcciones
-            from weapons import Projectile
-            projectiles = []
-            for i in range(8):
-                angle = i * math.pi / 4  # 8 direcciones equidistantes
-                projectile = Projectile(self.x, self.y, angle, 15, "enemy", speed=12)
-                projectiles.append(projectile)
-            return projectiles
-            
-        return None
+        return attack(step, player_x, player_y)
+    
+    def attack_fan(self, step, player_x, player_y):
+        """Abanico de proyectiles hacia el jugador"""
+        count = step.get("count", 3)
+        spread = step.get("spread", 0.2)
+        base_angle = math.atan2(player_y - self.y, player_x - self.x)
+        return [self.make_projectile(step.get("projectile", "bullet"), base_angle + (i - (count - 1) / 2) * spread,
+                                     step.get("damage", self.damage), step.get("speed", 12))
+                for i in range(count)]
+    
+    def attack_ring(self, step, player_x, player_y):
+        """Anillo de proyectiles en todas direcciones"""
+        count = step.get("count", 8)
+        offset = step.get("offset", 0)
+        return [self.make_projectile(step.get("projectile", "bullet"), offset + i * 2 * math.pi / count,
+                                     step.get("damage", self.damage), step.get("speed", 12))
+                for i in range(count)]
+    
+    def attack_missiles(self, step, player_x, player_y):
+        """Misiles teledirigidos hacia la posición del jugador"""
+        return [self.make_projectile("missile", 0, step.get("damage", self.damage), step.get("speed", 8),
+                                     (player_x, player_y))
+                for _ in range(step.get("count", 3))]
+    
+    def attack_shockwave(self, step, player_x, player_y):
+        """Onda expansiva centrada en el jefe"""
+        return ShockWave(self.x, self.y, step.get("damage", self.damage), step.get("radius", 200))
+    
+    def attack_leap(self, step, player_x, player_y):
+        """Salto hacia el jugador con daño en área"""
+        self.x = player_x
+        self.y = player_y
+        self.update_rect()
+        return AreaEffect(self.x, self.y, step.get("damage", self.damage), step.get("duration", 100))
+    
+    def attack_summon(self, step, player_x, player_y):
+        """Invocar ayudantes alrededor del jefe"""
+        spread = step.get("spread", 100)
+        helpers = create_enemies([step.get("enemy", "chef")] * step.get("count", 2), self.level)
+        for helper in helpers:
+            helper.x = self.x + random.randint(-spread, spread)
+            helper.y = self.y + random.randint(-spread, spread)
+            helper.update_rect()
+        return {"type": "summon", "enemies": helpers}
         
     def take_damage(self, damage, knockback_x=0, knockback_y=0):
         # Si es invulnerable, no recibe daño
@@ -634,19 +826,32 @@ class Boss(Enemy):
             
         return super().take_damage(damage, knockback_x, knockback_y)
     
-    def draw(self, screen):
-        # Dibujar el enemigo base
-        super().draw(screen)
-        
-        # Dibujar nombre del jefe
-        if hasattr(self, 'name'):
-            # Cargar fuente
+    def name_surface(self):
+        """Texto con el nombre del jefe (se renderiza una sola vez por nombre)"""
+        label = Boss.name_labels.get(self.name)
+        if label is None:
             try:
                 boss_font = pygame.font.Font("assets/fonts/potato.ttf", 16)
             except:
                 boss_font = pygame.font.SysFont('Arial', 16)
-                
-            name_text = boss_font.render(self.name, True, (255, 50, 50))
+            label = Boss.name_labels[self.name] = boss_font.render(self.name, True, (255, 50, 50))
+        return label
+    
+    def batch_overlay(self, commands):
+        commands.append(self.draw_overlay)
+    
+    def draw_overlay(self, screen):
+        """Aviso de ataque, nombre, fase y escudo (primitivas, fuera del lote)"""
+        # Aviso del próximo ataque: anillo que se cierra sobre el jefe
+        if self.stage == "telegraph" and not self.entrance_animation:
+            step = self.current_step()
+            total = max(1, step.get("telegraph", 30)) if step else 1
+            warning_radius = int(self.radius + 10 + 30 * max(0, self.stage_timer) / total)
+            pygame.draw.circle(screen, (255, 80, 0), (int(self.x), int(self.y)), warning_radius, 2)
+        
+        # Dibujar nombre del jefe
+        if self.name:
+            name_text = self.name_surface()
             screen.blit(name_text, (self.x - name_text.get_width() // 2, self.y - self.radius - 25))
         
         # Mostrar fase actual con estrellas
@@ -685,66 +890,92 @@ class Boss(Enemy):
 
 # Clase de enemigo: Minion (enemigos más débiles)
 class Minion(Enemy):
+    __slots__ = ()
+    
     def __init__(self, level, spawn_x=None, spawn_y=None):
-        super().__init__(level, "human")
-        self.health = 30 + level * 5
-        self.max_health = self.health
-        self.damage = 3 + level
-        self.speed = 1.5 + level * 0.1
-        self.value = 5
+        super().__init__(level, "minion")
         
         # Si se especifica posición, usarla
         if spawn_x is not None and spawn_y is not None:
             self.x = spawn_x
             self.y = spawn_y
             self.update_rect()
-            
-        # Cargar imágenes más pequeñas
-        try:
-            self.image_right = load_image("assets/images/characters/minion_right.png", (40, 40))
-            self.image_left = load_image("assets/images/characters/minion_left.png", (40, 40))
-        except:
-            pass
 
-# Función para crear enemigo aleatorio según nivel
-def create_random_enemy(level):
-    """Crea un enemigo aleatorio apropiado para el nivel actual"""
+# Clases de enemigo por tipo (mismas claves que ENEMY_TYPES en config)
+ENEMY_CLASSES = {
+    "guard": Guard,
+    "robot": Robot,
+    "chef": Chef,
+    "minion": Minion
+}
+
+# Prototipos ya construidos por (tipo, nivel, dificultad); nunca se actualizan
+_prototypes = {}
+
+# Función para crear un enemigo de un tipo concreto
+def create_enemy(enemy_type, level):
+    """Crea un enemigo del tipo indicado clonando su prototipo (aleatorio si el tipo no existe)"""
+    if enemy_type in BOSS_TYPES:
+        return create_boss(level, enemy_type)
+    if enemy_type not in ENEMY_CLASSES:
+        enemy_type = random_enemy_type(level)
+    
+    key = (enemy_type, level, DIFFICULTY)
+    prototype = _prototypes.get(key)
+    if prototype is None:
+        prototype = _prototypes[key] = ENEMY_CLASSES[enemy_type](level)
+    return prototype.clone()
+
+# Función para crear un grupo de enemigos en una sola llamada
+def create_enemies(enemy_types, level):
+    """Crea un enemigo por cada tipo de la lista (None = tipo aleatorio según nivel)"""
+    return [create_enemy(enemy_type or random_enemy_type(level), level) for enemy_type in enemy_types]
+
+# Función para elegir un tipo de enemigo aleatorio según nivel
+def random_enemy_type(level):
+    """Elige un tipo de enemigo apropiado para el nivel actual"""
     roll = random.random()
     
     if level <= 2:
         # Niveles iniciales: mayoría de guardias
         if roll < 0.8:
-            return Guard(level)
+            return "guard"
         else:
-            return Minion(level)
+            return "minion"
     elif level <= 5:
         # Niveles intermedios: guardias y robots
         if roll < 0.5:
-            return Guard(level)
+            return "guard"
         elif roll < 0.8:
-            return Robot(level)
+            return "robot"
         else:
-            return Minion(level)
+            return "minion"
     else:
         # Niveles avanzados: todos los tipos
         if roll < 0.4:
-            return Guard(level)
+            return "guard"
         elif roll < 0.7:
-            return Robot(level)
+            return "robot"
         elif roll < 0.9:
-            return Chef(level)
+            return "chef"
         else:
-            return Minion(level)
+            return "minion"
+
+# Función para crear enemigo aleatorio según nivel
+def create_random_enemy(level):
+    """Crea un enemigo aleatorio apropiado para el nivel actual"""
+    return create_enemy(random_enemy_type(level), level)
 
 # Función para crear jefe según nivel
-def create_boss(level):
-    """Crea un jefe apropiado para el nivel actual"""
-    if level % 5 == 0:  # Cada 5 niveles
-        if level % 10 == 0:  # Niveles 10, 20, etc.
-            return Boss(level, "robot_jefe")
-        else:  # Niveles 5, 15, etc.
-            return Boss(level, "chef_supremo")
-    return None
+def create_boss(level, boss_type=None, timeline=None):
+    """Crea un jefe del tipo indicado o el apropiado para el nivel actual (BOSSES)"""
+    if boss_type is None:
+        boss_type = BOSSES.get(level)
+    if boss_type is None and level % 5 == 0:  # Cada 5 niveles
+        boss_type = "robot_jefe" if level % 10 == 0 else "chef_supremo"
+    if boss_type is None:
+        return None
+    return Boss(level, boss_type, timeline)
 
 # Ejemplo de uso:
 if __name__ == "__main__":
@@ -3,6 +3,7 @@ import sys
 import random
 import math
 import os
+from functools import partial
 from pygame.locals import *
 
 # Asegurarnos que los módulos son encontrados
@@ -17,10 +18,11 @@ pygame.mixer.init()  # Inicializar mezclador de audio
 
 # Configuración de pantalla
 try:
-    from config.settings import WIDTH, HEIGHT, FPS, TITLE, DIFFICULTY_SETTINGS, DIFFICULTY
+    from config.settings import WIDTH, HEIGHT, FPS, TITLE, DIFFICULTY_SETTINGS, DIFFICULTY, BOSSES
 except ImportError:
     WIDTH, HEIGHT = 800, 600
     FPS = 60
+    BOSSES = {}
     TITLE = "Killer Potato: La Venganza de la Papa"
     DIFFICULTY = "normal"
     DIFFICULTY_SETTINGS = {
@@ -35,7 +37,13 @@ except ImportError:
         }
     }
 
-screen = pygame.display.set_mode((WIDTH, HEIGHT))
+# Ventana (sincronizada al refresco si PACING_SETTINGS lo pide)
+try:
+    from src.pacing import set_display_mode
+except ImportError:
+    from pacing import set_display_mode
+
+screen = set_display_mode((WIDTH, HEIGHT))
 pygame.display.set_caption(TITLE)
 
 # Cargar fuentes
@@ -58,13 +66,78 @@ DARK_RED = (139, 0, 0)
 POTATO_BROWN = (139, 69, 19)
 POTATO_LIGHT = (210, 180, 140)
 
+# Atlas de texturas compartido (caché de sprites)
+try:
+    from src.atlas import load_sprite
+except ImportError:
+    from atlas import load_sprite
+
+# Guardado en segundo plano (progreso y récords)
+try:
+    from src.save import get_save_manager
+except ImportError:
+    from save import get_save_manager
+
+# Dibujo por capas y cachés de sprites
+try:
+    from src.render import Renderer, rotated, circle_sprite
+except ImportError:
+    from render import Renderer, rotated, circle_sprite
+
+# Instantáneas del estado de la simulación (checkpoints y reintentos)
+try:
+    from src.snapshot import take_snapshot, restore_snapshot
+except ImportError:
+    from snapshot import take_snapshot, restore_snapshot
+
+# Nivel de detalle de los enemigos
+try:
+    from src.lod import LODScheduler
+except ImportError:
+    from lod import LODScheduler
+
+# Campo de flujo para que los enemigos rodeen obstáculos
+try:
+    from src.pathfinding import FlowField
+except ImportError:
+    from pathfinding import FlowField
+
+# Rejilla de vecinos para separar a los enemigos
+try:
+    from src.spatial import SpatialHash, apply_separation, SEPARATION_SETTINGS
+except ImportError:
+    from spatial import SpatialHash, apply_separation, SEPARATION_SETTINGS
+
+# Director de oleadas
+try:
+    from src.waves import WaveDirector
+except ImportError:
+    from waves import WaveDirector
+
+# Mundo de entidades y sistemas de la simulación
+try:
+    from src.ecs import (World, motion_system, homing_system, lifetime_system,
+                         collision_system, damage_system, sound_system)
+except ImportError:
+    from ecs import (World, motion_system, homing_system, lifetime_system,
+                     collision_system, damage_system, sound_system)
+
+# Reserva de proyectiles reutilizables
+try:
+    from src.pool import ObjectPool
+except ImportError:
+    from pool import ObjectPool
+
+# Pila de escenas con el bucle principal
+try:
+    from src.scenes import SceneManager, LoopScene
+except ImportError:
+    from scenes import SceneManager, LoopScene
+
 # Función para cargar imágenes con manejo de errores
 def load_image(path, scale=None):
     try:
-        image = pygame.image.load(path).convert_alpha()
-        if scale:
-            image = pygame.transform.scale(image, scale)
-        return image
+        return load_sprite(path, scale)
     except pygame.error as e:
         print(f"No se pudo cargar la imagen {path}: {e}")
         # Crear una superficie de reemplazo
@@ -74,8 +147,21 @@ def load_image(path, scale=None):
         pygame.draw.line(surface, (POTATO_BROWN), (50, 0), (0, 50), 2)
         return surface
 
+# Color del brillo de cada recogible
+PICKUP_GLOW = {
+    "health": (255, 0, 0, 50),
+    "ammo": (255, 255, 0, 50),
+    "speed": (0, 255, 255, 50)
+}
+
 # Clase para objetos recogibles (power-ups, armas, etc.)
 class Pickup:
+    # Atributos fijos por instancia (sin __dict__: menos memoria y acceso más rápido)
+    __slots__ = ("x", "y", "type", "radius", "bob_offset", "bob_speed", "bob_direction",
+                 "rotation", "rotation_speed", "lifetime", "image", "rect")
+    
+    kind = "pickup"  # Arquetipo en el mundo ECS
+    
     def __init__(self, x, y, pickup_type):
         self.x = x
         self.y = y
@@ -116,41 +202,26 @@ class Pickup:
         self.rotation = (self.rotation + self.rotation_speed) % 360
         
         # Actualizar rectángulo
-        if hasattr(self, 'rect'):
-            self.rect.center = (self.x, self.y + self.bob_offset)
+        self.rect.center = (self.x, self.y + self.bob_offset)
         
         # Reducir tiempo de vida
         self.lifetime -= 1
     
+    def batch(self, commands):
+        """Órdenes de dibujo: objeto girado y brillo (ambos precalculados)"""
+        center_y = self.y + self.bob_offset
+        rotated_image = rotated(self.image, -self.rotation)
+        commands.append((rotated_image, rotated_image.get_rect(center=(self.x, center_y))))
+        
+        # Brillo pulsante alrededor del objeto
+        glow_radius = self.radius + 5 + int(math.sin(pygame.time.get_ticks() / 200) * 3)
+        glow = circle_sprite(PICKUP_GLOW.get(self.type, (255, 255, 255, 50)), glow_radius)
+        commands.append((glow, (self.x - glow_radius, center_y - glow_radius)))
+    
     def draw(self, screen):
-        try:
-            # Rotar imagen
-            rotated_image = pygame.transform.rotate(self.image, self.rotation)
-            rotated_rect = rotated_image.get_rect(center=(self.x, self.y + self.bob_offset))
-            
-            # Dibujar pickup
-            screen.blit(rotated_image, rotated_rect.topleft)
-            
-            # Opcional: dibujar brillo alrededor del objeto
-            glow_radius = self.radius + 5 + int(math.sin(pygame.time.get_ticks() / 200) * 3)
-            glow_surface = pygame.Surface((glow_radius*2, glow_radius*2), pygame.SRCALPHA)
-            
-            # Color del brillo según tipo
-            if self.type == "health":
-                glow_color = (255, 0, 0, 50)
-            elif self.type == "ammo":
-                glow_color = (255, 255, 0, 50)
-            elif self.type == "speed":
-                glow_color = (0, 255, 255, 50)
-            else:
-                glow_color = (255, 255, 255, 50)
-                
-            pygame.draw.circle(glow_surface, glow_color, (glow_radius, glow_radius), glow_radius)
-            screen.blit(glow_surface, (self.x - glow_radius, self.y - glow_radius + self.bob_offset))
-        except Exception as e:
-            # Método de respaldo para dibujar
-            color = GREEN if self.type == "health" else RED if self.type == "ammo" else BLUE
-            pygame.draw.circle(screen, color, (int(self.x), int(self.y + self.bob_offset)), self.radius)
+        commands = []
+        self.batch(commands)
+        screen.blits(commands, False)
     
     def is_collected(self, player):
         # Comprobar si el jugador toca el objeto
@@ -214,6 +285,37 @@ except Exception as e:
             self.complete = False
             self.next_dialog = next_dialog
             self.visible = True
+            
+            # Fondo, nombre y líneas de texto se preparan una vez por diálogo
+            self.frame = pygame.Surface((self.width, self.height), pygame.SRCALPHA)
+            self.frame.fill(self.bg_color)
+            pygame.draw.rect(self.frame, self.border_color, (0, 0, self.width, self.height), 2, border_radius=10)
+            text_start_x = 120 if self.portrait else 20
+            text_start_y = 20
+            if self.speaker:
+                self.frame.blit(self.font.render(self.speaker, True, RED), (text_start_x, 10))
+                text_start_y = 40
+            
+            # Ajuste de texto para que no se salga del cuadro
+            max_width = self.width - text_start_x - 20
+            wrapped = []
+            current_line = ""
+            start = index = 0
+            for word in self.text.split(' '):
+                test_line = current_line + word + " "
+                if self.font.size(test_line)[0] < max_width:
+                    current_line = test_line
+                else:
+                    wrapped.append((current_line, start))
+                    current_line = word + " "
+                    start = index
+                index += len(word) + 1
+            wrapped.append((current_line, start))
+            
+            # Cada línea con el ancho de sus prefijos para la animación de escritura
+            self.lines = [(self.font.render(line, True, self.text_color), (text_start_x, text_start_y + i * 30), start,
+                           [self.font.size(line[:count])[0] for count in range(len(line) + 1)])
+                          for i, (line, start) in enumerate(wrapped)]
         
         def update(self):
             if not self.visible:
@@ -233,60 +335,24 @@ except Exception as e:
             if not self.visible:
                 return
                 
-            # Dibujar el fondo del cuadro de diálogo
-            dialog_surface = pygame.Surface((self.width, self.height), pygame.SRCALPHA)
-            dialog_surface.fill(self.bg_color)
-            
-            # Borde
-            pygame.draw.rect(dialog_surface, self.border_color, (0, 0, self.width, self.height), 2, border_radius=10)
-            
             # Dibujar retrato si existe
             if self.portrait:
                 surface.blit(self.portrait, (self.x + 10, self.y + (self.height - self.portrait.get_height()) // 2))
-                text_start_x = 120
-            else:
-                text_start_x = 20
-            
-            # Dibujar nombre del hablante
-            if self.speaker:
-                speaker_surface = self.font.render(self.speaker, True, RED)
-                dialog_surface.blit(speaker_surface, (text_start_x, 10))
-                text_start_y = 40
-            else:
-                text_start_y = 20
-            
-            # Dibujar texto con animación de escritura
-            displayed_text = self.text[:self.display_index]
-            
-            # Ajuste de texto para que no se salga del cuadro
-            max_width = self.width - text_start_x - 20
-            words = displayed_text.split(' ')
-            lines = []
-            current_line = ""
-            
-            for word in words:
-                test_line = current_line + word + " "
-                if self.font.size(test_line)[0] < max_width:
-                    current_line = test_line
-                else:
-                    lines.append(current_line)
-                    current_line = word + " "
-            lines.append(current_line)
+            surface.blit(self.frame, (self.x, self.y))
             
-            # Dibujar líneas de texto
-            for i, line in enumerate(lines):
-                text_surface = self.font.render(line, True, self.text_color)
-                dialog_surface.blit(text_surface, (text_start_x, text_start_y + i * 30))
+            # Texto con animación de escritura: la parte ya escrita de cada línea
+            for text_surface, (line_x, line_y), start, widths in self.lines:
+                count = min(max(self.display_index - start, 0), len(widths) - 1)
+                if count:
+                    surface.blit(text_surface, (self.x + line_x, self.y + line_y),
+                                 (0, 0, widths[count], text_surface.get_height()))
             
             # Indicador de continuar
             if self.complete:
-                pygame.draw.polygon(dialog_surface, WHITE, 
-                                  [(self.width - 30, self.height - 20), 
-                                   (self.width - 10, self.height - 20), 
-                                   (self.width - 20, self.height - 10)])
-            
-            # Dibujar el cuadro de diálogo en la superficie principal
-            surface.blit(dialog_surface, (self.x, self.y))
+                pygame.draw.polygon(surface, WHITE, 
+                                  [(self.x + self.width - 30, self.y + self.height - 20), 
+                                   (self.x + self.width - 10, self.y + self.height - 20), 
+                                   (self.x + self.width - 20, self.y + self.height - 10)])
         
         def handle_input(self, event):
             if not self.visible:
@@ -314,14 +380,16 @@ except Exception as e:
     def load_dialogues(level):
         return {"intro": [{"text": f"Nivel {level}! ¡Hora de aplastar humanos!", "speaker": "Killer Potato"}]}
     
-    def show_cutscene(screen, level):
+    def show_cutscene(scenes, level):
         pass
     
-    def show_tutorial(screen, level):
+    def show_tutorial(scenes, level):
         pass
 
 # Clase para efectos de disparo/ataque
 class AttackEffect:
+    kind = "effect"  # Arquetipo en el mundo ECS
+    
     def __init__(self, x, y, angle):
         self.x = x
         self.y = y
@@ -334,23 +402,32 @@ class AttackEffect:
     def update(self):
         self.lifetime -= 1
     
+    def batch(self, commands):
+        commands.append((self.rotated_image, self.rect))
+    
     def draw(self, screen):
         screen.blit(self.rotated_image, self.rect.topleft)
     
     def is_finished(self):
         return self.lifetime <= 0
 
+# Minimapa del nivel (va en la capa del HUD)
+try:
+    from src.ui import Minimap
+except ImportError:
+    from ui import Minimap
+
 # Importar clases necesarias
 try:
     from src.player import Player
     from src.weapons import Projectile, ShockWave
-    from src.enemies import Enemy, create_random_enemy, create_boss
+    from src.enemies import Enemy, create_enemies, create_random_enemy, create_boss
     from src.levels import LevelManager
 except ImportError:
     try:
         from player import Player
         from weapons import Projectile, ShockWave
-        from enemies import Enemy, create_random_enemy, create_boss
+        from enemies import Enemy, create_enemies, create_random_enemy, create_boss
         from levels import LevelManager
     except ImportError as e:
         print(f"Error al importar módulos del juego: {e}")
@@ -444,33 +521,46 @@ except ImportError:
                 screen.blit(level_text, (WIDTH - 150, 80))
         
         class Projectile:
-            def __init__(self, x, y, angle, damage):
+            kind = "projectile"
+            
+            def __init__(self, x, y, angle, damage, owner="player"):
                 self.x = x
                 self.y = y
+                self.prev_x, self.prev_y = x, y
                 self.speed = 12
                 self.dx = math.cos(angle) * self.speed
                 self.dy = math.sin(angle) * self.speed
                 self.radius = 5
                 self.damage = damage
                 self.angle = angle
+                self.owner = owner
+                self.lifetime = 120
                 self.rect = pygame.Rect(x - 5, y - 5, 10, 10)
             
             def update(self):
+                self.prev_x, self.prev_y = self.x, self.y
                 self.x += self.dx
                 self.y += self.dy
                 self.rect.center = (self.x, self.y)
+                self.lifetime -= 1
             
             def draw(self, screen):
                 pygame.draw.circle(screen, RED, (int(self.x), int(self.y)), self.radius)
             
             def is_offscreen(self):
                 return (self.x < 0 or self.x > WIDTH or self.y < 0 or self.y > HEIGHT)
+            
+            def is_expired(self):
+                return self.lifetime <= 0
         
         class ShockWave:
-            def __init__(self, x, y, damage, max_radius, wave_color=None):
+            kind = "hazard"
+            
+            def __init__(self, x, y, damage, max_radius, wave_color=None, owner="enemy"):
                 self.x = x
                 self.y = y
                 self.damage = damage
+                self.owner = owner
                 self.current_radius = 10
                 self.max_radius = max_radius
                 self.growth_speed = 5
@@ -489,13 +579,20 @@ except ImportError:
             def draw(self, screen):
                 pygame.draw.circle(screen, BLUE, (int(self.x), int(self.y)), int(self.current_radius), 2)
             
-            def check_collision(self, entity_rect):
-                return False
+            def damage_zone(self):
+                return None
+            
+            def apply_damage(self):
+                return self.damage
             
             def is_finished(self):
                 return self.current_radius >= self.max_radius or self.alpha <= 0
         
         class Enemy:
+            kind = "enemy"
+            always_update = False
+            is_boss = False
+            
             def __init__(self, level, enemy_type="human"):
                 self.radius = 20
                 self.speed = 1 + level * 0.2
@@ -507,6 +604,9 @@ except ImportError:
                 self.facing_right = True
                 self.hit_effect = 0
                 self.enemy_type = enemy_type
+                self.knockback_resistance = 1.0
+                self.lod_visible = True
+                self.lod_pending = 0
                 
                 self.x = random.randint(50, WIDTH - 50)
                 self.y = random.randint(50, HEIGHT - 50)
@@ -514,7 +614,10 @@ except ImportError:
                 self.image = load_image("assets/images/characters/human_right.png", (50, 50))
                 self.rect = self.image.get_rect(center=(self.x, self.y))
             
-            def update(self, player_x, player_y):
+            def update_rect(self):
+                self.rect.center = (self.x, self.y)
+            
+            def update(self, player_x, player_y, obstacles=None, dt=1):
                 dx = player_x - self.x
                 dy = player_y - self.y
                 dist = math.sqrt(dx**2 + dy**2)
@@ -523,16 +626,16 @@ except ImportError:
                     dx /= dist
                     dy /= dist
                 
-                self.x += dx * self.speed
-                self.y += dy * self.speed
+                self.x += dx * self.speed * dt
+                self.y += dy * self.speed * dt
                 self.facing_right = dx > 0
-                self.rect.center = (self.x, self.y)
+                self.update_rect()
                 
                 if self.attack_counter > 0:
-                    self.attack_counter -= 1
+                    self.attack_counter -= dt
                 
                 if self.hit_effect > 0:
-                    self.hit_effect -= 1
+                    self.hit_effect -= dt
             
             def draw(self, screen):
                 pygame.draw.circle(screen, RED, (int(self.x), int(self.y)), self.radius)
@@ -558,6 +661,9 @@ except ImportError:
         def create_random_enemy(level):
             return Enemy(level)
         
+        def create_enemies(enemy_types, level):
+            return [Enemy(level) for _ in enemy_types]
+        
         def create_boss(level):
             return None
         
@@ -580,6 +686,8 @@ except ImportError:
                 self.current_level.get_spawn_point = lambda: (random.randint(50, WIDTH - 50), random.randint(50, HEIGHT - 50))
                 self.current_level.get_adjusted_player_position = lambda x, y: (x, y)
                 self.current_level.draw = lambda screen, offset_x, offset_y: None
+                self.current_level.render_static = lambda: None
+                self.current_level.draw_checkpoints = lambda screen, offset_x=0, offset_y=0: None
                 self.current_level.update = lambda player_x, player_y: None
                 self.current_level.mark_completed = lambda: None
                 
@@ -588,7 +696,7 @@ except ImportError:
             def next_level(self):
                 return self.load_level(1)
                 
-            def show_level_intro(self, screen):
+            def show_level_intro(self, scenes):
                 pass
 
 # Función para dibujar la pantalla de pausa
@@ -604,7 +712,7 @@ def draw_pause_screen(screen):
     screen.blit(continue_text, (WIDTH//2 - continue_text.get_width()//2, HEIGHT//2 + 20))
 
 # Función para dibujar pantalla de game over mejorada
-def draw_game_over_screen(screen, score, level, time_played):
+def draw_game_over_screen(screen, score, level, time_played, can_retry=False):
     overlay = pygame.Surface((WIDTH, HEIGHT), pygame.SRCALPHA)
     overlay.fill((0, 0, 0, 220))  # Más opaco para mejor contraste
     screen.blit(overlay, (0, 0))
@@ -636,12 +744,40 @@ def draw_game_over_screen(screen, score, level, time_played):
     # Efecto de parpadeo para el texto de reinicio
     if pygame.time.get_ticks() % 1000 < 700:  # Parpadeo más lento
         screen.blit(restart_text, (WIDTH//2 - restart_text.get_width()//2, HEIGHT//2 + 120))
+        if can_retry:
+            retry_text = font.render("Presiona C para volver al último checkpoint", True, WHITE)
+            screen.blit(retry_text, (WIDTH//2 - retry_text.get_width()//2, HEIGHT//2 + 160))
 
-# Función principal del juego mejorada
-def main():
+# Dibujar la salida del nivel
+def draw_exit(screen, exit_point, font):
+    """Dibujar el punto de salida del nivel (círculo pulsante y texto)"""
+    exit_x, exit_y = exit_point
+    
+    # Efecto pulsante para salida
+    pulse = abs(math.sin(pygame.time.get_ticks() / 500)) * 5
+    exit_radius = int(25 + pulse)
+    
+    # Círculo de salida
+    screen.blit(circle_sprite((0, 255, 0, 150), exit_radius), (exit_x - exit_radius, exit_y - exit_radius))
+    
+    # Texto "SALIDA"
+    exit_text = font.render("SALIDA", True, GREEN)
+    screen.blit(exit_text, (exit_x - exit_text.get_width()//2, exit_y - exit_radius - 30))
+
+# Crear el director de oleadas para el nivel actual
+def create_wave_director(level, current_level, enemies_in_level):
+    boss_type = current_level.get_boss()[0] if current_level else BOSSES.get(level)
+    return WaveDirector(level, enemies_in_level,
+                        getattr(current_level, 'spawn_rate', 60),
+                        getattr(current_level, 'waves', None),
+                        boss=boss_type)
+
+# Escena del juego: un frame por cada `yield` (ver scenes.LoopScene)
+def game_loop(scenes):
+    """Bucle del juego; ESC vuelve a la escena de debajo con la partida en pausa"""
     global enemies, enemies_to_spawn  # Para acceso desde métodos de clase
     
-    clock = pygame.time.Clock()
+    screen = scenes.screen
     
     # Intentar cargar el sistema de niveles
     try:
@@ -660,7 +796,7 @@ def main():
         level_obstacles = obstacles
         
         # Mostrar introducción del nivel
-        level_manager.show_level_intro(screen)
+        level_manager.show_level_intro(scenes)
     except Exception as e:
         print(f"Error al cargar sistema de niveles: {e}")
         print("Usando modo arena por defecto...")
@@ -684,14 +820,21 @@ def main():
         background.fill(GRAY)
     
     player = Player()
-    projectiles = []
-    attack_effects = []
-    enemies = []
-    pickups = []
+    world = World()  # Proyectiles, efectos, enemigos y recogibles
+    enemies = world.query("enemy")
     
     level = 1
-    spawn_cooldown = 60  # frames entre spawn de enemigos
-    spawn_counter = 0
+    lod = LODScheduler()  # Frecuencia de actualización de enemigos según distancia
+    flow_field = None  # Campo de flujo del nivel actual (se crea al cambiar de nivel)
+    flow_field_level = None
+    enemy_grid = SpatialHash(SEPARATION_SETTINGS["radius"])  # Rejilla de vecinos reconstruida cada frame
+    renderer = Renderer()  # Dibujo por capas con lotes de blits
+    minimap = Minimap(None, player)  # Nivel, jugador y enemigos en pequeño
+    projectile_pool = ObjectPool()  # Proyectiles reutilizables (ataques de jefes)
+    Enemy.projectile_pool = projectile_pool
+    director = create_wave_director(level, current_level, enemies_in_level)  # Oleadas del nivel
+    enemies_to_spawn = director.remaining
+    profiler = scenes.profiler  # Tiempo de trabajo por frame (frena las oleadas si se excede)
     
     level_complete = False
     level_timer = 180  # Pausa entre niveles (3 segundos a 60 FPS)
@@ -703,6 +846,9 @@ def main():
     time_played = 0  # Tiempo en frames (60 por segundo)
     enemy_kills = 0
     
+    # Instantánea del último checkpoint alcanzado
+    checkpoint_snapshot = None
+    
     # Diálogo inicial
     dialog = DialogBox()
     show_intro_dialog = True
@@ -712,7 +858,7 @@ def main():
         try:
             if use_level_system:
                 level_dialogues = load_dialogues(1)
-                intro_dialog = level_dialogues.get("intro", [])[0]
+                intro_dialog = (level_dialogues.get("intro") or [{}])[0]
                 
                 dialog.set_dialog(
                     intro_dialog.get("text", "¡Por fin he escapado! Hora de vengarse."), 
@@ -740,21 +886,25 @@ def main():
                 "assets/images/characters/killer_potato_dialog.png"
             )
     
-    running = True
-    while running:
+    # La escena no termina: el gestor deja de llamarla al cerrar el juego
+    while True:
+        events = yield
+        
         # Obtener el tiempo transcurrido para estadísticas
         if not game_over and not paused and not dialog.visible:
             time_played += 1
         
         # Manejo de eventos
-        for event in pygame.event.get():
-            if event.type == QUIT:
-                running = False
-            
+        for event in events:
             if event.type == KEYDOWN:
                 if event.key == K_p:  # Tecla de pausa
                     paused = not paused
                 
+                if event.key == K_ESCAPE:
+                    # Volver al menú; la partida se queda en pausa hasta que se reanude
+                    paused = True
+                    scenes.pop()
+                
                 # Manejo de diálogos
                 if dialog.visible:
                     dialog.handle_input(event)
@@ -789,21 +939,38 @@ def main():
                             level_obstacles = obstacles
                             
                             # Mostrar introducción del nuevo nivel
-                            level_manager.show_level_intro(screen)
+                            level_manager.show_level_intro(scenes)
                         else:
                             # Incrementar dificultad en modo arena
                             enemies_in_level = 5 + level * 2
                             
-                        enemies_to_spawn = enemies_in_level
+                        director = create_wave_director(level, current_level, enemies_in_level)
+                        enemies_to_spawn = director.remaining
                         level_complete = False
+                        checkpoint_snapshot = None
+                
+                if game_over and event.key == K_c and checkpoint_snapshot:
+                    # Volver al último checkpoint sin recargar recursos
+                    state = restore_snapshot(checkpoint_snapshot)
+                    player = state["player"]
+                    world = state["world"]
+                    enemies = world.query("enemy")
+                    level = state["level"]
+                    enemies_in_level = state["enemies_in_level"]
+                    enemies_to_spawn = state["enemies_to_spawn"]
+                    director = state["director"]
+                    time_played = state["time_played"]
+                    enemy_kills = state["enemy_kills"]
+                    current_level = level_manager.current_level = state["current_level"]
+                    obstacles = level_obstacles = current_level.obstacles
+                    game_over = False
+                    scenes.cross_fade()
                 
                 if game_over and event.key == K_RETURN:
                     # Reiniciar juego
                     player = Player()
-                    projectiles = []
-                    attack_effects = []
-                    enemies = []
-                    pickups = []
+                    world = World()
+                    enemies = world.query("enemy")
                     level = 1
                     
                     if use_level_system:
@@ -823,21 +990,22 @@ def main():
                     else:
                         enemies_in_level = 5
                         
-                    enemies_to_spawn = enemies_in_level
-                    spawn_cooldown = 60
-                    spawn_counter = 0
+                    director = create_wave_director(level, current_level, enemies_in_level)
+                    enemies_to_spawn = director.remaining
                     level_complete = False
                     game_over = False
+                    scenes.cross_fade()
                     time_played = 0
                     enemy_kills = 0
+                    checkpoint_snapshot = None
             
             if not paused and not game_over and not dialog.visible:
                 if event.type == MOUSEBUTTONDOWN and event.button == 1:
                     projectile, effect = player.attack()
                     if projectile:
-                        projectiles.append(projectile)
+                        world.spawn(projectile, "projectile")
                     if effect:
-                        attack_effects.append(effect)
+                        world.spawn(effect, "effect")
                 
                 if event.type == MOUSEWHEEL:
                     player.switch_weapon(event.y)
@@ -848,33 +1016,32 @@ def main():
         if dialog.visible:
             # Dibujar juego pero congelar actualizaciones
             if use_level_system and current_level:
-                current_level.draw(screen, current_level.scroll_offset_x, current_level.scroll_offset_y)
+                offset_x, offset_y = current_level.scroll_offset_x, current_level.scroll_offset_y
+                renderer.sync_level(screen, current_level, background, offset_x, offset_y)
+                renderer.queue("obstacles", partial(current_level.draw_checkpoints,
+                                                    offset_x=offset_x, offset_y=offset_y))
             else:
-                screen.blit(background, (0, 0))
+                renderer.sync_level(screen, None, background)
             
-            # Dibujar jugador y enemigos
-            player.draw(screen)
-            for enemy in enemies:
-                enemy.draw(screen)
-                
-            # Dibujar HUD
-            player.draw_hud(screen, enemies_to_spawn, len(enemies))
-            
-            # Dibujar diálogo
-            dialog.draw(screen)
-            
-            pygame.display.flip()
-            clock.tick(60)
+            # Jugador, enemigos, HUD y diálogo
+            renderer.queue_world(world, ("enemy",))
+            renderer.queue("player", player.draw)
+            renderer.queue("hud", partial(player.draw_hud, enemies_to_spawn=enemies_to_spawn,
+                                          enemies_count=len(enemies)))
+            renderer.queue("hud", dialog.draw)
+            renderer.draw(screen)
+            scenes.idle = dialog.complete  # Texto ya revelado: basta con un ritmo reducido
             continue
             
+        # Pausa y Game Over son pantallas quietas: se dibujan a ritmo reducido
         if paused:
             draw_pause_screen(screen)
-            pygame.display.flip()
+            scenes.idle = True
             continue
             
         if game_over:
-            draw_game_over_screen(screen, player.score, level, time_played // 60)  # Convertir frames a segundos
-            pygame.display.flip()
+            draw_game_over_screen(screen, player.score, level, time_played // 60, checkpoint_snapshot is not None)  # Convertir frames a segundos
+            scenes.idle = True
             continue
         
         # Lógica de juego
@@ -904,7 +1071,19 @@ def main():
             
             # Actualizar nivel
             if hasattr(current_level, 'update'):
-                current_level.update(player.x, player.y)
+                if current_level.update(player.x, player.y):
+                    # Checkpoint alcanzado: guardar el estado completo
+                    checkpoint_snapshot = take_snapshot({
+                        "player": player,
+                        "world": world,
+                        "level": level,
+                        "enemies_in_level": enemies_in_level,
+                        "enemies_to_spawn": enemies_to_spawn,
+                        "director": director,
+                        "time_played": time_played,
+                        "enemy_kills": enemy_kills,
+                        "current_level": current_level
+                    }, time_played)
         else:
             # Movimiento normal para modo arena
             player.move(dx, dy, obstacles)
@@ -912,145 +1091,78 @@ def main():
         # Actualizar jugador
         player.update()
         
-        # Actualizar efectos de ataque
-        for effect in attack_effects[:]:
-            effect.update()
-            if effect.is_finished():
-                attack_effects.remove(effect)
+        # Mover proyectiles, efectos y recogibles
+        motion_system(world)
+        homing_system(world, player)
         
-        # Actualizar proyectiles
-        for projectile in projectiles[:]:
-            projectile.update()
-            
-            # Comprobar colisión con obstáculos
-            if use_level_system and level_obstacles:
-                for obstacle in level_obstacles:
-                    # Ajustar posición del obstáculo para niveles lineales
-                    if hasattr(current_level, 'linear') and current_level.linear and hasattr(obstacle, 'rect'):
-                        obstacle_x = obstacle.x - current_level.scroll_offset_x
-                        obstacle_y = obstacle.y
-                        obstacle_rect = pygame.Rect(obstacle_x, obstacle_y, obstacle.width, obstacle.height)
-                    elif hasattr(obstacle, 'rect'):
-                        obstacle_rect = obstacle.rect
-                    else:
-                        # Si el obstáculo no tiene rect, crear uno básico
-                        obstacle_rect = pygame.Rect(obstacle.x, obstacle.y, 50, 50)
-                    
-                    if hasattr(projectile, 'rect'):
-                        collision = obstacle_rect.colliderect(projectile.rect)
-                    else:
-                        # Si el proyectil no tiene rect, comprobar con círculo
-                        collision = obstacle_rect.collidepoint(projectile.x, projectile.y)
-                        
-                    if collision:
-                        projectiles.remove(projectile)
-                        
-                        # Si el obstáculo es destructible, dañarlo
-                        if hasattr(obstacle, 'destructible') and obstacle.destructible:
-                            if hasattr(obstacle, 'take_damage'):
-                                if obstacle.take_damage(projectile.damage):
-                                    level_obstacles.remove(obstacle)
-                        break
-            
-            # Eliminar proyectiles fuera de pantalla
-            if hasattr(projectile, 'is_offscreen'):
-                if projectile.is_offscreen():
-                    projectiles.remove(projectile)
-            # Alternativa si no tiene método is_offscreen
-            elif projectile.x < 0 or projectile.x > WIDTH or projectile.y < 0 or projectile.y > HEIGHT:
-                projectiles.remove(projectile)
+        # Actualizar el campo de flujo compartido hacia el jugador
+        if use_level_system and current_level:
+            if flow_field_level is not current_level:
+                flow_field = FlowField(current_level.get_level_bounds())
+                flow_field_level = current_level
+                Enemy.flow_field = flow_field
+            flow_field.update(player.x, player.y, level_obstacles,
+                              (current_level.scroll_offset_x, current_level.scroll_offset_y))
         
-        # Actualizar enemigos y comprobar colisiones
-        for enemy in enemies[:]:
-            # En niveles lineales, ajustar posición de enemigos
-            if use_level_system and hasattr(current_level, 'linear') and current_level.linear:
-                enemy.update(player.x, player.y, level_obstacles)
-            else:
-                enemy.update(player.x, player.y, obstacles)
+        # Actualizar enemigos (los lejanos con menor frecuencia); sus disparos,
+        # ondas e invocaciones pasan a formar parte del mundo
+        linear_level = use_level_system and current_level.linear
+        enemy_obstacles = level_obstacles if linear_level else obstacles
+        for enemy, result in lod.update(enemies, player.x, player.y, enemy_obstacles):
+            world.spawn_result(result)
+        
+        # Separar enemigos amontonados sin empujarlos contra los obstáculos
+        apply_separation(enemies, enemy_grid, obstacles=enemy_obstacles,
+                         offset=(current_level.scroll_offset_x, current_level.scroll_offset_y)
+                         if use_level_system and current_level else (0, 0))
+        
+        # Colisiones (solo con enemigos visibles) y daño
+        collision_system(world, player, level_obstacles if use_level_system else (),
+                         current_level.scroll_offset_x if linear_level else 0, enemy_grid)
+        for enemy in damage_system(world, player):
+            # Posibilidad de soltar pickup
+            pickup_chance = 0.3  # 30% de probabilidad base
             
-            # Comprobar colisión con jugador
-            if hasattr(player, 'rect') and hasattr(enemy, 'rect'):
-                if player.rect.colliderect(enemy.rect):
-                    enemy.attack(player)
-            else:
-                # Alternativa si no tienen rectángulos
-                dist = math.sqrt((player.x - enemy.x) ** 2 + (player.y - enemy.y) ** 2)
-                if dist < player.radius + enemy.radius:
-                    enemy.attack(player)
+            # En niveles con sistema, usar configuración de dificultad
+            if use_level_system and 'DIFFICULTY_SETTINGS' in globals():
+                difficulty_config = DIFFICULTY_SETTINGS.get(DIFFICULTY, DIFFICULTY_SETTINGS["normal"])
+                pickup_chance = difficulty_config.get("pickup_spawn_chance", 0.3)
             
-            # Comprobar colisión con proyectiles
-            for projectile in projectiles[:]:
-                if projectile in projectiles:  # Verificar que aún existe
-                    if hasattr(enemy, 'rect') and hasattr(projectile, 'rect'):
-                        if enemy.rect.colliderect(projectile.rect):
-                            enemy.take_damage(projectile.damage)
-                            projectiles.remove(projectile)
-                            break
-                    else:
-                        # Alternativa si no tienen rectángulos
-                        dist = math.sqrt((projectile.x - enemy.x) ** 2 + (projectile.y - enemy.y) ** 2)
-                        if dist < enemy.radius + projectile.radius:
-                            enemy.take_damage(projectile.damage)
-                            if projectile in projectiles:  # Verificar que aún existe
-                                projectiles.remove(projectile)
-                            break
+            if random.random() < pickup_chance:
+                pickup_type = random.choice(["health", "ammo", "speed"])
+                # Usar clase Pickup definida en este archivo
+                world.spawn(Pickup(enemy.x, enemy.y, pickup_type))
             
-            # Eliminar enemigos muertos
-            if enemy.is_dead():
-                # Posibilidad de soltar pickup
-                pickup_chance = 0.3  # 30% de probabilidad base
-                
-                # En niveles con sistema, usar configuración de dificultad
-                if use_level_system and 'DIFFICULTY_SETTINGS' in globals():
-                    difficulty_config = DIFFICULTY_SETTINGS.get(DIFFICULTY, DIFFICULTY_SETTINGS["normal"])
-                    pickup_chance = difficulty_config.get("pickup_spawn_chance", 0.3)
-                
-                if random.random() < pickup_chance:
-                    pickup_type = random.choice(["health", "ammo", "speed"])
-                    # Usar clase Pickup definida en este archivo
-                    pickups.append(Pickup(enemy.x, enemy.y, pickup_type))
-                
-                player.score += 10
-                enemy_kills += 1
-                enemies.remove(enemy)
+            player.score += 10
+            enemy_kills += 1
         
-        # Actualizar pickups
-        for pickup in pickups[:]:
-            if hasattr(pickup, 'update'):
-                pickup.update()
-            
-            # Comprobar si el jugador recoge el pickup
-            if pickup.is_collected(player):
-                message = pickup.apply_effect(player)
-                # Reproducir sonido de recogida
-                try:
-                    pickup_sound = pygame.mixer.Sound("assets/sounds/sfx/pickup.wav")
-                    pickup_sound.play()
-                except:
-                    pass
-                pickups.remove(pickup)
-            elif hasattr(pickup, 'is_expired') and pickup.is_expired():
-                pickups.remove(pickup)
+        # Eliminar lo que ha caducado o salido de la pantalla
+        lifetime_system(world)
         
-        # Generar enemigos
+        # Generar enemigos según el director de oleadas
         if not level_complete and enemies_to_spawn > 0:
-            if spawn_counter <= 0:
-                # Elegir tipo de enemigo basado en nivel
-                enemy = create_random_enemy(level)
-                
+            for enemy in create_enemies(director.update(len(enemies), profiler), level):
                 # En niveles con sistema, usar punto de spawn del nivel
-                if use_level_system and hasattr(current_level, 'get_spawn_point'):
+                if use_level_system and enemy.is_boss:
+                    spawn_x, spawn_y = current_level.get_boss_spawn_point()
+                    boss_timeline = current_level.get_boss()[1]
+                    if boss_timeline:
+                        enemy.set_timeline(boss_timeline)
+                    enemy.x = spawn_x
+                    enemy.y = spawn_y
+                    enemy.update_rect()
+                elif use_level_system and hasattr(current_level, 'get_spawn_point'):
                     spawn_x, spawn_y = current_level.get_spawn_point()
                     enemy.x = spawn_x
                     enemy.y = spawn_y
-                    if hasattr(enemy, 'update_rect'):
-                        enemy.update_rect()
+                    enemy.update_rect()
                     
-                enemies.append(enemy)
-                enemies_to_spawn -= 1
-                spawn_counter = spawn_cooldown
-            else:
-                spawn_counter -= 1
+                world.spawn(enemy, "enemy")
+            enemies_to_spawn = director.remaining
+        
+        # Quitar las entidades destruidas durante el frame y sonar lo pendiente
+        world.flush(projectile_pool)
+        sound_system(world)
         
         # Comprobar condiciones de victoria en sistema de niveles
         if use_level_system and not level_complete:
@@ -1071,7 +1183,7 @@ def main():
                     # Mostrar diálogo de nivel completado
                     try:
                         level_dialogues = load_dialogues(level)
-                        complete_dialog = level_dialogues.get("level_complete", [])[0]
+                        complete_dialog = (level_dialogues.get("level_complete") or [{}])[0]
                         
                         dialog.set_dialog(
                             complete_dialog.get("text", f"¡Nivel {level} completado!"), 
@@ -1092,8 +1204,11 @@ def main():
             level_timer -= 1
         
         # Comprobar si el jugador ha muerto
-        if player.health <= 0:
+        if player.health <= 0 and not game_over:
             game_over = True
+            scenes.cross_fade()  # Fundido a la pantalla de Game Over
+            # Registrar la puntuación (se escribe en segundo plano)
+            get_save_manager().add_highscore(player.score, level)
             # Reproducir sonido de Game Over
             try:
                 game_over_sound = pygame.mixer.Sound("assets/sounds/sfx/game_over.wav")
@@ -1101,50 +1216,30 @@ def main():
             except:
                 pass
         
-        # Dibujar todo
-        if use_level_system and hasattr(current_level, 'draw'):
-            current_level.draw(screen, current_level.scroll_offset_x, current_level.scroll_offset_y)
+        # Dibujar todo por capas: fondo y obstáculos fijos, entidades del mundo, jugador y HUD
+        if use_level_system:
+            offset_x, offset_y = current_level.scroll_offset_x, current_level.scroll_offset_y
+            renderer.sync_level(screen, current_level, background, offset_x, offset_y)
+            renderer.queue("obstacles", partial(current_level.draw_checkpoints,
+                                                offset_x=offset_x, offset_y=offset_y))
             
-            # Dibujar punto de salida si nivel está casi completado
+            # Punto de salida si nivel está casi completado
             if enemies_to_spawn <= 0 and len(enemies) == 0:
-                exit_x, exit_y = current_level.get_exit_point()
-                
-                # Efecto pulsante para salida
-                pulse = abs(math.sin(pygame.time.get_ticks() / 500)) * 5
-                exit_radius = 25 + pulse
-                
-                # Círculo de salida
-                exit_surface = pygame.Surface((exit_radius*2, exit_radius*2), pygame.SRCALPHA)
-                pygame.draw.circle(exit_surface, (0, 255, 0, 150), (exit_radius, exit_radius), exit_radius)
-                screen.blit(exit_surface, (exit_x - exit_radius, exit_y - exit_radius))
-                
-                # Texto "SALIDA"
-                exit_text = font.render("SALIDA", True, GREEN)
-                screen.blit(exit_text, (exit_x - exit_text.get_width()//2, exit_y - exit_radius - 30))
+                renderer.queue("obstacles", partial(draw_exit, exit_point=current_level.get_exit_point(),
+                                                    font=font))
         else:
-            screen.blit(background, (0, 0))
+            renderer.sync_level(screen, None, background)
         
-        # Dibujar pickups
-        for pickup in pickups:
-            pickup.draw(screen)
-            
-        # Dibujar proyectiles
-        for projectile in projectiles:
-            projectile.draw(screen)
-            
-        # Dibujar enemigos
-        for enemy in enemies:
-            enemy.draw(screen)
-            
-        # Dibujar jugador
-        player.draw(screen)
-        
-        # Dibujar efectos de ataque
-        for effect in attack_effects:
-            effect.draw(screen)
-        
-        # Dibujar HUD
-        player.draw_hud(screen, enemies_to_spawn, len(enemies))
+        Enemy.pointer = pygame.mouse.get_pos()  # Barras de vida al pasar el ratón
+        renderer.queue_world(world)
+        renderer.queue("player", player.draw)
+        renderer.queue("hud", partial(player.draw_hud, enemies_to_spawn=enemies_to_spawn,
+                                      enemies_count=len(enemies)))
+        if use_level_system and current_level:
+            # Minimapa con un punto por enemigo, en el mismo lote del HUD
+            minimap.update(current_level, player, enemies)
+            renderer.queue_entities("hud", (minimap,))
+        renderer.draw(screen)
         
         # Mensaje de nivel completado
         if level_complete:
@@ -1156,12 +1251,11 @@ def main():
             next_text = font.render("Presiona ESPACIO para iniciar el siguiente nivel", True, WHITE)
             screen.blit(complete_text, (WIDTH//2 - complete_text.get_width()//2, HEIGHT//2 - 30))
             screen.blit(next_text, (WIDTH//2 - next_text.get_width()//2, HEIGHT//2 + 20))
-        
-        pygame.display.flip()
-        clock.tick(60)
-    
+
+# Función principal: el juego sin pasar por el menú
+def main():
+    SceneManager(screen).run(LoopScene(game_loop))
     pygame.quit()
-    sys.exit()
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
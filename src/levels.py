@@ -20,6 +20,12 @@ try:
 except ImportError:
     WIDTH, HEIGHT = 800, 600
 
+# Guardado en segundo plano
+try:
+    from src.save import get_save_manager
+except ImportError:
+    from save import get_save_manager
+
 # Importar módulos necesarios
 try:
     from dialogue import load_dialogues, show_cutscene, show_tutorial
@@ -38,13 +44,16 @@ DARK_GREEN = (0, 100, 0)
 DARK_RED = (139, 0, 0)
 POTATO_BROWN = (139, 69, 19)
 
+# Atlas de texturas compartido (caché de sprites)
+try:
+    from src.atlas import load_sprite
+except ImportError:
+    from atlas import load_sprite
+
 # Función para cargar imágenes con manejo de errores
 def load_image(path, scale=None):
     try:
-        image = pygame.image.load(path).convert_alpha()
-        if scale:
-            image = pygame.transform.scale(image, scale)
-        return image
+        return load_sprite(path, scale)
     except pygame.error as e:
         print(f"No se pudo cargar la imagen {path}: {e}")
         # Crear una superficie de reemplazo
@@ -54,8 +63,17 @@ def load_image(path, scale=None):
         pygame.draw.line(surface, (255, 0, 0), (50, 0), (0, 50), 2)
         return surface
 
+# Convertir un punto del JSON ({"x": .., "y": ..} o [x, y]) a tupla
+def to_point(value):
+    if isinstance(value, dict):
+        return (value.get("x", 0), value.get("y", 0))
+    return tuple(value)
+
 # Clase para obstáculos y elementos interactivos
 class Obstacle:
+    # Atributos fijos por instancia (sin __dict__: menos memoria y acceso más rápido)
+    __slots__ = ("x", "y", "width", "height", "type", "destructible", "health", "image", "rect")
+    
     def __init__(self, x, y, width, height, obstacle_type="wall"):
         self.x = x
         self.y = y
@@ -204,6 +222,7 @@ class Level:
         self.enemies_to_spawn = 0
         self.boss = None
         self.spawn_rate = 60  # Frames entre generación de enemigos
+        self.waves = []  # Guion de oleadas (vacío = oleadas generadas, ver waves.py)
         self.dialogues = []
         self.completed = False
         self.linear = True  # Modo lineal (avance horizontal)
@@ -268,10 +287,11 @@ class Level:
                     self.checkpoints.append(checkpoint)
                 
                 # Otros datos
-                self.spawn_points = level_data.get("spawn_points", [(100, 100), (WIDTH-100, 100), (WIDTH-100, HEIGHT-100), (100, HEIGHT-100)])
-                self.exit_point = level_data.get("exit_point", (WIDTH//2, HEIGHT//2))
+                self.spawn_points = [to_point(point) for point in level_data.get("spawn_points", [(100, 100), (WIDTH-100, 100), (WIDTH-100, HEIGHT-100), (100, HEIGHT-100)])]
+                self.exit_point = to_point(level_data.get("exit_point", (WIDTH//2, HEIGHT//2)))
                 self.enemies_to_spawn = level_data.get("enemies_count", 5 + level_number * 2)
                 self.spawn_rate = level_data.get("spawn_rate", 60)
+                self.waves = level_data.get("waves", [])
                 
                 # Boss específico (si hay)
                 if "boss" in level_data and level_data["boss"]:
@@ -488,7 +508,9 @@ class Level:
                           HEIGHT // 2 + random.randint(-50, 50))
     
     def update(self, player_x=None, player_y=None):
-        """Actualizar elementos del nivel"""
+        """Actualizar elementos del nivel (devuelve el checkpoint activado, si lo hay)"""
+        activated = None
+
         # Actualizar checkpoints
         for checkpoint in self.checkpoints:
             checkpoint.update()
@@ -498,6 +520,10 @@ class Level:
                 dist = math.sqrt((player_x - checkpoint.x)**2 + (player_y - checkpoint.y)**2)
                 if dist < checkpoint.radius and not checkpoint.active:
                     checkpoint.activate()
+                    get_save_manager().activate_checkpoint(self.level_number, checkpoint.id)
+                    activated = checkpoint
+
+        return activated
     
     def draw(self, screen, offset_x=0, offset_y=0):
         """Dibujar el nivel en pantalla"""
@@ -546,6 +572,26 @@ class Level:
                 obstacle.draw(screen)
         
         # Dibujar checkpoints
+        self.draw_checkpoints(screen, offset_x, offset_y)
+    
+    def render_static(self):
+        """Fondo y obstáculos compuestos en una imagen del tamaño del nivel
+
+        Está en coordenadas del mundo: en niveles lineales se dibuja la
+        ventana del scroll (ver render.StaticLayer).
+        """
+        width = self.scroll_width if self.linear else WIDTH
+        surface = pygame.Surface((width, HEIGHT))
+        if self.background:
+            surface.blit(self.background, (0, 0))
+        else:
+            surface.fill(BLACK)
+        for obstacle in self.obstacles:
+            obstacle.draw(surface)
+        return surface
+    
+    def draw_checkpoints(self, screen, offset_x=0, offset_y=0):
+        """Dibujar los checkpoints (cambian de estado, no van en la imagen fija)"""
         for checkpoint in self.checkpoints:
             # Ajustar posición según desplazamiento
             if self.linear:
@@ -645,8 +691,19 @@ class Level:
         else:
             return self.exit_point
     
+    def get_boss(self):
+        """Tipo de jefe del nivel y su línea de tiempo propia, si la trae el JSON"""
+        if isinstance(self.boss, dict):
+            return self.boss.get("type"), self.boss.get("timeline")
+        return self.boss, None
+    
     def get_boss_spawn_point(self):
         """Obtener punto de aparición para el jefe"""
+        if isinstance(self.boss, dict) and "position" in self.boss:
+            x, y = to_point(self.boss["position"])
+            if self.linear:
+                return (x - self.scroll_offset_x, y - self.scroll_offset_y)
+            return (x, y)
         if self.linear:
             # En niveles lineales, el jefe aparece al final
             return (self.scroll_width - 200 - self.scroll_offset_x, 
@@ -688,33 +745,9 @@ class Level:
         self.save_progress()
         
     def save_progress(self):
-        """Guardar progreso del nivel completado"""
-        try:
-            # Cargar progreso existente
-            progress_file = "assets/save/progress.json"
-            progress_data = {}
-            
-            if os.path.exists(progress_file):
-                with open(progress_file, 'r') as file:
-                    progress_data = json.load(file)
-            
-            # Actualizar nivel completado
-            completed_levels = progress_data.get("completed_levels", [])
-            if self.level_number not in completed_levels:
-                completed_levels.append(self.level_number)
-                
-            progress_data["completed_levels"] = completed_levels
-            progress_data["last_level"] = self.level_number + 1
-            
-            # Guardar progreso actualizado
-            os.makedirs(os.path.dirname(progress_file), exist_ok=True)
-            with open(progress_file, 'w') as file:
-                json.dump(progress_data, file)
-                
-            print(f"Progreso guardado. Nivel {self.level_number} completado.")
-            
-        except Exception as e:
-            print(f"Error al guardar progreso: {e}")
+        """Guardar progreso del nivel completado (la escritura va en segundo plano)"""
+        get_save_manager().mark_level_completed(self.level_number)
+        print(f"Progreso guardado. Nivel {self.level_number} completado.")
 
 # Clase para gestionar todos los niveles
 class LevelManager:
@@ -726,24 +759,8 @@ class LevelManager:
         
     def load_progress(self):
         """Cargar progreso del jugador"""
-        try:
-            progress_file = "assets/save/progress.json"
-            
-            if os.path.exists(progress_file):
-                with open(progress_file, 'r') as file:
-                    progress_data = json.load(file)
-                    
-                # Obtener último nivel jugado
-                self.current_level_number = progress_data.get("last_level", 1)
-                
-                print(f"Progreso cargado. Nivel actual: {self.current_level_number}")
-            else:
-                self.current_level_number = 1
-                print("No se encontró archivo de progreso. Iniciando desde nivel 1.")
-                
-        except Exception as e:
-            print(f"Error al cargar progreso: {e}")
-            self.current_level_number = 1
+        self.current_level_number = get_save_manager().get_last_level()
+        print(f"Progreso cargado. Nivel actual: {self.current_level_number}")
     
     def load_level(self, level_number=None):
         """Cargar un nivel específico o el actual"""
@@ -775,16 +792,17 @@ class LevelManager:
         """Reiniciar el nivel actual"""
         return self.load_level(self.current_level_number)
     
-    def show_level_intro(self, screen):
-        """Mostrar introducción del nivel actual"""
+    def show_level_intro(self, scenes):
+        """Mostrar introducción del nivel actual (escenas apiladas sobre el juego)"""
         if self.current_level:
-            # Mostrar cutscene si es nivel de jefe o múltiplo de 5
-            if self.current_level_number % 5 == 0:
-                show_cutscene(screen, self.current_level_number)
-                
+            # Se apilan al revés: la última escena apilada es la primera que se ve
             # Mostrar tutorial para primeros niveles
             if self.current_level_number <= 3:
-                show_tutorial(screen, self.current_level_number)
+                show_tutorial(scenes, self.current_level_number)
+                
+            # Mostrar cutscene si es nivel de jefe o múltiplo de 5
+            if self.current_level_number % 5 == 0:
+                show_cutscene(scenes, self.current_level_number)
 
 # Ejemplo de uso
 if __name__ == "__main__":
@@ -0,0 +1,92 @@
+"""
+Módulo de nivel de detalle (LOD) para Killer Potato
+Reparte las actualizaciones de los enemigos según su visibilidad y distancia al jugador
+
+Los enemigos visibles se actualizan cada frame. Los que están fuera de la
+pantalla se actualizan cada pocos frames, con un dt igual a los frames
+acumulados para que su movimiento y sus contadores avancen al mismo ritmo.
+Los enemigos no visibles no se dibujan ni se comprueban colisiones con ellos.
+
+Cada enemigo debe declarar always_update (atributo de clase) y tener los
+atributos lod_visible y lod_pending, que gestiona este planificador.
+"""
+
+import pygame
+
+# Configuración de pantalla y LOD (tomar de config o usar valores por defecto)
+try:
+    from config.settings import WIDTH, HEIGHT, LOD_SETTINGS
+except ImportError:
+    WIDTH, HEIGHT = 800, 600
+    LOD_SETTINGS = {
+        "screen_margin": 100,
+        "near_distance": 600,
+        "near_interval": 2,
+        "far_interval": 4
+    }
+
+# Clase que programa las actualizaciones de los enemigos
+class LODScheduler:
+    def __init__(self, settings=LOD_SETTINGS):
+        margin = settings.get("screen_margin", 100)
+        self.view = pygame.Rect(-margin, -margin, WIDTH + margin * 2, HEIGHT + margin * 2)
+        self.near_distance_sq = settings.get("near_distance", 600) ** 2
+        self.near_interval = settings.get("near_interval", 2)
+        self.far_interval = settings.get("far_interval", 4)
+        self.frame = 0
+
+        # Estadísticas del último frame
+        self.visible_count = 0
+        self.updated_count = 0
+
+    def get_interval(self, enemy, player_x, player_y):
+        """Frames entre actualizaciones para un enemigo (1 = cada frame)"""
+        if enemy.always_update:
+            enemy.lod_visible = True
+            return 1
+
+        visible = self.view.collidepoint(enemy.x, enemy.y)
+        enemy.lod_visible = visible
+        if visible:
+            return 1
+
+        dx = enemy.x - player_x
+        dy = enemy.y - player_y
+        if dx * dx + dy * dy < self.near_distance_sq:
+            return self.near_interval
+        return self.far_interval
+
+    def update(self, enemies, player_x, player_y, obstacles=None):
+        """Actualizar los enemigos que toquen este frame.
+
+        Devuelve una lista de (enemigo, resultado) con lo que devolvió
+        cada update que no fue None (disparos, invocaciones...).
+        """
+        self.frame += 1
+        self.visible_count = 0
+        self.updated_count = 0
+        results = []
+
+        for index, enemy in enumerate(enemies):
+            interval = self.get_interval(enemy, player_x, player_y)
+            if enemy.lod_visible:
+                self.visible_count += 1
+
+            pending = enemy.lod_pending + 1
+
+            # Escalonar por índice para repartir la carga entre frames
+            if interval > 1 and (self.frame + index) % interval and pending < interval:
+                enemy.lod_pending = pending
+                continue
+
+            enemy.lod_pending = 0
+            self.updated_count += 1
+            result = enemy.update(player_x, player_y, obstacles, pending)
+            if result is not None:
+                results.append((enemy, result))
+
+        return results
+
+    def visible(self, enemies):
+        """Enemigos visibles en el último frame"""
+        return [enemy for enemy in enemies if enemy.lod_visible]
@@ -15,7 +15,14 @@ pygame.font.init()
 
 # Screen configuration
 WIDTH, HEIGHT = 800, 600
-screen = pygame.display.set_mode((WIDTH, HEIGHT))
+
+# Window (synced to the display refresh if PACING_SETTINGS asks for it)
+try:
+    from src.pacing import set_display_mode
+except ImportError:
+    from pacing import set_display_mode
+
+screen = set_display_mode((WIDTH, HEIGHT))
 pygame.display.set_caption("Killer Potato: La Venganza de la Papa")
 
 # Load fonts
@@ -47,13 +54,24 @@ TRANSPARENT_BLACK = (0, 0, 0, 180)
 POTATO_BROWN = (139, 69, 19)
 POTATO_LIGHT = (210, 180, 140)
 
+# Shared texture atlas (sprite cache)
+try:
+    from src.atlas import load_sprite
+except ImportError:
+    from atlas import load_sprite
+
+# Scene stack with the single main loop, and the fades between scenes
+try:
+    from src.scenes import SceneManager, LoopScene
+    from src.transitions import Transition
+except ImportError:
+    from scenes import SceneManager, LoopScene
+    from transitions import Transition
+
 # Function to load images with error handling
 def load_image(path, scale=None):
     try:
-        image = pygame.image.load(path).convert_alpha()
-        if scale:
-            image = pygame.transform.scale(image, scale)
-        return image
+        return load_sprite(path, scale)
     except pygame.error as e:
         print(f"No se pudo cargar la imagen {path}: {e}")
         # Create a replacement surface
@@ -79,6 +97,34 @@ except:
     potato_character = None
     splatter = None
 
+# Small potato icon shown next to the hovered button (scaled once)
+potato_icon = pygame.transform.scale(potato_character, (40, 40)) if potato_character else None
+
+def static_layer():
+    """Opaque surface in the screen's format to composite static menu layers once"""
+    layer = pygame.Surface((WIDTH, HEIGHT), 0, screen)
+    layer.blit(background, (0, 0))
+    return layer
+
+def panel_layer(title_text):
+    """Background, content panel, title and divider shared by the menu sub-screens"""
+    layer = static_layer()
+    
+    # Semi-transparent panel for content
+    panel = pygame.Surface((WIDTH - 140, HEIGHT - 180), pygame.SRCALPHA)
+    panel.fill((0, 0, 0, 160))
+    layer.blit(panel, (70, 130))
+    
+    # Title with subtle shadow
+    title_shadow = font_large.render(title_text, True, BLACK)
+    title = font_large.render(title_text, True, RED)
+    layer.blit(title_shadow, (WIDTH//2 - title_shadow.get_width()//2 + 2, 52))
+    layer.blit(title, (WIDTH//2 - title.get_width()//2, 50))
+    
+    # Simple divider line
+    pygame.draw.line(layer, POTATO_BROWN, (100, 110), (WIDTH - 100, 110), 2)
+    return layer
+
 # Improved menu button class with cleaner style
 class Button:
     def __init__(self, x, y, width, height, text, color, hover_color, action=None):
@@ -93,23 +139,13 @@ class Button:
         self.pulse_speed = 0.03  # Reduced from 0.05
         self.pulse_direction = 1
         
-    def draw(self, surface):
-        # Simplified pulse effect for selected button
-        if self.is_hovered:
-            self.pulse_value += self.pulse_speed * self.pulse_direction
-            if self.pulse_value >= 1.0:
-                self.pulse_value = 1.0
-                self.pulse_direction = -1
-            elif self.pulse_value <= 0.0:
-                self.pulse_value = 0.0
-                self.pulse_direction = 1
-                
-            pulse_offset = int(self.pulse_value * 3)  # Reduced from 5
-            color = self.hover_color
-        else:
-            pulse_offset = 0
-            color = self.color
-            
+    # Pre-rendered button images: (text, size, colors, alpha, hovered, pulse offset) -> surface
+    state_cache = {}
+    
+    def render_state(self, hovered, pulse_offset):
+        """Button image for one state (normal or hovered at a pulse step)"""
+        color = self.hover_color if hovered else self.color
+        
         # Create surface for button with transparency
         button_surface = pygame.Surface((self.rect.width + pulse_offset*2, self.rect.height + pulse_offset*2), pygame.SRCALPHA)
         
@@ -118,7 +154,7 @@ class Button:
                        (0, 0, self.rect.width + pulse_offset*2, self.rect.height + pulse_offset*2), 0, 8)
         
         # Border
-        if self.is_hovered:
+        if hovered:
             border_color = POTATO_BROWN
             border_width = 2  # Reduced from 3
         else:
@@ -129,7 +165,7 @@ class Button:
                        (0, 0, self.rect.width + pulse_offset*2, self.rect.height + pulse_offset*2), border_width, 8)
         
         # Draw text with subtle shadow effect
-        if self.is_hovered:
+        if hovered:
             text_surf = font_medium.render(self.text, True, WHITE)
         else:
             text_surf = font_medium.render(self.text, True, LIGHT_GRAY)
@@ -142,19 +178,36 @@ class Button:
         # Main text
         text_rect = text_surf.get_rect(center=(button_surface.get_width()//2, button_surface.get_height()//2))
         button_surface.blit(text_surf, text_rect)
+        return button_surface
+        
+    def draw(self, surface):
+        # Simplified pulse effect for selected button
+        if self.is_hovered:
+            self.pulse_value += self.pulse_speed * self.pulse_direction
+            if self.pulse_value >= 1.0:
+                self.pulse_value = 1.0
+                self.pulse_direction = -1
+            elif self.pulse_value <= 0.0:
+                self.pulse_value = 0.0
+                self.pulse_direction = 1
+                
+            pulse_offset = int(self.pulse_value * 3)  # Reduced from 5
+        else:
+            pulse_offset = 0
+        
+        # Reuse the pre-rendered image for this state
+        key = (self.text, self.rect.size, self.color, self.hover_color, self.alpha, self.is_hovered, pulse_offset)
+        button_surface = Button.state_cache.get(key)
+        if button_surface is None:
+            button_surface = Button.state_cache[key] = self.render_state(self.is_hovered, pulse_offset)
         
         # Draw the button on the main surface
         surface.blit(button_surface, (self.rect.x - pulse_offset, self.rect.y - pulse_offset))
         
         # Small potato icon when hovered (instead of large character)
-        if self.is_hovered and potato_character:
+        if self.is_hovered and potato_icon:
             icon_offset = int(math.sin(pygame.time.get_ticks() / 400) * 2)  # Reduced movement
-            icon_scale = (40, 40)  # Smaller icon
-            try:
-                icon = pygame.transform.scale(potato_character, icon_scale)
-                surface.blit(icon, (self.rect.x - 50, self.rect.y + self.rect.height//2 - 20 + icon_offset))
-            except:
-                pass
+            surface.blit(potato_icon, (self.rect.x - 50, self.rect.y + self.rect.height//2 - 20 + icon_offset))
         
     def check_hover(self, mouse_pos):
         self.is_hovered = self.rect.collidepoint(mouse_pos)
@@ -174,56 +227,39 @@ class Button:
             return True
         return False
 
+# Scene manager running the menu (set by main()) and the game scene, kept while
+# the player is back in the menu so it resumes with its state and caches
+manager = None
+game_scene = None
+
 # Button action functions
 def start_game():
+    global game_scene
     print("Starting game...")
-    # Screen transition before starting
-    fade_transition()
-    # Call the main game
-    game.main()
+    # Resume the suspended game, or start a new one
+    if game_scene is None or game_scene.finished:
+        game_scene = LoopScene(game.game_loop)
+    manager.push(game_scene)
     
 def show_instructions():
     print("Showing instructions...")
     # Change to instructions screen
-    instructions_screen()
+    manager.push(LoopScene(instructions_screen))
     
 def show_credits():
     print("Showing credits...")
     # Change to credits screen
-    credits_screen()
+    manager.push(LoopScene(credits_screen))
 
 def show_story():
     print("Showing story...")
     # Change to story screen
-    story_screen()
+    manager.push(LoopScene(story_screen))
     
 def quit_game():
     print("Exiting game...")
-    fade_transition(fade_in=False)
-    pygame.quit()
-    sys.exit()
-
-# Transition effects
-def fade_transition(fade_in=True):
-    fade_surface = pygame.Surface((WIDTH, HEIGHT))
-    fade_surface.fill(BLACK)
-    
-    for alpha in range(0, 300, 5):
-        if fade_in:
-            alpha_value = 255 - alpha
-        else:
-            alpha_value = alpha
-            
-        if alpha_value < 0:
-            alpha_value = 0
-        if alpha_value > 255:
-            alpha_value = 255
-            
-        fade_surface.set_alpha(alpha_value)
-        screen.blit(background, (0, 0))
-        screen.blit(fade_surface, (0, 0))
-        pygame.display.flip()
-        pygame.time.delay(5)
+    # Fade to black; the main loop ends when the fade is over
+    manager.quit()
 
 # Simplified background effect class
 class BackgroundEffect:
@@ -256,12 +292,16 @@ class BackgroundEffect:
                 'speed': random.uniform(0.1, 0.3),  # Slower movement
                 'alpha': random.randint(5, 15)  # More transparent
             }
+            # The patch never changes shape or color, so it is filled once
+            fog['surface'] = pygame.Surface((fog['width'], fog['height']), pygame.SRCALPHA)
+            fog['surface'].fill((POTATO_LIGHT[0], POTATO_LIGHT[1], POTATO_LIGHT[2], fog['alpha']))
             self.fog_particles.append(fog)
             
-    def update(self):
+    def update(self, steps=1):
+        """Advance the effect `steps` frames (fractional at a capped frame rate)"""
         # Update sauce particles
         for particle in self.particles:
-            particle['y'] += particle['speed']
+            particle['y'] += particle['speed'] * steps
             
             # Reset particle if it leaves the screen
             if particle['y'] > HEIGHT:
@@ -270,7 +310,7 @@ class BackgroundEffect:
                 
         # Update fog
         for fog in self.fog_particles:
-            fog['x'] += fog['speed']
+            fog['x'] += fog['speed'] * steps
             
             # Reset fog if it leaves the screen
             if fog['x'] > WIDTH + 100:
@@ -279,10 +319,7 @@ class BackgroundEffect:
                 
     def draw(self, surface):
         # Draw fog (more subtle)
-        for fog in self.fog_particles:
-            fog_surface = pygame.Surface((fog['width'], fog['height']), pygame.SRCALPHA)
-            fog_surface.fill((POTATO_LIGHT[0], POTATO_LIGHT[1], POTATO_LIGHT[2], fog['alpha']))
-            surface.blit(fog_surface, (int(fog['x']), int(fog['y'])))
+        surface.blits([(fog['surface'], (int(fog['x']), int(fog['y']))) for fog in self.fog_particles], False)
             
         # Draw sauce particles (more subtle)
         for particle in self.particles:
@@ -306,7 +343,7 @@ class BackgroundEffect:
                 )
 
 # Story screen function
-def story_screen():
+def story_screen(scenes):
     running = True
     
     story_text = [
@@ -346,8 +383,6 @@ def story_screen():
         }
         sauce_drops.append(drop)
     
-    fade_transition()
-    
     # Display all text at once (no animation)
     text_display_index = len(story_text)
     
@@ -357,43 +392,32 @@ def story_screen():
     except:
         pass
     
-    while running:
-        screen.blit(background, (0, 0))
-        
-        # Create semi-transparent panel for content (cleaner)
-        panel = pygame.Surface((WIDTH - 140, HEIGHT - 180), pygame.SRCALPHA)  # Larger margins
-        panel.fill((0, 0, 0, 160))  # More transparent
-        screen.blit(panel, (70, 130))  # Positioned with more space
-        
-        # Show story image if available
-        if story_image:
-            screen.blit(story_image, (WIDTH//2 - story_image.get_width()//2, 150))
-            text_start_y = 460  # Below image
+    # Everything but the drops and the button is static: composite it once
+    layer = panel_layer("LA HISTORIA")
+    
+    # Show story image if available
+    if story_image:
+        layer.blit(story_image, (WIDTH//2 - story_image.get_width()//2, 150))
+        text_start_y = 460  # Below image
+    else:
+        text_start_y = 170  # No image, text higher up
+    
+    # Show all text directly (no animation)
+    for i in range(min(text_display_index, len(story_text))):
+        line = story_text[i]
+        if line == "":  # Empty line
+            continue
         else:
-            text_start_y = 170  # No image, text higher up
-        
-        # Title with effect (more subtle)
-        title_text = "LA HISTORIA"
-        title_shadow = font_large.render(title_text, True, BLACK)
-        title = font_large.render(title_text, True, RED)
-        screen.blit(title_shadow, (WIDTH//2 - title_shadow.get_width()//2 + 2, 52))  # Reduced shadow
-        screen.blit(title, (WIDTH//2 - title.get_width()//2, 50))
-        
-        # Simple divider line
-        pygame.draw.line(screen, POTATO_BROWN, (100, 110), (WIDTH - 100, 110), 2)
-        
-        # Show all text directly (no animation)
-        for i in range(min(text_display_index, len(story_text))):
-            line = story_text[i]
-            if line == "":  # Empty line
-                continue
-            else:
-                text = font_small.render(line, True, WHITE)
-                screen.blit(text, (WIDTH//2 - text.get_width()//2, text_start_y + i * 25))
+            text = font_small.render(line, True, WHITE)
+            layer.blit(text, (WIDTH//2 - text.get_width()//2, text_start_y + i * 25))
+    
+    while running:
+        events = yield
+        screen.blit(layer, (0, 0))
         
         # Update and draw sauce drops (more subtle)
         for drop in sauce_drops:
-            drop['y'] += drop['speed']
+            drop['y'] += drop['speed'] * scenes.steps
             if drop['y'] > HEIGHT:
                 drop['y'] = random.randint(-200, -50)
                 drop['x'] = random.randint(0, WIDTH)
@@ -408,27 +432,21 @@ def story_screen():
         back_button.check_hover(mouse_pos)
         back_button.draw(screen)
         
+        # Only background animation: with no input and no hover, a capped frame rate is enough
+        if not events and not back_button.is_hovered:
+            scenes.max_fps = scenes.pacer.menu_fps
+        
         # Event handling
-        for event in pygame.event.get():
-            if event.type == QUIT:
-                fade_transition(fade_in=False)
-                pygame.quit()
-                sys.exit()
-                
+        for event in events:
             if back_button.handle_event(event):
                 running = False
                 
             if event.type == KEYDOWN:
                 if event.key == K_ESCAPE:
                     running = False
-        
-        pygame.display.flip()
-        pygame.time.delay(10)
-    
-    fade_transition()
 
 # Instructions screen function with improved design
-def instructions_screen():
+def instructions_screen(scenes):
     running = True
     
     instructions = [
@@ -452,88 +470,68 @@ def instructions_screen():
     
     back_button = Button(WIDTH//2 - 75, HEIGHT - 80, 150, 50, "VOLVER", POTATO_BROWN, RED, None)
     
-    fade_transition()
+    # The whole screen except the button is static: composite it once
+    layer = panel_layer("INSTRUCCIONES")
+    
+    # Instructions with better spacing
+    for i, line in enumerate(instructions):
+        if ":" in line:  # Section title
+            text = font_medium.render(line, True, RED)
+            layer.blit(text, (WIDTH//2 - text.get_width()//2, 170 + i * 28))
+        else:
+            text = font_small.render(line, True, WHITE)
+            layer.blit(text, (WIDTH//2 - text.get_width()//2, 170 + i * 28))
+    
+    # Character image to one side (less intrusive)
+    if potato_character:
+        char_x = WIDTH - 180
+        char_y = HEIGHT - 180
+        layer.blit(potato_character, (char_x, char_y))
+        
+        # Simple speech bubble
+        bubble_width, bubble_height = 180, 60
+        bubble_x = char_x - bubble_width + 40
+        bubble_y = char_y - bubble_height
+        
+        # Draw bubble
+        pygame.draw.ellipse(layer, WHITE, (bubble_x, bubble_y, bubble_width, bubble_height))
+        pygame.draw.ellipse(layer, BLACK, (bubble_x, bubble_y, bubble_width, bubble_height), 2)
+        
+        # Bubble tip
+        points = [(bubble_x + bubble_width - 30, bubble_y + bubble_height),
+                 (bubble_x + bubble_width - 10, bubble_y + bubble_height + 20),
+                 (bubble_x + bubble_width - 5, bubble_y + bubble_height - 5)]
+        pygame.draw.polygon(layer, WHITE, points)
+        pygame.draw.polygon(layer, BLACK, points, 2)
+        
+        # Text in bubble
+        dialog_text = font_small.render("¡A freír humanos!", True, BLACK)
+        layer.blit(dialog_text, (bubble_x + bubble_width//2 - dialog_text.get_width()//2, 
+                                 bubble_y + bubble_height//2 - dialog_text.get_height()//2))
     
     while running:
-        screen.blit(background, (0, 0))
-        
-        # Create cleaner panel for content
-        panel = pygame.Surface((WIDTH - 140, HEIGHT - 180), pygame.SRCALPHA)  # Increased margins
-        panel.fill((0, 0, 0, 160))  # More transparent
-        screen.blit(panel, (70, 130))  # Better positioning
-        
-        # Title with subtle effect
-        title_text = "INSTRUCCIONES"
-        title_shadow = font_large.render(title_text, True, BLACK)
-        title = font_large.render(title_text, True, RED)
-        screen.blit(title_shadow, (WIDTH//2 - title_shadow.get_width()//2 + 2, 52))  # Reduced shadow
-        screen.blit(title, (WIDTH//2 - title.get_width()//2, 50))
-        
-        # Simple divider
-        pygame.draw.line(screen, POTATO_BROWN, (100, 110), (WIDTH - 100, 110), 2)
-        
-        # Instructions with better spacing
-        for i, line in enumerate(instructions):
-            if ":" in line:  # Section title
-                text = font_medium.render(line, True, RED)
-                screen.blit(text, (WIDTH//2 - text.get_width()//2, 170 + i * 28))
-            else:
-                text = font_small.render(line, True, WHITE)
-                screen.blit(text, (WIDTH//2 - text.get_width()//2, 170 + i * 28))
-        
-        # Character image to one side (less intrusive)
-        if potato_character:
-            char_x = WIDTH - 180
-            char_y = HEIGHT - 180
-            screen.blit(potato_character, (char_x, char_y))
-            
-            # Simple speech bubble
-            bubble_width, bubble_height = 180, 60
-            bubble_x = char_x - bubble_width + 40
-            bubble_y = char_y - bubble_height
-            
-            # Draw bubble
-            pygame.draw.ellipse(screen, WHITE, (bubble_x, bubble_y, bubble_width, bubble_height))
-            pygame.draw.ellipse(screen, BLACK, (bubble_x, bubble_y, bubble_width, bubble_height), 2)
-            
-            # Bubble tip
-            points = [(bubble_x + bubble_width - 30, bubble_y + bubble_height),
-                     (bubble_x + bubble_width - 10, bubble_y + bubble_height + 20),
-                     (bubble_x + bubble_width - 5, bubble_y + bubble_height - 5)]
-            pygame.draw.polygon(screen, WHITE, points)
-            pygame.draw.polygon(screen, BLACK, points, 2)
-            
-            # Text in bubble
-            dialog_text = font_small.render("¡A freír humanos!", True, BLACK)
-            screen.blit(dialog_text, (bubble_x + bubble_width//2 - dialog_text.get_width()//2, 
-                                     bubble_y + bubble_height//2 - dialog_text.get_height()//2))
+        events = yield
+        screen.blit(layer, (0, 0))
         
         # Back button
         mouse_pos = pygame.mouse.get_pos()
         back_button.check_hover(mouse_pos)
         back_button.draw(screen)
         
+        # Nothing animates here: with no input and no hover, a low frame rate is enough
+        scenes.idle = not events and not back_button.is_hovered
+        
         # Event handling
-        for event in pygame.event.get():
-            if event.type == QUIT:
-                fade_transition(fade_in=False)
-                pygame.quit()
-                sys.exit()
-                
+        for event in events:
             if back_button.handle_event(event):
                 running = False
                 
             if event.type == KEYDOWN:
                 if event.key == K_ESCAPE:
                     running = False
-        
-        pygame.display.flip()
-        pygame.time.delay(10)
-    
-    fade_transition()
 
 # Credits screen function with static credits (no scrolling)
-def credits_screen():
+def credits_screen(scenes):
     running = True
     
     # Static credits (no scrolling)
@@ -570,9 +568,9 @@ def credits_screen():
                     potato['direction'] = -1
                 self.potatoes.append(potato)
                 
-        def update(self):
+        def update(self, steps=1):
             for potato in self.potatoes:
-                potato['x'] += potato['speed'] * potato['direction']
+                potato['x'] += potato['speed'] * potato['direction'] * steps
                 
                 # Change direction at edges
                 if potato['x'] < -100 or potato['x'] > WIDTH + 100:
@@ -626,37 +624,22 @@ def credits_screen():
     
     potato_anim = PotatoAnimation()
     
-    fade_transition()
+    # Static credits (no scrolling animation), composited once with the panel
+    layer = panel_layer("CRÉDITOS")
+    for i, line in enumerate(credits):
+        if ":" in line:  # Section title
+            text = font_medium.render(line, True, RED)
+            layer.blit(text, (WIDTH//2 - text.get_width()//2, 170 + i * 35))
+        else:
+            text = font_small.render(line, True, WHITE)
+            layer.blit(text, (WIDTH//2 - text.get_width()//2, 170 + i * 35))
     
     while running:
-        screen.blit(background, (0, 0))
-        
-        # Cleaner content panel
-        panel = pygame.Surface((WIDTH - 140, HEIGHT - 180), pygame.SRCALPHA)
-        panel.fill((0, 0, 0, 160))
-        screen.blit(panel, (70, 130))
-        
-        # Title with subtle effect
-        title_text = "CRÉDITOS"
-        title_shadow = font_large.render(title_text, True, BLACK)
-        title = font_large.render(title_text, True, RED)
-        screen.blit(title_shadow, (WIDTH//2 - title_shadow.get_width()//2 + 2, 52))
-        screen.blit(title, (WIDTH//2 - title.get_width()//2, 50))
-        
-        # Simple divider
-        pygame.draw.line(screen, POTATO_BROWN, (100, 110), (WIDTH - 100, 110), 2)
-        
-        # Static credits (no scrolling animation)
-        for i, line in enumerate(credits):
-            if ":" in line:  # Section title
-                text = font_medium.render(line, True, RED)
-                screen.blit(text, (WIDTH//2 - text.get_width()//2, 170 + i * 35))
-            else:
-                text = font_small.render(line, True, WHITE)
-                screen.blit(text, (WIDTH//2 - text.get_width()//2, 170 + i * 35))
+        events = yield
+        screen.blit(layer, (0, 0))
         
         # Update and draw potatoes
-        potato_anim.update()
+        potato_anim.update(scenes.steps)
         potato_anim.draw(screen)
         
         # Back button
@@ -664,29 +647,21 @@ def credits_screen():
         back_button.check_hover(mouse_pos)
         back_button.draw(screen)
         
+        # Only background animation: with no input and no hover, a capped frame rate is enough
+        if not events and not back_button.is_hovered:
+            scenes.max_fps = scenes.pacer.menu_fps
+        
         # Event handling
-        for event in pygame.event.get():
-            if event.type == QUIT:
-                fade_transition(fade_in=False)
-                pygame.quit()
-                sys.exit()
-                
+        for event in events:
             if back_button.handle_event(event):
                 running = False
                 
             if event.type == KEYDOWN:
                 if event.key == K_ESCAPE:
                     running = False
-        
-        pygame.display.flip()
-        pygame.time.delay(10)
-    
-    fade_transition()
 
-# Improved main menu function with stationary title (no animation)
-def main():
-    clock = pygame.time.Clock()
-    
+# Improved main menu scene with stationary title (no animation)
+def menu_loop(scenes):
     # Create buttons with more spacing
     button_width, button_height = 220, 60
     button_x = WIDTH // 2 - button_width // 2
@@ -697,10 +672,46 @@ def main():
     instructions_button = Button(button_x, 250 + button_spacing * 2, button_width, button_height, "INSTRUCCIONES", POTATO_BROWN, RED, show_instructions)
     credits_button = Button(button_x, 250 + button_spacing * 3, button_width, button_height, "CRÉDITOS", POTATO_BROWN, RED, show_credits)
     quit_button = Button(button_x, 250 + button_spacing * 4, button_width, button_height, "SALIR", POTATO_BROWN, RED, quit_game)
+    buttons = (play_button, story_button, instructions_button, credits_button, quit_button)
     
     # Simplified background effect
     bg_effect = BackgroundEffect()
     
+    # Static layers composited once: background, panel and its border
+    backdrop = static_layer()
+    panel = pygame.Surface((WIDTH - 140, HEIGHT - 140), pygame.SRCALPHA)
+    panel.fill((0, 0, 0, 150))  # More transparent
+    backdrop.blit(panel, (70, 70))  # More margin
+    
+    # Simple, thinner border
+    border_width = 4
+    for i in range(border_width):
+        alpha = 200 - (i * 200 // border_width)
+        pygame.draw.rect(backdrop, (POTATO_BROWN[0], POTATO_BROWN[1], POTATO_BROWN[2], alpha), 
+                        (70-i, 70-i, WIDTH-140+i*2, HEIGHT-140+i*2), 1)
+    
+    # Simplified glow effect under the logo (drawn once)
+    glow_surf = pygame.Surface((logo.get_width()+20, 10), pygame.SRCALPHA)
+    for i in range(5):  # Fewer iterations
+        alpha = 100 - i * 20  # Less intense
+        if alpha < 0:
+            alpha = 0
+        pygame.draw.ellipse(glow_surf, (POTATO_BROWN[0], POTATO_BROWN[1], 0, alpha), 
+                          (i, i, logo.get_width()+20-i*2, 10-i*2))
+    
+    # Version and creator info with their shadows, rendered once
+    footer = []
+    for text, x, y in (("v1.0", None, None), ("© Juan Sebastian Silva P.", 15, None)):
+        text_surf = font_small.render(text, True, LIGHT_GRAY)
+        shadow_surf = font_small.render(text, True, BLACK)
+        x = WIDTH - text_surf.get_width() - 15 if x is None else x
+        y = HEIGHT - text_surf.get_height() - 15
+        footer += [(shadow_surf, (x + 1, y + 1)), (text_surf, (x, y))]
+    
+    # Last rotated logo: it is only redrawn when the quantized angle or scale changes
+    logo_key = None
+    rotated_logo = logo
+    
     # Title positioning (static, no animation)
     title_y = 80  # Fixed position instead of animated
     title_scale = 1.0
@@ -715,17 +726,12 @@ def main():
     except:
         print("No se pudo cargar la música de fondo")
     
-    # Initial transition
-    fade_transition()
-    
-    running = True
-    while running:
+    # The menu stays at the bottom of the stack until the game is closed
+    while True:
+        events = yield
+        
         # Event handling
-        for event in pygame.event.get():
-            if event.type == QUIT:
-                fade_transition(fade_in=False)
-                running = False
-                
+        for event in events:
             # Check button clicks
             play_button.handle_event(event)
             story_button.handle_event(event)
@@ -741,11 +747,15 @@ def main():
         credits_button.check_hover(mouse_pos)
         quit_button.check_hover(mouse_pos)
         
+        # With no input and no hover only the background animates: cap the frame rate
+        if not events and not any(button.is_hovered for button in buttons):
+            scenes.max_fps = scenes.pacer.menu_fps
+        
         # Update background effect
-        bg_effect.update()
+        bg_effect.update(scenes.steps)
         
         # Very subtle pulse effect for title (no vertical movement)
-        title_scale += title_scale_direction
+        title_scale += title_scale_direction * scenes.steps
         if title_scale > 1.02:  # Reduced from 1.03
             title_scale = 1.02
             title_scale_direction = -0.0005
@@ -756,20 +766,8 @@ def main():
         # Minimal oscillation for title
         title_angle = math.sin(pygame.time.get_ticks() / 2000) * 1  # Slower, smaller rotation
         
-        # Draw background
-        screen.blit(background, (0, 0))
-        
-        # Cleaner panel with more space
-        panel = pygame.Surface((WIDTH - 140, HEIGHT - 140), pygame.SRCALPHA)
-        panel.fill((0, 0, 0, 150))  # More transparent
-        screen.blit(panel, (70, 70))  # More margin
-        
-        # Simple, thinner border
-        border_width = 4
-        for i in range(border_width):
-            alpha = 200 - (i * 200 // border_width)
-            pygame.draw.rect(screen, (POTATO_BROWN[0], POTATO_BROWN[1], POTATO_BROWN[2], alpha), 
-                            (70-i, 70-i, WIDTH-140+i*2, HEIGHT-140+i*2), 1)
+        # Draw background, panel and border
+        screen.blit(backdrop, (0, 0))
         
         # Draw background effect (subtler)
         bg_effect.draw(screen)
@@ -784,19 +782,16 @@ def main():
         
         # Draw logo or title with minimal effects (fixed position)
         if logo:
-            # Simple logo animation (just subtle rotation/scale, no vertical movement)
-            rotated_logo = pygame.transform.rotozoom(logo, title_angle, title_scale)
+            # Simple logo animation (just subtle rotation/scale, no vertical movement);
+            # steps of 0.05 degrees and 0.2% are below a pixel at the logo's edge
+            key = (round(title_angle * 20), round(title_scale * 500))
+            if key != logo_key:
+                logo_key = key
+                rotated_logo = pygame.transform.rotozoom(logo, key[0] / 20, key[1] / 500)
             logo_rect = rotated_logo.get_rect(center=(WIDTH//2, title_y + logo.get_height()//2))
             screen.blit(rotated_logo, logo_rect.topleft)
             
             # Simplified glow effect
-            glow_surf = pygame.Surface((logo.get_width()+20, 10), pygame.SRCALPHA)
-            for i in range(5):  # Fewer iterations
-                alpha = 100 - i * 20  # Less intense
-                if alpha < 0:
-                    alpha = 0
-                pygame.draw.ellipse(glow_surf, (POTATO_BROWN[0], POTATO_BROWN[1], 0, alpha), 
-                                  (i, i, logo.get_width()+20-i*2, 10-i*2))
             screen.blit(glow_surf, (WIDTH//2 - glow_surf.get_width()//2, title_y + logo.get_height() + 5))
         else:
             # Simplified title text (fixed position)
@@ -827,23 +822,15 @@ def main():
         credits_button.draw(screen)
         quit_button.draw(screen)
         
-        # Version info
-        version_text = font_small.render("v1.0", True, LIGHT_GRAY)
-        version_shadow = font_small.render("v1.0", True, BLACK)
-        screen.blit(version_shadow, (WIDTH - version_shadow.get_width() - 14, HEIGHT - version_shadow.get_height() - 14))
-        screen.blit(version_text, (WIDTH - version_text.get_width() - 15, HEIGHT - version_text.get_height() - 15))
-        
-        # Creator info
-        creator_text = font_small.render("© Juan Sebastian Silva P.", True, LIGHT_GRAY)
-        creator_shadow = font_small.render("© Juan Sebastian Silva P.", True, BLACK)
-        screen.blit(creator_shadow, (16, HEIGHT - creator_shadow.get_height() - 14))
-        screen.blit(creator_text, (15, HEIGHT - creator_text.get_height() - 15))
-        
-        pygame.display.flip()
-        clock.tick(60)
-    
+        # Version and creator info
+        screen.blits(footer, False)
+
+# Main menu: runs the single main loop, fading in from black
+def main():
+    global manager
+    manager = SceneManager(screen)
+    manager.run(LoopScene(menu_loop), Transition.fade_in((WIDTH, HEIGHT), BLACK))
     pygame.quit()
-    sys.exit()
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
@@ -0,0 +1,124 @@
+"""
+Módulo de ritmo de frames para Killer Potato
+Espera precisa hasta el siguiente frame y ahorro de energía en escenas estáticas
+
+clock.tick espera con un sleep de granularidad gruesa (o con espera activa
+en tick_busy_loop, que gasta un núcleo entero). El marcapasos duerme hasta
+poco antes del momento del frame y espera activamente solo los últimos
+milisegundos. Los momentos se encadenan (cada frame vence un periodo después
+del anterior), así que el ritmo no se desvía aunque un frame acabe antes o
+después; un frame que se retrasa no provoca una ráfaga para recuperar.
+
+Las escenas estáticas (pausa, game over, pantallas sin nada animado) se
+dibujan a idle_fps, y las que solo tienen animaciones de fondo (menús sin
+nada señalado) a menu_fps, avanzando sus animaciones según el tiempo real. Mientras tanto no se espera con sleep sino con
+pygame.event.wait: cualquier entrada despierta el bucle en el acto, así que
+bajar el ritmo no añade retraso a las teclas.
+
+Con vsync la ventana se crea sincronizada (set_display_mode) y la propia
+imagen (flip) ya espera al refresco: a ritmo normal el marcapasos no espera
+otra vez. Si un frame llega antes de un periodo, flip no esperó (el
+sistema no respeta vsync): ese frame se espera por tiempo y, tras varios así,
+el marcapasos deja de contar con vsync.
+"""
+
+import time
+
+import pygame
+
+# FPS objetivo (tomar de config o usar valor por defecto)
+try:
+    from config.settings import FPS
+except ImportError:
+    FPS = 60
+
+# Configuración del ritmo de frames (tomar de config o usar valores por defecto)
+try:
+    from config.settings import PACING_SETTINGS
+except ImportError:
+    PACING_SETTINGS = {
+        "idle_fps": 10,
+        "menu_fps": 30,
+        "spin_ms": 1.5,
+        "vsync": False
+    }
+
+# Frames seguidos sin esperar al refresco para dar vsync por no disponible
+VSYNC_CHECK_FRAMES = 30
+
+def set_display_mode(size, settings=PACING_SETTINGS):
+    """Crear la ventana; con vsync la pide sincronizada al refresco (si se puede)"""
+    if settings.get("vsync", False):
+        try:
+            return pygame.display.set_mode(size, pygame.SCALED, vsync=1)
+        except pygame.error:
+            pass
+    return pygame.display.set_mode(size)
+
+# Clase que marca el ritmo del bucle principal
+class FramePacer:
+    def __init__(self, fps=FPS, settings=PACING_SETTINGS):
+        self.fps = fps
+        self.idle_fps = min(fps, settings.get("idle_fps", 10))
+        self.menu_fps = min(fps, settings.get("menu_fps", 30))
+        self.spin = settings.get("spin_ms", 1.5) / 1000  # Final de la espera hecho activamente
+        self.vsync = settings.get("vsync", False)
+        self.unsynced = 0  # Frames seguidos en los que flip no esperó al refresco
+        self.last = time.perf_counter()  # Final del frame anterior
+        self.deadline = self.last  # Momento en que vence el frame actual
+        self.idle_frames = 0  # Frames dibujados a ritmo reducido
+
+    def wait(self, until, wake=False):
+        """Esperar hasta `until` (perf_counter); con `wake`, una entrada corta la espera
+
+        Devuelve True si la espera se cortó antes de tiempo.
+        """
+        remaining = until - time.perf_counter() - self.spin
+        if wake:
+            if remaining > 0.001:
+                event = pygame.event.wait(int(remaining * 1000))
+                if event.type != pygame.NOEVENT:
+                    pygame.event.post(event)  # Devolverlo a la cola para la escena
+                    return True
+        elif remaining > 0:
+            time.sleep(remaining)
+        while time.perf_counter() < until:
+            pass
+        return False
+
+    def synced(self):
+        """True si flip ya esperó al refresco de la pantalla en este frame"""
+        if not self.vsync:
+            return False
+        # Trabajo más flip de este frame (sin contar esperas): con vsync dura un refresco
+        if time.perf_counter() - self.last >= 0.9 / self.fps:
+            self.unsynced = 0
+            return True
+        self.unsynced += 1
+        if self.unsynced >= VSYNC_CHECK_FRAMES:
+            self.vsync = False  # vsync pedido pero no respetado: esperar por tiempo
+        return False
+
+    def tick(self, idle=False, fps=None):
+        """Esperar al siguiente frame; devuelve los milisegundos desde el anterior
+
+        `idle` baja a idle_fps; `fps` limita el ritmo de este frame (menu_fps...).
+        """
+        if idle:
+            self.idle_frames += 1
+            fps = self.idle_fps
+        else:
+            fps = min(fps or self.fps, self.fps)
+        if fps == self.fps and self.synced():
+            self.deadline = time.perf_counter()
+        else:
+            self.deadline += 1 / fps
+            if self.deadline < time.perf_counter():
+                self.deadline = time.perf_counter()  # Frame retrasado: seguir desde ahora
+            elif self.wait(self.deadline, wake=idle):
+                self.deadline = time.perf_counter()  # Despertado por una entrada
+
+        now = time.perf_counter()
+        elapsed = (now - self.last) * 1000
+        self.last = now
+        return elapsed
@@ -0,0 +1,171 @@
+"""
+Módulo de navegación para Killer Potato
+Campo de flujo compartido que guía a todos los enemigos hacia el jugador esquivando obstáculos
+
+En lugar de buscar un camino por enemigo (A*), se calcula una sola vez cada
+pocos frames la distancia de cada celda al jugador (BFS sobre la rejilla) y
+la dirección a seguir desde cada celda (solo para las celdas que se consultan,
+y se guarda hasta el siguiente recálculo). Cada enemigo solo consulta su celda,
+así que el coste por enemigo es constante.
+"""
+
+import math
+from collections import deque
+
+# Configuración del campo de flujo (tomar de config o usar valores por defecto)
+try:
+    from config.settings import WIDTH, HEIGHT, FLOW_FIELD_SETTINGS
+except ImportError:
+    WIDTH, HEIGHT = 800, 600
+    FLOW_FIELD_SETTINGS = {
+        "cell_size": 40,
+        "recompute_interval": 10,
+        "obstacle_padding": 20
+    }
+
+UNREACHABLE = -1
+
+# Vecinos en 8 direcciones: (columna, fila, vector unitario x, vector unitario y)
+DIAGONAL = 0.7071
+NEIGHBORS = [
+    (1, 0, 1.0, 0.0), (-1, 0, -1.0, 0.0), (0, 1, 0.0, 1.0), (0, -1, 0.0, -1.0),
+    (1, 1, DIAGONAL, DIAGONAL), (-1, 1, -DIAGONAL, DIAGONAL),
+    (1, -1, DIAGONAL, -DIAGONAL), (-1, -1, -DIAGONAL, -DIAGONAL)
+]
+
+# Clase que representa el campo de flujo de un nivel
+class FlowField:
+    def __init__(self, bounds=(0, 0, WIDTH, HEIGHT), settings=FLOW_FIELD_SETTINGS):
+        self.cell_size = settings.get("cell_size", 40)
+        self.recompute_interval = settings.get("recompute_interval", 10)
+        self.padding = settings.get("obstacle_padding", 20)
+
+        self.origin_x, self.origin_y = bounds[0], bounds[1]
+        self.cols = max(1, -(-bounds[2] // self.cell_size))
+        self.rows = max(1, -(-bounds[3] // self.cell_size))
+        size = self.cols * self.rows
+
+        self.blocked = bytearray(size)
+        self.distance = [UNREACHABLE] * size
+        self.directions = {}  # Caché de direcciones por celda
+
+        # Desplazamiento de pantalla a coordenadas del nivel (niveles lineales)
+        self.offset_x = 0
+        self.offset_y = 0
+
+        self.target_cell = None
+        self.obstacle_count = None
+        self.counter = 0
+
+    def set_obstacles(self, obstacles):
+        """Marcar las celdas ocupadas por obstáculos (en coordenadas del nivel)
+
+        Una celda queda bloqueada si su centro cae dentro del obstáculo
+        ampliado con el margen de los enemigos.
+        """
+        self.blocked = bytearray(self.cols * self.rows)
+        size = self.cell_size
+        half = size / 2
+        for obstacle in obstacles:
+            rect = obstacle.rect.inflate(self.padding * 2, self.padding * 2)
+            first_col = max(0, math.ceil((rect.left - self.origin_x - half) / size))
+            last_col = min(self.cols - 1, math.ceil((rect.right - self.origin_x - half) / size) - 1)
+            first_row = max(0, math.ceil((rect.top - self.origin_y - half) / size))
+            last_row = min(self.rows - 1, math.ceil((rect.bottom - self.origin_y - half) / size) - 1)
+            if first_col > last_col:
+                continue
+            for row in range(first_row, last_row + 1):
+                start = row * self.cols
+                self.blocked[start + first_col:start + last_col + 1] = b"\x01" * (last_col - first_col + 1)
+        self.obstacle_count = len(obstacles)
+
+    def cell_index(self, x, y):
+        """Índice de la celda que contiene un punto de pantalla (o None si está fuera)"""
+        col = int((x + self.offset_x - self.origin_x) // self.cell_size)
+        row = int((y + self.offset_y - self.origin_y) // self.cell_size)
+        if 0 <= col < self.cols and 0 <= row < self.rows:
+            return row * self.cols + col
+        return None
+
+    def update(self, target_x, target_y, obstacles=None, offset=(0, 0)):
+        """Recalcular el campo cada `recompute_interval` frames"""
+        self.offset_x, self.offset_y = offset
+
+        # Los obstáculos destruidos liberan celdas
+        if obstacles is not None and len(obstacles) != self.obstacle_count:
+            self.set_obstacles(obstacles)
+            self.counter = 0
+
+        if self.counter > 0:
+            self.counter -= 1
+            return False
+
+        self.counter = self.recompute_interval
+        self.compute(target_x, target_y)
+        return True
+
+    def compute(self, target_x, target_y):
+        """BFS desde la celda del objetivo y dirección de descenso en cada celda"""
+        cols, rows = self.cols, self.rows
+        blocked = self.blocked
+        distance = [UNREACHABLE] * (cols * rows)
+
+        target = self.cell_index(target_x, target_y)
+        self.target_cell = target
+        if target is None:
+            self.distance = distance
+            self.directions = {}
+            return
+
+        # Distancias (4 vecinos). Desde una celda bloqueada se puede salir a
+        # cualquier vecina, así el objetivo pegado a un obstáculo sigue siendo alcanzable
+        distance[target] = 0
+        queue = deque([target])
+        pop, push = queue.popleft, queue.append
+        size = cols * rows
+        while queue:
+            index = pop()
+            next_distance = distance[index] + 1
+            inside = blocked[index]
+            col = index % cols
+            for neighbor, valid in ((index + 1, col + 1 < cols), (index - 1, col > 0),
+                                    (index + cols, index + cols < size), (index - cols, index >= cols)):
+                if valid and distance[neighbor] < 0 and (inside or not blocked[neighbor]):
+                    distance[neighbor] = next_distance
+                    push(neighbor)
+
+        self.distance = distance
+        self.directions = {}
+
+    def direction(self, index):
+        """Dirección hacia el vecino con menor distancia (sin cortar esquinas)"""
+        cols, rows = self.cols, self.rows
+        distance, blocked = self.distance, self.blocked
+        col, row = index % cols, index // cols
+        best = distance[index]
+        result = None
+        for dc, dr, ux, uy in NEIGHBORS:
+            c, r = col + dc, row + dr
+            if not (0 <= c < cols and 0 <= r < rows):
+                continue
+            value = distance[r * cols + c]
+            if value < 0 or value >= best:
+                continue
+            if dc and dr and (blocked[row * cols + c] or blocked[r * cols + col]):
+                continue
+            best = value
+            result = (ux, uy)
+        return result
+
+    def sample(self, x, y):
+        """Dirección a seguir desde un punto de pantalla.
+
+        Devuelve None si el punto está fuera del campo, es inalcanzable o
+        ya está junto al objetivo (en ese caso conviene ir en línea recta).
+        """
+        index = self.cell_index(x, y)
+        if index is None or self.distance[index] <= 1:
+            return None
+        if index not in self.directions:
+            self.directions[index] = self.direction(index)
+        return self.directions[index]
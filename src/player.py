@@ -25,13 +25,62 @@ DARK_GREEN = (0, 100, 0)
 DARK_RED = (139, 0, 0)
 POTATO_BROWN = (139, 69, 19)
 
+# Atlas de texturas compartido (caché de sprites)
+try:
+    from src.atlas import load_sprite
+except ImportError:
+    from atlas import load_sprite
+
+# HUD retenido (solo se redibuja lo que cambia)
+try:
+    from src.render import HUDWidget, RetainedHUD
+except ImportError:
+    from render import HUDWidget, RetainedHUD
+
+# Proyectil del jugador (clase básica de respaldo si no se puede importar weapons)
+try:
+    from src.weapons import Projectile
+except ImportError:
+    try:
+        from weapons import Projectile
+    except ImportError:
+        class Projectile:
+            kind = "projectile"  # Arquetipo en el mundo ECS
+            
+            def __init__(self, x, y, angle, damage):
+                self.x = x
+                self.y = y
+                self.prev_x, self.prev_y = x, y
+                self.speed = 12
+                self.dx = math.cos(angle) * self.speed
+                self.dy = math.sin(angle) * self.speed
+                self.radius = 5
+                self.damage = damage
+                self.angle = angle
+                self.owner = "player"
+                self.lifetime = 120
+                self.rect = pygame.Rect(x - 5, y - 5, 10, 10)
+            
+            def update(self):
+                self.prev_x, self.prev_y = self.x, self.y
+                self.x += self.dx
+                self.y += self.dy
+                self.rect.center = (self.x, self.y)
+                self.lifetime -= 1
+            
+            def draw(self, screen):
+                pygame.draw.circle(screen, RED, (int(self.x), int(self.y)), self.radius)
+            
+            def is_offscreen(self):
+                return (self.x < 0 or self.x > WIDTH or self.y < 0 or self.y > HEIGHT)
+            
+            def is_expired(self):
+                return self.lifetime <= 0
+
 # Función para cargar imágenes con manejo de errores
 def load_image(path, scale=None):
     try:
-        image = pygame.image.load(path).convert_alpha()
-        if scale:
-            image = pygame.transform.scale(image, scale)
-        return image
+        return load_sprite(path, scale)
     except pygame.error as e:
         print(f"No se pudo cargar la imagen {path}: {e}")
         # Crear una superficie de reemplazo
@@ -41,6 +90,40 @@ def load_image(path, scale=None):
         pygame.draw.line(surface, (255, 0, 0), (50, 0), (0, 50), 2)
         return surface
 
+# Clase AttackEffect para efectos visuales (a nivel de módulo para poder guardarla en instantáneas)
+class AttackEffect:
+    kind = "effect"  # Arquetipo en el mundo ECS
+    
+    def __init__(self, x, y, angle):
+        self.x = x
+        self.y = y
+        self.angle = angle
+        self.lifetime = 5  # Duración del efecto en frames
+        try:
+            self.image = load_image("assets/images/items/attack_effect.png", (30, 15))
+            self.rotated_image = pygame.transform.rotate(self.image, -math.degrees(angle))
+            self.rect = self.rotated_image.get_rect(center=(x, y))
+        except:
+            self.image = None
+            self.rotated_image = None
+            self.rect = pygame.Rect(x - 15, y - 7, 30, 15)
+    
+    def update(self):
+        self.lifetime -= 1
+    
+    def draw(self, screen):
+        if self.rotated_image:
+            screen.blit(self.rotated_image, self.rect.topleft)
+        else:
+            # Dibujo de respaldo
+            pygame.draw.line(screen, (255, 200, 0), 
+                            (self.x, self.y),
+                            (self.x + math.cos(self.angle) * 30, self.y + math.sin(self.angle) * 30),
+                            3)
+    
+    def is_finished(self):
+        return self.lifetime <= 0
+
 # Clase Jugador (Killer Potato)
 class Player:
     def __init__(self):
@@ -213,68 +296,8 @@ class Player:
         effect_y = self.y + math.sin(angle) * effect_distance
         
         # Crear efectos
-        try:
-            from weapons import Projectile
-            projectile = Projectile(self.x, self.y, angle, weapon["damage"] * self.damage_multiplier)
-        except ImportError:
-            # Clase Projectile básica si no se puede importar
-            class Projectile:
-                def __init__(self, x, y, angle, damage):
-                    self.x = x
-                    self.y = y
-                    self.speed = 12
-                    self.dx = math.cos(angle) * self.speed
-                    self.dy = math.sin(angle) * self.speed
-                    self.radius = 5
-                    self.damage = damage
-                    self.angle = angle
-                    self.rect = pygame.Rect(x - 5, y - 5, 10, 10)
-                
-                def update(self):
-                    self.x += self.dx
-                    self.y += self.dy
-                    self.rect.center = (self.x, self.y)
-                
-                def draw(self, screen):
-                    pygame.draw.circle(screen, RED, (int(self.x), int(self.y)), self.radius)
-                
-                def is_offscreen(self):
-                    return (self.x < 0 or self.x > WIDTH or self.y < 0 or self.y > HEIGHT)
-                    
-            projectile = Projectile(self.x, self.y, angle, weapon["damage"] * self.damage_multiplier)
+        projectile = Projectile(self.x, self.y, angle, weapon["damage"] * self.damage_multiplier)
         
-        # Clase AttackEffect para efectos visuales
-        class AttackEffect:
-            def __init__(self, x, y, angle):
-                self.x = x
-                self.y = y
-                self.angle = angle
-                self.lifetime = 5  # Duración del efecto en frames
-                try:
-                    self.image = load_image("assets/images/items/attack_effect.png", (30, 15))
-                    self.rotated_image = pygame.transform.rotate(self.image, -math.degrees(angle))
-                    self.rect = self.rotated_image.get_rect(center=(x, y))
-                except:
-                    self.image = None
-                    self.rotated_image = None
-                    self.rect = pygame.Rect(x - 15, y - 7, 30, 15)
-            
-            def update(self):
-                self.lifetime -= 1
-            
-            def draw(self, screen):
-                if self.rotated_image:
-                    screen.blit(self.rotated_image, self.rect.topleft)
-                else:
-                    # Dibujo de respaldo
-                    pygame.draw.line(screen, (255, 200, 0), 
-                                    (self.x, self.y),
-                                    (self.x + math.cos(self.angle) * 30, self.y + math.sin(self.angle) * 30),
-                                    3)
-            
-            def is_finished(self):
-                return self.lifetime <= 0
-                
         attack_effect = AttackEffect(effect_x, effect_y, angle)
         
         # Reproducir sonido de ataque
@@ -334,53 +357,66 @@ class Player:
         except:
             pass
     
-    def draw_hud(self, screen, enemies_to_spawn=0, enemies_count=0):
-        # Barra de vida
-        screen.blit(self.health_bar, (20, 20))
-        health_text = pygame.font.SysFont('Arial', 24).render(f"SALUD", True, WHITE)
-        screen.blit(health_text, (30, 25))
-        
-        # Dibujar barra de salud
-        health_width = 150 * (self.health / self.max_health)
-        health_rect = pygame.Rect(70, 50, health_width, 25)
-        
-        # Color según porcentaje de vida
-        if self.health > self.max_health * 0.7:
-            health_color = GREEN
-        elif self.health > self.max_health * 0.3:
-            health_color = (255, 255, 0)  # Amarillo
-        else:
-            health_color = RED
-            
-        pygame.draw.rect(screen, health_color, health_rect)
-        
-        # Información de arma y munición
-        weapon = self.weapons[self.current_weapon]
-        screen.blit(self.ammo_bar, (20, 100))
-        
-        # Dibujar icono del arma actual en el HUD
-        screen.blit(weapon["hud_image"], (30, 110))
-        
-        # Mostrar munición
-        ammo_text = pygame.font.SysFont('Arial', 24).render(f"{weapon['ammo']}/{weapon['max_ammo']}", True, WHITE)
-        screen.blit(ammo_text, (150, 125))
-        
-        if self.is_reloading:
-            reload_text = pygame.font.SysFont('Arial', 24).render("RECARGANDO", True, WHITE)
-            screen.blit(reload_text, (150, 100))
-        
-        # Puntuación
-        screen.blit(self.score_display, (WIDTH - 170, 20))
-        score_text = pygame.font.SysFont('Arial', 24).render(f"{self.score}", True, DARK_RED)
-        screen.blit(score_text, (WIDTH - 110, 35))
-        
-        # Información de nivel
-        level_text = pygame.font.SysFont('Arial', 24).render(f"NIVEL: {self.level}", True, WHITE)
-        screen.blit(level_text, (WIDTH - 150, 80))
-        
-        # Mostrar contador de enemigos
-        if enemies_count > 0 or enemies_to_spawn > 0:
+    def build_hud(self):
+        """HUD retenido: cada texto o barra se rasteriza solo cuando cambia su valor"""
+        font = pygame.font.SysFont('Arial', 24)
+        
+        def text(color):
+            return lambda value: font.render(value, True, color)
+        
+        def health_bar(value):
+            # Color según porcentaje de vida
+            health, max_health = value
+            if health > max_health * 0.7:
+                health_color = GREEN
+            elif health > max_health * 0.3:
+                health_color = (255, 255, 0)  # Amarillo
+            else:
+                health_color = RED
+            width = int(150 * (health / max_health))
+            if width <= 0:
+                return None
+            bar = pygame.Surface((width, 25))
+            bar.fill(health_color)
+            return bar
+        
+        def enemies_text(value):
+            enemies_to_spawn, enemies_count = value
+            if enemies_count <= 0 and enemies_to_spawn <= 0:
+                return None
             enemies_left = enemies_to_spawn + enemies_count
             progress = int(100 - (enemies_left / (enemies_left + 1) * 100))
-            enemies_text = pygame.font.SysFont('Arial', 24).render(f"ENEMIGOS: {enemies_left} - PROGRESO: {progress}%", True, WHITE)
-            screen.blit(enemies_text, (WIDTH - 350, 110))
\ No newline at end of file
+            return font.render(f"ENEMIGOS: {enemies_left} - PROGRESO: {progress}%", True, WHITE)
+        
+        widgets = [
+            # Barra de vida
+            HUDWidget((20, 20), lambda hud: hud.source.health_bar),
+            HUDWidget((30, 25), lambda hud: "SALUD", text(WHITE)),
+            HUDWidget((70, 50), lambda hud: (hud.source.health, hud.source.max_health), health_bar),
+            # Arma actual y munición
+            HUDWidget((20, 100), lambda hud: hud.source.ammo_bar),
+            HUDWidget((30, 110), lambda hud: hud.source.weapons[hud.source.current_weapon]["hud_image"]),
+            HUDWidget((150, 125), lambda hud: "{ammo}/{max_ammo}".format(**hud.source.weapons[hud.source.current_weapon]),
+                      text(WHITE)),
+            HUDWidget((150, 100), lambda hud: hud.source.is_reloading,
+                      lambda reloading: font.render("RECARGANDO", True, WHITE) if reloading else None),
+            # Puntuación y nivel
+            HUDWidget((WIDTH - 170, 20), lambda hud: hud.source.score_display),
+            HUDWidget((WIDTH - 110, 35), lambda hud: f"{hud.source.score}", text(DARK_RED)),
+            HUDWidget((WIDTH - 150, 80), lambda hud: f"NIVEL: {hud.source.level}", text(WHITE)),
+            # Contador de enemigos
+            HUDWidget((WIDTH - 350, 110), lambda hud: hud.state["enemies"], enemies_text)
+        ]
+        return RetainedHUD(self, widgets, (0, 0, WIDTH, 180))
+    
+    def draw_hud(self, screen, enemies_to_spawn=0, enemies_count=0):
+        hud = self.__dict__.get("hud")
+        if hud is None:
+            hud = self.hud = self.build_hud()
+        hud.draw(screen, enemies=(enemies_to_spawn, enemies_count))
+    
+    def __getstate__(self):
+        # El HUD se reconstruye al dibujar; no forma parte de las instantáneas
+        state = self.__dict__.copy()
+        state.pop("hud", None)
+        return state
\ No newline at end of file
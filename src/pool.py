@@ -0,0 +1,52 @@
+"""
+Módulo de reserva de objetos para Killer Potato
+Proyectiles creados por adelantado y reutilizados al destruirse
+
+Crear muchos proyectiles en un mismo frame (el abanico o el anillo de un
+jefe) provoca picos justo en los momentos más intensos. La reserva los
+prepara poco a poco durante el aviso del ataque y, cuando un proyectil se
+destruye, lo guarda para volver a inicializarlo en lugar de crear otro.
+"""
+
+# Clase que guarda instancias libres por clase
+class ObjectPool:
+    def __init__(self, limit=64):
+        self.limit = limit  # Máximo de instancias libres por clase
+        self.free = {}  # Clase -> lista de instancias libres
+        self.created = 0
+        self.reused = 0
+
+    def reserve(self, cls, count, *args, budget=None):
+        """Asegurar `count` instancias libres de `cls` (creando como mucho `budget` ahora).
+
+        Los argumentos sirven de ejemplo para construirlas; se sobrescriben
+        al sacarlas con acquire(). Devuelve True si la reserva está completa.
+        """
+        free = self.free.setdefault(cls, [])
+        missing = min(count, self.limit) - len(free)
+        if budget is not None:
+            missing = min(missing, budget)
+        for _ in range(missing):
+            free.append(cls(*args))
+            self.created += 1
+        return len(free) >= min(count, self.limit)
+
+    def acquire(self, cls, *args):
+        """Sacar una instancia libre y reinicializarla (o crear una si no hay)"""
+        free = self.free.get(cls)
+        if free:
+            instance = free.pop()
+            instance.__init__(*args)
+            self.reused += 1
+            return instance
+        self.created += 1
+        return cls(*args)
+
+    def release(self, instance):
+        """Devolver una instancia destruida (solo de clases que ya usa la reserva)"""
+        free = self.free.get(type(instance))
+        if free is not None and len(free) < self.limit:
+            free.append(instance)
+
+    def available(self, cls):
+        return len(self.free.get(cls, ()))
@@ -0,0 +1,57 @@
+"""
+Módulo de perfilado para Killer Potato
+Mide el tiempo de trabajo de cada frame y lo compara con el presupuesto del FPS objetivo
+"""
+
+import time
+from contextlib import contextmanager
+
+# FPS objetivo (tomar de config o usar valor por defecto)
+try:
+    from config.settings import FPS
+except ImportError:
+    FPS = 60
+
+# Clase que mide el coste de los frames
+class FrameProfiler:
+    def __init__(self, fps=FPS, smoothing=0.1):
+        self.budget_ms = 1000.0 / fps
+        self.smoothing = smoothing  # Peso del último frame en la media móvil
+        self.frame_ms = 0.0  # Media móvil del tiempo de trabajo por frame
+        self.last_ms = 0.0
+        self.sections = {}  # Media móvil por sección (nombre -> ms)
+        self.frame_start = None
+
+    def begin_frame(self):
+        self.frame_start = time.perf_counter()
+
+    def end_frame(self):
+        """Cerrar el frame actual (sin contar la espera de clock.tick)"""
+        if self.frame_start is None:
+            return self.frame_ms
+        self.last_ms = (time.perf_counter() - self.frame_start) * 1000
+        self.frame_start = None
+        self.frame_ms += (self.last_ms - self.frame_ms) * self.smoothing
+        return self.frame_ms
+
+    @contextmanager
+    def measure(self, name):
+        """Medir una sección del frame: `with profiler.measure("enemigos"): ...`"""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = (time.perf_counter() - start) * 1000
+            previous = self.sections.get(name, elapsed)
+            self.sections[name] = previous + (elapsed - previous) * self.smoothing
+
+    def headroom(self):
+        """Milisegundos libres respecto al presupuesto (negativo si se excede)"""
+        return self.budget_ms - self.frame_ms
+
+    def load(self):
+        """Fracción del presupuesto usada (1.0 = justo en el límite)"""
+        return self.frame_ms / self.budget_ms
+
+    def over_budget(self, ratio=1.0):
+        return self.frame_ms > self.budget_ms * ratio
@@ -0,0 +1,256 @@
+"""
+Módulo de dibujo por capas para Killer Potato
+Grupo de sprites con capas (LayeredUpdates) y lotes de blits por capa
+
+La escena se dibuja en capas fijas: fondo, obstáculos, recogibles, peligros,
+proyectiles, enemigos, jugador, efectos y HUD. Cada frame se vuelve a dibujar
+la pantalla entera con blits por lotes; no hay rectángulos sucios, porque el
+scroll y los enemigos cambian casi toda la imagen en cada frame. Lo que casi
+nunca cambia (el fondo del nivel con sus obstáculos ya compuestos) vive en el
+grupo como un sprite cuya imagen solo se recompone cuando cambia el nivel. Lo
+que se mueve se encola cada frame como órdenes de dibujo de su capa.
+
+Una orden es una tupla (imagen, posición) o una función que recibe la
+pantalla. Las tuplas seguidas se envían juntas con Surface.blits en lugar de
+una llamada a blit por entidad. Las entidades con batch(commands) añaden sus
+propias órdenes; las demás se dibujan con su draw(screen) en su sitio.
+
+También están aquí las cachés de sprites derivados (giros, tintes, círculos
+semitransparentes y tiras de barras de vida) para no crear superficies nuevas
+en cada frame, y el HUD retenido: elementos que observan un valor y solo se
+vuelven a rasterizar cuando cambia, compuestos en una imagen cacheada.
+"""
+
+import pygame
+
+# Capas de dibujo, de la más profunda a la más alta
+LAYERS = ("background", "obstacles", "pickups", "hazards", "projectiles",
+          "enemies", "player", "effects", "hud")
+LAYER = {name: depth for depth, name in enumerate(LAYERS)}
+
+# Capa de cada arquetipo del mundo ECS
+KIND_LAYERS = {
+    "pickup": "pickups",
+    "hazard": "hazards",
+    "projectile": "projectiles",
+    "missile": "projectiles",
+    "enemy": "enemies",
+    "effect": "effects"
+}
+
+# Ángulos precalculados para sprites que giran cada frame
+ROTATION_STEPS = 64
+_rotation_frames = {}  # id(imagen) -> (imagen, lista de giros)
+
+def rotation_frames(image, steps=ROTATION_STEPS):
+    """Imagen girada a `steps` ángulos en sentido horario (una sola vez por imagen)"""
+    entry = _rotation_frames.get(id(image))
+    if entry is None:
+        frames = [pygame.transform.rotate(image, -360 * i / steps) for i in range(steps)]
+        entry = _rotation_frames[id(image)] = (image, frames)
+    return entry[1]
+
+def rotated(image, degrees, steps=ROTATION_STEPS):
+    """Giro precalculado más cercano a `degrees` (en sentido horario)"""
+    return rotation_frames(image, steps)[round(degrees * steps / 360) % steps]
+
+# Imágenes teñidas (parpadeo de daño)
+_tinted = {}  # (id(imagen), color) -> (imagen, teñida)
+
+def tinted(image, color):
+    key = (id(image), color)
+    entry = _tinted.get(key)
+    if entry is None:
+        tint = image.copy()
+        tint.fill(color, special_flags=pygame.BLEND_RGBA_MULT)
+        entry = _tinted[key] = (image, tint)
+    return entry[1]
+
+# Círculos semitransparentes (humo, estelas, brillos)
+_circles = {}
+
+def circle_sprite(color, radius):
+    """Círculo relleno de color RGBA y radio entero, cacheado"""
+    key = (color, radius)
+    sprite = _circles.get(key)
+    if sprite is None:
+        sprite = _circles[key] = pygame.Surface((radius * 2, radius * 2), pygame.SRCALPHA)
+        pygame.draw.circle(sprite, color, (radius, radius), radius)
+    return sprite
+
+# Tiras de barras de vida: una imagen por tamaño con todos los estados de relleno
+_bar_strips = {}
+
+def bar_strip(width, height, states, fill=(0, 255, 0), empty=(255, 0, 0), border=(0, 0, 0)):
+    """Tira con `states` barras de relleno creciente (0 a 100 %) y el área de cada una
+
+    Dibujar una barra es un blit de su área: (tira, posición, áreas[estado]).
+    """
+    key = (width, height, states, fill, empty, border)
+    strip = _bar_strips.get(key)
+    if strip is None:
+        image = pygame.Surface((width, height * states))
+        areas = []
+        for state in range(states):
+            area = pygame.Rect(0, state * height, width, height)
+            image.fill(empty, area)
+            image.fill(fill, (0, state * height, width * state // (states - 1), height))
+            pygame.draw.rect(image, border, area, 1)
+            areas.append(area)
+        strip = _bar_strips[key] = (image, areas)
+    return strip
+
+# Elementos del HUD retenido: cada uno lee un valor y solo se rasteriza si cambia
+_UNSET = object()
+
+class HUDWidget:
+    __slots__ = ("pos", "read", "render", "value", "image")
+
+    def __init__(self, pos, read, render=None):
+        self.pos = pos
+        self.read = read  # Función hud -> valor observado
+        self.render = render  # Función valor -> imagen (o None); sin ella el valor es la imagen
+        self.value = _UNSET
+        self.image = None
+
+    def refresh(self, hud):
+        """Volver a rasterizar si cambió el valor; devuelve True si cambió"""
+        value = self.read(hud)
+        if value == self.value:
+            return False
+        self.value = value
+        self.image = self.render(value) if self.render else value
+        return True
+
+# Sprite con el HUD compuesto: se recompone solo cuando cambia algún elemento
+class RetainedHUD(pygame.sprite.Sprite):
+    def __init__(self, source, widgets, rect):
+        super().__init__()
+        self.visible = True
+        self.source_rect = None  # Parte de la imagen que se dibuja (None: entera)
+        self.source = source  # Objeto observado (el jugador)
+        self.widgets = list(widgets)
+        self.state = {}  # Valores que no son del jugador (enemigos restantes...)
+        self.rect = pygame.Rect(rect)
+        self.image = pygame.Surface(self.rect.size, pygame.SRCALPHA)
+        self.redraws = 0
+
+    def refresh(self, **state):
+        """Leer los elementos y recomponer la imagen si alguno cambió"""
+        self.state.update(state)
+        changed = False
+        for widget in self.widgets:
+            if widget.refresh(self):
+                changed = True
+        if changed:
+            left, top = self.rect.topleft
+            self.image.fill((0, 0, 0, 0))
+            self.image.blits([(widget.image, (widget.pos[0] - left, widget.pos[1] - top))
+                              for widget in self.widgets if widget.image is not None], False)
+            self.redraws += 1
+        return changed
+
+    def draw(self, screen, **state):
+        self.refresh(**state)
+        screen.blit(self.image, self.rect)
+
+def draw_commands(screen, commands):
+    """Ejecutar órdenes de dibujo: cada tramo de tuplas va en un solo blits()"""
+    run = []
+    for command in commands:
+        if command.__class__ is tuple:
+            run.append(command)
+            continue
+        if run:
+            screen.blits(run, False)
+            run = []
+        command(screen)
+    if run:
+        screen.blits(run, False)
+
+# Función de batch de cada clase (None si solo tiene draw)
+_batchers = {}
+
+def batcher(cls):
+    try:
+        return _batchers[cls]
+    except KeyError:
+        batch = _batchers[cls] = getattr(cls, "batch", None)
+        return batch
+
+# Sprite con la parte fija del nivel: fondo y obstáculos compuestos en una imagen
+class StaticLayer(pygame.sprite.Sprite):
+    def __init__(self):
+        super().__init__()
+        self.visible = True
+        self.source_rect = None  # Ventana del scroll dentro de la imagen
+        self.image = pygame.Surface((1, 1))
+        self.rect = self.image.get_rect()
+        self.source = None  # Nivel o fondo del que sale la imagen
+        self.obstacle_count = -1
+
+    def sync(self, level, background, view_size, offset_x=0, offset_y=0):
+        """Recomponer la imagen si cambió el nivel y mover la ventana de scroll"""
+        obstacles = getattr(level, "obstacles", ())
+        if level is not self.source or len(obstacles) != self.obstacle_count:
+            # Nivel nuevo o algún obstáculo destruido
+            image = level.render_static() if level is not None else None
+            self.image = image if image is not None else background
+            self.source = level
+            self.obstacle_count = len(obstacles)
+
+        self.rect = pygame.Rect((0, 0), view_size)
+        if self.image.get_size() != view_size or offset_x or offset_y:
+            self.source_rect = pygame.Rect((int(offset_x), int(offset_y)), view_size)
+        else:
+            self.source_rect = None
+
+# Clase que compone cada frame por capas
+class Renderer:
+    def __init__(self):
+        self.group = pygame.sprite.LayeredUpdates()  # Sprites persistentes por capa
+        self.static = StaticLayer()
+        self.group.add(self.static, layer=LAYER["background"])
+        self.commands = [[] for _ in LAYERS]  # Órdenes del frame por capa
+
+    def add(self, sprite, layer):
+        """Añadir un sprite persistente (HUD, capas cacheadas) a una capa"""
+        self.group.add(sprite, layer=LAYER[layer])
+
+    def sync_level(self, screen, level, background, offset_x=0, offset_y=0):
+        self.static.sync(level, background, screen.get_size(), offset_x, offset_y)
+
+    def queue(self, layer, command):
+        """Encolar una orden de dibujo (tupla o función) en una capa"""
+        self.commands[LAYER[layer]].append(command)
+
+    def queue_entities(self, layer, entities):
+        commands = self.commands[LAYER[layer]]
+        for entity in entities:
+            batch = batcher(entity.__class__)
+            if batch is None:
+                commands.append(entity.draw)
+            else:
+                batch(entity, commands)
+
+    def queue_world(self, world, kinds=None):
+        """Encolar las entidades del mundo (los enemigos, solo si son visibles)"""
+        for kind in kinds or KIND_LAYERS:
+            table = world.tables.get(kind)
+            if not table or "render" not in world.archetypes[kind]:
+                continue
+            if kind == "enemy":
+                table = [enemy for enemy in table if enemy.lod_visible]
+            self.queue_entities(KIND_LAYERS[kind], table)
+
+    def draw(self, screen):
+        """Dibujar la pantalla entera, sprites y órdenes capa a capa, y vaciar las órdenes del frame"""
+        group = self.group
+        for depth, commands in enumerate(self.commands):
+            sprites = group.get_sprites_from_layer(depth)
+            if sprites:
+                screen.blits([(sprite.image, sprite.rect, sprite.source_rect)
+                              for sprite in sprites if sprite.visible], False)
+            if commands:
+                draw_commands(screen, commands)
+                commands.clear()
@@ -0,0 +1,195 @@
+"""
+Módulo de guardado para Killer Potato
+Guarda el progreso, los récords y los checkpoints en segundo plano y de forma atómica
+"""
+
+import os
+import json
+import atexit
+import threading
+from datetime import datetime
+
+# Rutas de guardado (tomar de config o usar valores por defecto)
+try:
+    from config.settings import SAVE_FILE, HIGHSCORE_FILE
+except ImportError:
+    SAVE_FILE = "assets/save/progress.json"
+    HIGHSCORE_FILE = "assets/save/highscores.json"
+
+# Versión actual del esquema de guardado
+SAVE_VERSION = 2
+MAX_HIGHSCORES = 10
+
+def read_json(path):
+    """Leer un documento JSON, devolviendo None si no existe o está dañado"""
+    try:
+        with open(path, 'r', encoding='utf-8') as file:
+            return json.load(file)
+    except FileNotFoundError:
+        return None
+    except (json.JSONDecodeError, OSError) as e:
+        print(f"Error al leer {path}: {e}")
+        return None
+
+def encode(data):
+    """Codificar un documento en JSON compacto"""
+    return json.dumps(data, separators=(",", ":"), ensure_ascii=False).encode('utf-8')
+
+def write_atomic(path, encoded):
+    """Escribir un documento ya codificado de forma atómica (archivo temporal + rename)"""
+
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+
+    temp_path = f"{path}.tmp"
+    with open(temp_path, 'wb') as file:
+        file.write(encoded)
+        file.flush()
+        os.fsync(file.fileno())
+
+    # os.replace es atómico: el archivo antiguo o el nuevo, nunca uno a medias
+    os.replace(temp_path, path)
+
+def migrate_progress(data):
+    """Convertir un progreso antiguo (sin versión) al esquema actual"""
+    data = dict(data or {})
+    data.setdefault("completed_levels", [])
+    data.setdefault("last_level", 1)
+    data.setdefault("checkpoints", {})
+    data["version"] = SAVE_VERSION
+    return data
+
+def migrate_highscores(data):
+    """Convertir una tabla de récords antigua (sin versión) al esquema actual"""
+    data = dict(data or {})
+    data.setdefault("highscores", [])
+    data["version"] = SAVE_VERSION
+    return data
+
+# Clase que gestiona el guardado en un hilo de escritura
+class SaveManager:
+    def __init__(self, save_file=SAVE_FILE, highscore_file=HIGHSCORE_FILE):
+        self.save_file = save_file
+        self.highscore_file = highscore_file
+
+        self.progress = migrate_progress(read_json(save_file))
+        self.highscores = migrate_highscores(read_json(highscore_file))
+
+        # Documentos pendientes de escribir (se agrupan varias peticiones en una escritura)
+        self._lock = threading.Lock()
+        self._dirty = set()
+        self._wake = threading.Event()
+        self._idle = threading.Event()
+        self._idle.set()
+        self._running = True
+        self._thread = None
+
+    def _documents(self):
+        return {
+            self.save_file: self.progress,
+            self.highscore_file: self.highscores
+        }
+
+    def _schedule(self, path):
+        """Marcar un documento para escritura y despertar al hilo"""
+        self._dirty.add(path)
+        self._idle.clear()
+
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._writer_loop, name="save-writer", daemon=True)
+            self._thread.start()
+
+        self._wake.set()
+
+    def _writer_loop(self):
+        while self._running or self._dirty:
+            self._wake.wait()
+            self._wake.clear()
+
+            while True:
+                with self._lock:
+                    if not self._dirty:
+                        self._idle.set()
+                        break
+                    path = self._dirty.pop()
+                    # Se codifica bajo el cerrojo (coherente); el disco va fuera
+                    encoded = encode(self._documents()[path])
+
+                try:
+                    write_atomic(path, encoded)
+                except OSError as e:
+                    print(f"Error al guardar {path}: {e}")
+
+    def mark_level_completed(self, level_number):
+        """Registrar un nivel completado"""
+        with self._lock:
+            completed_levels = self.progress["completed_levels"]
+            if level_number not in completed_levels:
+                completed_levels.append(level_number)
+            self.progress["last_level"] = level_number + 1
+            self.progress["save_date"] = datetime.now().isoformat(timespec="seconds")
+            self._schedule(self.save_file)
+
+    def activate_checkpoint(self, level_number, checkpoint_id):
+        """Registrar un checkpoint activado en un nivel"""
+        with self._lock:
+            level_checkpoints = self.progress["checkpoints"].setdefault(str(level_number), {"activated": []})
+            activated = level_checkpoints.setdefault("activated", [])
+            if checkpoint_id not in activated:
+                activated.append(checkpoint_id)
+            self._schedule(self.save_file)
+
+    def get_activated_checkpoints(self, level_number):
+        """Obtener los checkpoints activados de un nivel"""
+        with self._lock:
+            level_checkpoints = self.progress["checkpoints"].get(str(level_number), {})
+            return list(level_checkpoints.get("activated", []))
+
+    def get_last_level(self):
+        """Obtener el último nivel alcanzado"""
+        return self.progress.get("last_level", 1)
+
+    def add_highscore(self, score, level, name=None):
+        """Añadir una puntuación a la tabla de récords si entra en ella"""
+        if name is None:
+            name = self.progress.get("player", {}).get("name", "Killer Potato")
+
+        with self._lock:
+            scores = self.highscores["highscores"]
+            if len(scores) >= MAX_HIGHSCORES and score <= min(entry.get("score", 0) for entry in scores):
+                return False
+
+            scores.append({
+                "name": name,
+                "score": score,
+                "level": level,
+                "date": datetime.now().isoformat(timespec="seconds")
+            })
+            scores.sort(key=lambda entry: entry.get("score", 0), reverse=True)
+            del scores[MAX_HIGHSCORES:]
+            self.highscores["last_updated"] = datetime.now().isoformat(timespec="seconds")
+            self._schedule(self.highscore_file)
+            return True
+
+    def flush(self, timeout=None):
+        """Esperar a que se escriban todos los documentos pendientes"""
+        return self._idle.wait(timeout)
+
+    def close(self, timeout=2.0):
+        """Terminar el hilo de escritura tras vaciar la cola"""
+        self._running = False
+        self._wake.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+
+# Instancia compartida
+_save_manager = None
+
+def get_save_manager():
+    """Obtener el gestor de guardado compartido"""
+    global _save_manager
+    if _save_manager is None:
+        _save_manager = SaveManager()
+        atexit.register(_save_manager.close)
+    return _save_manager
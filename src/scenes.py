@@ -0,0 +1,160 @@
+"""
+Módulo de escenas para Killer Potato
+Pila de escenas con un único bucle principal, un reloj y un ritmo de frames
+
+El menú, sus pantallas, el juego, las cutscenes y los tutoriales son escenas
+apiladas. El gestor es el único que lee los eventos, mide el frame, dibuja la
+transición activa, muestra la imagen y espera al siguiente frame (con el
+marcapasos de pacing.py); cada frame solo llama a la escena de arriba de la
+pila. Una escena que en un frame no anima nada pone `idle` a True en el
+gestor y el frame siguiente llega a ritmo reducido (también con la ventana
+minimizada); una que solo anima el fondo puede limitar el ritmo con
+`max_fps` y avanzar sus animaciones `steps` frames de los de FPS.
+
+Las escenas se escriben como el bucle de siempre dentro de una función
+generadora (LoopScene): lo que hay antes del primer `yield` es la
+preparación, y cada `events = yield` entrega el frame y recibe los eventos
+del siguiente. Una escena tapada o sacada de la pila se queda congelada en su
+`yield` con todo su estado y sus recursos, y sigue donde estaba al volver.
+La escena termina cuando su función termina.
+"""
+
+import pygame
+
+# FPS objetivo (tomar de config o usar valor por defecto)
+try:
+    from config.settings import FPS
+except ImportError:
+    FPS = 60
+
+try:
+    from src.transitions import Transition, overlay
+    from src.profiler import FrameProfiler
+    from src.pacing import FramePacer
+except ImportError:
+    from transitions import Transition, overlay
+    from profiler import FrameProfiler
+    from pacing import FramePacer
+
+# Clase base de las escenas
+class Scene:
+    manager = None  # Gestor en cuya pila está la escena
+    finished = False
+
+    def resume(self):
+        """La escena pasa a estar arriba de la pila"""
+
+    def suspend(self):
+        """Otra escena la tapa o sale de la pila"""
+
+    def frame(self, events):
+        """Atender los eventos, actualizar y dibujar un frame"""
+        raise NotImplementedError
+
+# Escena escrita como bucle en una función generadora
+class LoopScene(Scene):
+    def __init__(self, loop, *args):
+        self.loop = loop  # Función (gestor, *args) con un `yield` por frame
+        self.args = args
+        self.steps = None
+
+    def frame(self, events):
+        try:
+            if self.steps is None:
+                # Preparación; si apila otra escena (intro del nivel), esa va primero
+                self.steps = self.loop(self.manager, *self.args)
+                next(self.steps)
+                if self.manager.top is not self:
+                    return
+            self.steps.send(events)
+        except StopIteration:
+            self.finished = True
+            self.manager.remove(self)
+
+# Clase que ejecuta la pila de escenas
+class SceneManager:
+    def __init__(self, screen, fps=FPS):
+        self.screen = screen
+        self.fps = fps
+        self.pacer = FramePacer(fps)  # Espera hasta el siguiente frame
+        self.profiler = FrameProfiler(fps)  # Tiempo de trabajo de cada frame
+        self.idle = False  # La escena de arriba no anima nada en este frame
+        self.max_fps = None  # Límite de ritmo pedido por la escena en este frame
+        self.stack = []
+        self.transition = None  # Fundido activo, dibujado encima de cada frame
+        self.frame_time = 0  # Milisegundos del último frame
+        self.running = False
+
+    @property
+    def steps(self):
+        """Frames a FPS que duró el último frame (para animar igual a menos ritmo)"""
+        return min(4.0, self.frame_time * self.fps / 1000) if self.frame_time else 1.0
+
+    @property
+    def top(self):
+        return self.stack[-1] if self.stack else None
+
+    def push(self, scene, fade=True):
+        """Poner una escena encima (la de debajo queda suspendida)"""
+        if fade:
+            self.cross_fade()
+        if self.stack:
+            self.stack[-1].suspend()
+        scene.manager = self
+        self.stack.append(scene)
+        scene.resume()
+
+    def pop(self, fade=True):
+        """Quitar la escena de arriba y reanudar la de debajo"""
+        if self.stack:
+            self.remove(self.stack[-1], fade)
+
+    def remove(self, scene, fade=True):
+        if scene not in self.stack:
+            return
+        if fade:
+            self.cross_fade()
+        was_top = scene is self.stack[-1]
+        self.stack.remove(scene)
+        if was_top:
+            scene.suspend()
+            if self.stack:
+                self.stack[-1].resume()
+
+    def cross_fade(self):
+        """Fundido desde lo que hay en pantalla al siguiente frame que se dibuje"""
+        self.transition = Transition.cross_fade(self.screen)
+
+    def quit(self):
+        """Fundir a negro y terminar el bucle"""
+        if self.transition is None or self.transition.on_done != self.stop:
+            self.transition = Transition.fade_out(self.screen.get_size(), on_done=self.stop)
+
+    def stop(self):
+        self.running = False
+
+    def run(self, scene=None, transition=None):
+        """Bucle principal: hasta que se cierre el juego o se vacíe la pila"""
+        if scene is not None:
+            self.push(scene, fade=False)
+        if transition is not None:
+            self.transition = transition
+
+        self.running = True
+        while self.running and self.stack:
+            events = pygame.event.get()
+            for event in events:
+                if event.type == pygame.QUIT:
+                    self.quit()
+
+            self.idle = False
+            self.max_fps = None
+            self.profiler.begin_frame()
+            self.stack[-1].frame(events)
+            self.profiler.end_frame()
+
+            # Los fundidos van a ritmo normal aunque la escena esté quieta
+            idle = (self.idle and self.transition is None) or not pygame.display.get_active()
+            self.transition = overlay(self.screen, self.transition, self.frame_time)
+            pygame.display.flip()
+            self.frame_time = self.pacer.tick(idle, self.max_fps)
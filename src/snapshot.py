@@ -0,0 +1,118 @@
+"""
+Módulo de instantáneas para Killer Potato
+Captura y restaura el estado completo de la simulación (checkpoints y reintentos)
+
+Las instantáneas se guardan en un búfer de pickle compacto. Los recursos
+(imágenes, sonidos y fuentes) no se copian: se guardan como referencias en
+una tabla aparte y se vuelven a enlazar al restaurar, así que restaurar no
+carga nada de disco.
+"""
+
+import io
+import pickle
+import random
+import pygame
+
+# Tipos que se comparten por referencia en lugar de serializarse
+ASSET_TYPES = (pygame.Surface, pygame.mixer.Sound, pygame.font.Font, pygame.mask.Mask)
+
+def _asset_ref(index):
+    """Marcador de recurso; el Unpickler lo sustituye por la tabla de recursos"""
+    raise pickle.UnpicklingError("Referencia a recurso fuera de una instantánea")
+
+def _dump(state, assets):
+    """Serializar el estado guardando los recursos en la tabla `assets`"""
+    asset_ids = {}
+
+    def reduce_asset(obj):
+        index = asset_ids.get(id(obj))
+        if index is None:
+            index = asset_ids[id(obj)] = len(assets)
+            assets.append(obj)
+        return _asset_ref, (index,)
+
+    # La tabla de despacho solo se consulta para los tipos de recurso,
+    # el resto del estado se serializa en C sin pasar por Python
+    stream = io.BytesIO()
+    pickler = pickle.Pickler(stream, pickle.HIGHEST_PROTOCOL)
+    pickler.dispatch_table = {asset_type: reduce_asset for asset_type in ASSET_TYPES}
+    pickler.dump(state)
+    return stream.getvalue()
+
+class _SnapshotUnpickler(pickle.Unpickler):
+    def __init__(self, file, assets):
+        super().__init__(file)
+        self.assets = assets
+
+    def find_class(self, module, name):
+        if name == "_asset_ref":
+            return self.assets.__getitem__
+        return super().find_class(module, name)
+
+# Clase que representa una instantánea del estado del juego
+class Snapshot:
+    def __init__(self, buffer, assets, frame=0):
+        self.buffer = buffer
+        self.assets = assets
+        self.frame = frame
+
+    def size(self):
+        """Tamaño del búfer en bytes"""
+        return len(self.buffer)
+
+def take_snapshot(state, frame=0):
+    """Capturar el estado de la simulación.
+
+    `state` es un diccionario con las entidades vivas (jugador, enemigos,
+    proyectiles, nivel, contadores...). El estado del generador aleatorio
+    se añade automáticamente.
+    """
+    assets = []
+    buffer = _dump((state, random.getstate()), assets)
+    return Snapshot(buffer, assets, frame)
+
+def restore_snapshot(snapshot):
+    """Reconstruir el estado guardado en una instantánea.
+
+    Devuelve un diccionario nuevo con copias de las entidades; la instantánea
+    sigue siendo válida y puede restaurarse varias veces.
+    """
+    state, rng_state = _SnapshotUnpickler(io.BytesIO(snapshot.buffer), snapshot.assets).load()
+    random.setstate(rng_state)
+    return state
+
+# Medir el coste de una instantánea
+if __name__ == "__main__":
+    import os
+    import sys
+    import time
+
+    sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    pygame.init()
+    pygame.display.set_mode((1, 1))
+
+    from player import Player
+    from enemies import create_random_enemy, create_boss
+    from levels import Level
+
+    state = {
+        "player": Player(),
+        "enemies": [create_random_enemy(3) for _ in range(30)] + [create_boss(5)],
+        "projectiles": [],
+        "level": Level(1)
+    }
+
+    runs = 200
+    start = time.perf_counter()
+    for _ in range(runs):
+        snapshot = take_snapshot(state)
+    taken = (time.perf_counter() - start) / runs * 1000
+
+    start = time.perf_counter()
+    for _ in range(runs):
+        restore_snapshot(snapshot)
+    restored = (time.perf_counter() - start) / runs * 1000
+
+    print(f"Instantánea: {snapshot.size()} bytes, {len(snapshot.assets)} recursos")
+    print(f"Captura: {taken:.3f} ms  Restauración: {restored:.3f} ms")
+    pygame.quit()
@@ -0,0 +1,202 @@
+"""
+Módulo de consultas espaciales para Killer Potato
+Rejilla hash de vecinos compartida y separación entre enemigos
+
+La rejilla se reconstruye una vez por frame y permite encontrar los vecinos
+de una entidad mirando solo las celdas cercanas, de modo que el coste total
+es O(N) en lugar de comparar cada enemigo con todos los demás.
+
+La separación espera entidades con x, y, rect, knockback_resistance y
+update_rect(). Conviene que las celdas midan al menos el radio de separación.
+
+sweep_rect() es la prueba de colisión continua de los proyectiles: en lugar
+de mirar solo dónde acaba el proyectil, prueba el segmento recorrido en el
+frame, así que los disparos rápidos no atraviesan enemigos ni paredes finas.
+"""
+
+import heapq
+
+# Configuración de la separación (tomar de config o usar valores por defecto)
+try:
+    from config.settings import SEPARATION_SETTINGS
+except ImportError:
+    SEPARATION_SETTINGS = {
+        "radius": 40,
+        "strength": 0.5,
+        "max_neighbors": 6
+    }
+
+# Clase que agrupa entidades por celdas para consultas de vecindad
+class SpatialHash:
+    def __init__(self, cell_size=40):
+        self.cell_size = cell_size
+        self.cells = {}
+
+    def clear(self):
+        self.cells.clear()
+
+    def key(self, x, y):
+        return (int(x // self.cell_size), int(y // self.cell_size))
+
+    def insert(self, entity):
+        key = (int(entity.x // self.cell_size), int(entity.y // self.cell_size))
+        bucket = self.cells.get(key)
+        if bucket is None:
+            self.cells[key] = [entity]
+        else:
+            bucket.append(entity)
+
+    def build(self, entities):
+        """Reconstruir la rejilla con las entidades de este frame"""
+        self.cells.clear()
+        for entity in entities:
+            self.insert(entity)
+
+    def nearby(self, x, y, radius):
+        """Entidades en las celdas que cubren el círculo (sin filtrar por distancia)"""
+        size = self.cell_size
+        first_col, last_col = int((x - radius) // size), int((x + radius) // size)
+        first_row, last_row = int((y - radius) // size), int((y + radius) // size)
+        cells = self.cells
+        for col in range(first_col, last_col + 1):
+            for row in range(first_row, last_row + 1):
+                bucket = cells.get((col, row))
+                if bucket:
+                    yield from bucket
+
+    def along(self, x0, y0, x1, y1, margin=0):
+        """Entidades en las celdas que cubren un segmento ampliado en `margin`"""
+        size = self.cell_size
+        first_col, last_col = int((min(x0, x1) - margin) // size), int((max(x0, x1) + margin) // size)
+        first_row, last_row = int((min(y0, y1) - margin) // size), int((max(y0, y1) + margin) // size)
+        cells = self.cells
+        for col in range(first_col, last_col + 1):
+            for row in range(first_row, last_row + 1):
+                bucket = cells.get((col, row))
+                if bucket:
+                    yield from bucket
+
+    def query(self, x, y, radius):
+        """Entidades cuyo centro está a menos de `radius` del punto"""
+        radius_sq = radius * radius
+        return [entity for entity in self.nearby(x, y, radius)
+                if (entity.x - x) ** 2 + (entity.y - y) ** 2 < radius_sq]
+
+def sweep_rect(x, y, dx, dy, rect, pad=0):
+    """Fracción del movimiento (0-1) en la que el segmento de (x, y) a
+    (x + dx, y + dy) entra en el rect ampliado `pad` píxeles; None si no lo toca.
+
+    Prueba de rayo contra caja por franjas (primero en x y luego en y).
+    """
+    enter, leave = 0.0, 1.0
+
+    low, high = rect.left - pad, rect.right + pad
+    if dx:
+        near, far = (low - x) / dx, (high - x) / dx
+        if near > far:
+            near, far = far, near
+        if near > enter:
+            enter = near
+        if far < leave:
+            leave = far
+        if enter > leave:
+            return None
+    elif x < low or x > high:
+        return None
+
+    low, high = rect.top - pad, rect.bottom + pad
+    if dy:
+        near, far = (low - y) / dy, (high - y) / dy
+        if near > far:
+            near, far = far, near
+        if near > enter:
+            enter = near
+        if far < leave:
+            leave = far
+        if enter > leave:
+            return None
+    elif y < low or y > high:
+        return None
+
+    return enter
+
+def _hits_wall(entity, push_x, push_y, walls):
+    """Comprobar si el rect de la entidad empujada (como lo deja update_rect) toca una pared"""
+    rect = entity.rect.copy()
+    rect.center = (entity.x + push_x, entity.y + push_y)
+    return rect.collidelist(walls) != -1
+
+def apply_separation(entities, grid=None, settings=SEPARATION_SETTINGS, obstacles=(), offset=(0, 0)):
+    """Separar entidades demasiado juntas (fuerza de separación tipo boids).
+
+    Cada entidad se aleja de sus `max_neighbors` vecinos más cercanos dentro
+    del radio, con más fuerza cuanto más cerca están. Las fuerzas se calculan
+    todas antes de mover a nadie para que el resultado no dependa del orden.
+    Un empujón que metería a la entidad en un obstáculo (desplazado `offset`
+    como el nivel) se queda en el eje libre o se descarta. Devuelve la rejilla
+    con las posiciones ya separadas.
+    """
+    radius = settings.get("radius", 40)
+    strength = settings.get("strength", 0.5)
+    max_neighbors = settings.get("max_neighbors", 6)
+    radius_sq = radius * radius
+
+    if grid is None:
+        grid = SpatialHash(radius)
+    grid.build(entities)
+
+    pushes = []
+    for entity in entities:
+        x, y = entity.x, entity.y
+        neighbors = []
+        for other in grid.nearby(x, y, radius):
+            if other is entity:
+                continue
+            dx = x - other.x
+            dy = y - other.y
+            dist_sq = dx * dx + dy * dy
+            if dist_sq == 0:
+                # Misma posición exacta: separarlos en horizontal según su identidad
+                neighbors.append((0.0, 1.0 if id(entity) > id(other) else -1.0, 0.0))
+            elif dist_sq < radius_sq:
+                neighbors.append((dist_sq, dx, dy))
+
+        if not neighbors:
+            continue
+        if len(neighbors) > max_neighbors:
+            neighbors = heapq.nsmallest(max_neighbors, neighbors)
+
+        push_x = push_y = 0.0
+        for dist_sq, dx, dy in neighbors:
+            if dist_sq == 0:
+                push_x += dx
+                continue
+            dist = dist_sq ** 0.5
+            weight = (radius - dist) / radius
+            push_x += dx / dist * weight
+            push_y += dy / dist * weight
+
+        # Los enemigos pesados (robots, jefes) se desplazan menos
+        resistance = entity.knockback_resistance
+        pushes.append((entity, push_x * strength / resistance, push_y * strength / resistance))
+
+    walls = [obstacle.rect.move(-offset[0], -offset[1]) for obstacle in obstacles]
+    for entity, push_x, push_y in pushes:
+        # Las que ya tocan una pared pueden moverse (así salen de ella)
+        if walls and entity.rect.collidelist(walls) == -1:
+            if _hits_wall(entity, push_x, push_y, walls):
+                # Deslizar por el eje libre en lugar de atravesar la pared
+                if not _hits_wall(entity, push_x, 0, walls):
+                    push_y = 0
+                elif not _hits_wall(entity, 0, push_y, walls):
+                    push_x = 0
+                else:
+                    continue
+        entity.x += push_x
+        entity.y += push_y
+        entity.update_rect()
+
+    # Las celdas de las entidades movidas han podido cambiar
+    if pushes:
+        grid.build(entities)
+    return grid
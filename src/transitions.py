@@ -0,0 +1,86 @@
+"""
+Módulo de transiciones para Killer Potato
+Fundidos entre escenas que no bloquean el bucle principal
+
+Una transición guarda una imagen opaca de lo que se funde (la última imagen
+de la escena saliente o un color liso) y cada frame la dibuja encima de la
+escena entrante con un alfa de superficie (set_alpha), que es un blit con
+alfa constante sin superficies de alfa por píxel. Los valores de alfa de
+cada paso se calculan una sola vez.
+
+La transición avanza con los milisegundos del reloj del bucle
+(clock.tick), así que dura lo mismo en cualquier máquina, y mientras dura
+el bucle sigue atendiendo eventos y dibujando la escena nueva.
+"""
+
+import pygame
+
+# Duración por defecto de un fundido en milisegundos
+FADE_DURATION = 400
+
+# Alfa de cada paso del fundido (de opaco a transparente, con suavizado)
+ALPHA_STEPS = 32
+FADE_ALPHAS = [round(255 * (1 - t * t * (3 - 2 * t))) for t in (i / ALPHA_STEPS for i in range(ALPHA_STEPS + 1))]
+
+# Superficies de color liso por (color, tamaño)
+_solids = {}
+
+def solid(color, size):
+    surface = _solids.get((color, size))
+    if surface is None:
+        surface = _solids[(color, size)] = pygame.Surface(size)
+        surface.fill(color)
+    return surface
+
+# Clase para un fundido entre dos escenas
+class Transition:
+    def __init__(self, image, duration=FADE_DURATION, reveal=True, on_done=None):
+        self.image = image  # Imagen opaca que se funde
+        self.duration = max(1, duration)
+        self.reveal = reveal  # True: la imagen se desvanece; False: va cubriendo la pantalla
+        self.on_done = on_done  # Función a llamar al terminar
+        self.elapsed = 0
+        self.done = False
+
+    @classmethod
+    def cross_fade(cls, screen, duration=FADE_DURATION, on_done=None):
+        """Fundido desde lo que hay ahora en pantalla a la escena que se dibuje después"""
+        return cls(screen.copy(), duration, True, on_done)
+
+    @classmethod
+    def fade_in(cls, size, color=(0, 0, 0), duration=FADE_DURATION, on_done=None):
+        """Aparecer desde un color liso"""
+        return cls(solid(color, size), duration, True, on_done)
+
+    @classmethod
+    def fade_out(cls, size, color=(0, 0, 0), duration=FADE_DURATION, on_done=None):
+        """Cubrir la escena con un color liso"""
+        return cls(solid(color, size), duration, False, on_done)
+
+    def update(self, dt):
+        """Avanzar `dt` milisegundos"""
+        if self.done:
+            return
+        self.elapsed += dt
+        if self.elapsed >= self.duration:
+            self.done = True
+            if self.on_done:
+                self.on_done()
+
+    def alpha(self):
+        step = min(ALPHA_STEPS, int(self.elapsed * ALPHA_STEPS // self.duration))
+        return FADE_ALPHAS[step] if self.reveal else FADE_ALPHAS[ALPHA_STEPS - step]
+
+    def draw(self, screen):
+        alpha = self.alpha()
+        if alpha:
+            self.image.set_alpha(alpha)
+            screen.blit(self.image, (0, 0))
+
+def overlay(screen, transition, dt):
+    """Avanzar y dibujar la transición activa; devuelve la que sigue activa (o None)"""
+    if transition is None:
+        return None
+    transition.update(dt)
+    transition.draw(screen)
+    return None if transition.done and transition.reveal else transition
@@ -30,13 +30,22 @@ DARK_RED = (139, 0, 0)
 POTATO_BROWN = (139, 69, 19)
 POTATO_LIGHT = (210, 180, 140)
 
+# Atlas de texturas compartido (caché de sprites)
+try:
+    from src.atlas import load_sprite
+except ImportError:
+    from atlas import load_sprite
+
+# Sprites cacheados, lotes de blits y HUD retenido
+try:
+    from src.render import circle_sprite, draw_commands, HUDWidget, RetainedHUD
+except ImportError:
+    from render import circle_sprite, draw_commands, HUDWidget, RetainedHUD
+
 # Función para cargar imágenes con manejo de errores
 def load_image(path, scale=None):
     try:
-        image = pygame.image.load(path).convert_alpha()
-        if scale:
-            image = pygame.transform.scale(image, scale)
-        return image
+        return load_sprite(path, scale)
     except pygame.error as e:
         print(f"No se pudo cargar la imagen {path}: {e}")
         # Crear una superficie de reemplazo
@@ -76,23 +85,13 @@ class Button:
         except:
             pass
         
-    def draw(self, surface):
-        # Efecto de pulsación para el botón seleccionado
-        if self.is_hovered:
-            self.pulse_value += self.pulse_speed * self.pulse_direction
-            if self.pulse_value >= 1.0:
-                self.pulse_value = 1.0
-                self.pulse_direction = -1
-            elif self.pulse_value <= 0.0:
-                self.pulse_value = 0.0
-                self.pulse_direction = 1
-                
-            pulse_offset = int(self.pulse_value * 5)
-            color = self.hover_color
-        else:
-            pulse_offset = 0
-            color = self.color
-            
+    # Imágenes de cada estado ya dibujadas: (texto, tamaño, colores, fuente, resaltado, pulso) -> imagen
+    state_cache = {}
+    
+    def render_state(self, hovered, pulse_offset):
+        """Imagen del botón en un estado (normal o resaltado en un paso del pulso)"""
+        color = self.hover_color if hovered else self.color
+        
         # Crear superficie para el botón con transparencia
         button_surface = pygame.Surface((self.rect.width + pulse_offset*2, self.rect.height + pulse_offset*2), pygame.SRCALPHA)
         
@@ -101,7 +100,7 @@ class Button:
                          (0, 0, self.rect.width + pulse_offset*2, self.rect.height + pulse_offset*2), 0, 8)
         
         # Borde
-        if self.is_hovered:
+        if hovered:
             border_color = POTATO_BROWN
             border_width = 3
         else:
@@ -112,7 +111,7 @@ class Button:
                          (0, 0, self.rect.width + pulse_offset*2, self.rect.height + pulse_offset*2), border_width, 8)
         
         # Dibujar el texto con efecto de sombra
-        if self.is_hovered:
+        if hovered:
             text_surf = self.font.render(self.text, True, WHITE)
         else:
             text_surf = self.font.render(self.text, True, (200, 200, 200))
@@ -125,6 +124,29 @@ class Button:
         # Texto principal
         text_rect = text_surf.get_rect(center=(button_surface.get_width()//2, button_surface.get_height()//2))
         button_surface.blit(text_surf, text_rect)
+        return button_surface
+        
+    def draw(self, surface):
+        # Efecto de pulsación para el botón seleccionado
+        if self.is_hovered:
+            self.pulse_value += self.pulse_speed * self.pulse_direction
+            if self.pulse_value >= 1.0:
+                self.pulse_value = 1.0
+                self.pulse_direction = -1
+            elif self.pulse_value <= 0.0:
+                self.pulse_value = 0.0
+                self.pulse_direction = 1
+                
+            pulse_offset = int(self.pulse_value * 5)
+        else:
+            pulse_offset = 0
+        
+        # Reutilizar la imagen ya dibujada de este estado
+        key = (self.text, self.rect.size, self.color, self.hover_color, self.alpha, self.font,
+               self.is_hovered, pulse_offset)
+        button_surface = Button.state_cache.get(key)
+        if button_surface is None:
+            button_surface = Button.state_cache[key] = self.render_state(self.is_hovered, pulse_offset)
         
         # Dibujar el botón en la superficie principal
         surface.blit(button_surface, (self.rect.x - pulse_offset, self.rect.y - pulse_offset))
@@ -190,6 +212,15 @@ class ProgressBar:
             text_surf = self.font.render(text, True, self.text_color)
             text_rect = text_surf.get_rect(center=self.rect.center)
             surface.blit(text_surf, text_rect)
+    
+    def render(self):
+        """Barra dibujada en una imagen propia de su tamaño (para el HUD retenido)"""
+        image = pygame.Surface(self.rect.size, pygame.SRCALPHA)
+        rect = self.rect
+        self.rect = image.get_rect()
+        self.draw(image)
+        self.rect = rect
+        return image
 
 # Clase para el menú de pausa
 class PauseMenu:
@@ -884,9 +915,10 @@ class MessageBox:
         surface.blit(continue_surf, (WIDTH - 300, HEIGHT - 70))
 
 # Clase para el HUD principal
-class GameHUD:
+class GameHUD(RetainedHUD):
+    """HUD retenido: cada elemento observa un campo del jugador y solo se
+    vuelve a rasterizar cuando cambia; los frames sin cambios son un blit"""
     def __init__(self, player):
-        self.player = player
         self.font = None
         self.small_font = None
         
@@ -915,103 +947,105 @@ class GameHUD:
             self.minimap = None
         
         # Crear barras de progreso
-        self.health_progress = ProgressBar(70, 55, 150, 25, self.player.health, self.player.max_health, GREEN, DARK_RED)
-        self.xp_progress = ProgressBar(WIDTH - 150, 105, 120, 10, self.player.experience, self.player.level_threshold, BLUE, GRAY)
-    
-    def update(self):
-        """Actualizar elementos del HUD"""
-        # Actualizar barras de progreso
-        self.health_progress.update(self.player.health)
-        self.health_progress.max_value = self.player.max_health
+        self.health_progress = ProgressBar(70, 55, 150, 25, player.health, player.max_health, GREEN, DARK_RED)
+        self.xp_progress = ProgressBar(WIDTH - 150, 105, 120, 10, getattr(player, "experience", 0),
+                                       getattr(player, "level_threshold", 100), BLUE, GRAY)
         
-        self.xp_progress.update(self.player.experience)
-        self.xp_progress.max_value = self.player.level_threshold
+        super().__init__(player, self.create_widgets(), (0, 0, WIDTH, 240))
     
-    def draw(self, surface):
-        """Dibujar HUD completo"""
-        # Barra de vida
-        if self.health_bar:
-            surface.blit(self.health_bar, (20, 20))
-        else:
-            pygame.draw.rect(surface, DARK_RED, (20, 20, 250, 70), 0, 10)
-            pygame.draw.rect(surface, BLACK, (20, 20, 250, 70), 2, 10)
-            
-        health_text = self.font.render(f"SALUD: {int(self.player.health)}/{self.player.max_health}", True, WHITE)
-        surface.blit(health_text, (30, 30))
-        
-        # Dibujar barra de salud
-        self.health_progress.draw(surface)
-        
-        # Información de arma y munición
-        weapon = self.player.weapons[self.player.current_weapon]
-        
-        if self.ammo_bar:
-            surface.blit(self.ammo_bar, (20, 100))
-        else:
-            pygame.draw.rect(surface, DARK_RED, (20, 100, 250, 70), 0, 10)
-            pygame.draw.rect(surface, BLACK, (20, 100, 250, 70), 2, 10)
-        
-        # Dibujar icono del arma actual en el HUD
-        if "hud_image" in weapon and weapon["hud_image"]:
-            surface.blit(weapon["hud_image"], (30, 110))
-        
-        # Mostrar nombre del arma
-        weapon_name_text = self.small_font.render(weapon["name"], True, WHITE)
-        surface.blit(weapon_name_text, (120, 105))
-        
-        # Mostrar munición
-        ammo_text = self.font.render(f"{weapon['ammo']}/{weapon['max_ammo']}", True, WHITE)
-        surface.blit(ammo_text, (120, 130))
-        
-        if self.player.is_reloading:
-            reload_text = self.small_font.render("RECARGANDO", True, WHITE)
-            surface.blit(reload_text, (180, 130))
-        
-        # Puntuación
-        if self.score_display:
-            surface.blit(self.score_display, (WIDTH - 170, 20))
-        else:
-            pygame.draw.rect(surface, DARK_RED, (WIDTH - 170, 20, 150, 50), 0, 10)
-            pygame.draw.rect(surface, BLACK, (WIDTH - 170, 20, 150, 50), 2, 10)
-            
-        score_text = self.font.render(f"{self.player.score}", True, RED)
-        surface.blit(score_text, (WIDTH - 110, 35))
-        
-        # Nivel
-        level_text = self.font.render(f"NIVEL: {self.player.level}", True, WHITE)
-        surface.blit(level_text, (WIDTH - 150, 70))
-        
-        # Barra de experiencia
-        if self.xp_bar:
-            surface.blit(self.xp_bar, (WIDTH - 170, 100))
-        else:
-            pygame.draw.rect(surface, DARK_RED, (WIDTH - 170, 100, 150, 20), 0, 5)
-            pygame.draw.rect(surface, BLACK, (WIDTH - 170, 100, 150, 20), 2, 5)
-        
-        # Dibujar barra de XP
-        self.xp_progress.draw(surface)
-        
-        # Mostrar mejoras activas
-        y_offset = 150
-        if self.player.speed_boost:
-            boost_text = self.small_font.render(f"Velocidad + ({self.player.speed_boost_timer//60}s)", True, (0, 200, 255))
-            surface.blit(boost_text, (WIDTH - 150, y_offset))
-            y_offset += 20
-            
-        if self.player.damage_boost:
-            boost_text = self.small_font.render(f"Daño + ({self.player.damage_boost_timer//60}s)", True, (255, 100, 100))
-            surface.blit(boost_text, (WIDTH - 150, y_offset))
-            y_offset += 20
-            
-        if self.player.skill_points > 0:
-            points_text = self.font.render(f"¡Puntos de habilidad: {self.player.skill_points}!", True, (255, 215, 0))
-            surface.blit(points_text, (WIDTH - 250, y_offset))
+    @property
+    def player(self):
+        return self.source
+    
+    def create_widgets(self):
+        """Elementos del HUD en orden de dibujo"""
+        font, small_font = self.font, self.small_font
+        
+        def panel(image, rect, radius):
+            # Imagen del HUD o un panel de reemplazo
+            if image:
+                return HUDWidget(rect[:2], lambda hud: image)
+            surface = pygame.Surface(rect[2:], pygame.SRCALPHA)
+            pygame.draw.rect(surface, DARK_RED, surface.get_rect(), 0, radius)
+            pygame.draw.rect(surface, BLACK, surface.get_rect(), 2, radius)
+            return HUDWidget(rect[:2], lambda hud: surface)
+        
+        def bar(progress_bar, read):
+            def render(value):
+                progress_bar.progress, progress_bar.max_value = value
+                return progress_bar.render()
+            return HUDWidget(progress_bar.rect.topleft, read, render)
+        
+        def text(text_font, color):
+            return lambda value: text_font.render(value, True, color) if value else None
+        
+        def weapon(hud):
+            return hud.source.weapons[hud.source.current_weapon]
+        
+        def status(hud):
+            # Mejoras activas (cambian solo cada segundo) y puntos de habilidad
+            player = hud.source
+            return (getattr(player, "speed_boost_timer", 0) // 60 if getattr(player, "speed_boost", False) else None,
+                    getattr(player, "damage_boost_timer", 0) // 60 if getattr(player, "damage_boost", False) else None,
+                    getattr(player, "skill_points", 0))
+        
+        def status_lines(value):
+            speed, damage, points = value
+            lines = []
+            if speed is not None:
+                lines.append((small_font.render(f"Velocidad + ({speed}s)", True, (0, 200, 255)), 100))
+            if damage is not None:
+                lines.append((small_font.render(f"Daño + ({damage}s)", True, (255, 100, 100)), 100))
+            if points > 0:
+                lines.append((font.render(f"¡Puntos de habilidad: {points}!", True, (255, 215, 0)), 0))
+            if not lines:
+                return None
+            image = pygame.Surface((max(x + line.get_width() for line, x in lines), 20 * len(lines) + 10),
+                                   pygame.SRCALPHA)
+            image.blits([(line, (x, i * 20)) for i, (line, x) in enumerate(lines)], False)
+            return image
+        
+        return [
+            # Barra de vida
+            panel(self.health_bar, (20, 20, 250, 70), 10),
+            HUDWidget((30, 30), lambda hud: f"SALUD: {int(hud.source.health)}/{hud.source.max_health}",
+                      text(font, WHITE)),
+            bar(self.health_progress, lambda hud: (hud.source.health, hud.source.max_health)),
+            # Arma actual y munición
+            panel(self.ammo_bar, (20, 100, 250, 70), 10),
+            HUDWidget((30, 110), lambda hud: weapon(hud).get("hud_image")),
+            HUDWidget((120, 105), lambda hud: weapon(hud)["name"], text(small_font, WHITE)),
+            HUDWidget((120, 130), lambda hud: f"{weapon(hud)['ammo']}/{weapon(hud)['max_ammo']}",
+                      text(font, WHITE)),
+            HUDWidget((180, 130), lambda hud: "RECARGANDO" if hud.source.is_reloading else "",
+                      text(small_font, WHITE)),
+            # Puntuación, nivel y experiencia
+            panel(self.score_display, (WIDTH - 170, 20, 150, 50), 10),
+            HUDWidget((WIDTH - 110, 35), lambda hud: f"{hud.source.score}", text(font, RED)),
+            HUDWidget((WIDTH - 150, 70), lambda hud: f"NIVEL: {hud.source.level}", text(font, WHITE)),
+            panel(self.xp_bar, (WIDTH - 170, 100, 150, 20), 5),
+            bar(self.xp_progress, lambda hud: (getattr(hud.source, "experience", 0),
+                                               getattr(hud.source, "level_threshold", 100))),
+            # Mejoras activas y puntos de habilidad
+            HUDWidget((WIDTH - 250, 150), status, status_lines)
+        ]
+    
+    def update(self):
+        """Actualizar elementos del HUD (solo se rasteriza lo que cambió)"""
+        self.refresh()
 
 # Clase para el minimapa
 class Minimap:
+    """Minimapa con la geometría fija del nivel en una imagen cacheada
+
+    Fondo, obstáculos y salida se dibujan una vez por nivel (y otra vez si se
+    destruye un obstáculo). Cada frame solo se añaden los puntos que cambian:
+    checkpoints, jugador y enemigos, todos como blits de sprites cacheados.
+    """
     def __init__(self, level, player):
         self.level = level
         self.player = player
+        self.enemies = ()
         self.width = 150
         self.height = 150
         self.x = WIDTH - self.width - 20
@@ -1019,6 +1053,8 @@ class Minimap:
         self.scale_x = 0.1  # Escala para mapear coordenadas del nivel
         self.scale_y = 0.1
         self.background = None
+        self.static = None  # Imagen fija del nivel actual
+        self.obstacle_count = -1
         
         # Cargar fondo del minimapa
         try:
@@ -1026,89 +1062,95 @@ class Minimap:
         except:
             self.background = None
     
-    def update(self, level, player):
-        """Actualizar referencias"""
+    def update(self, level, player, enemies=()):
+        """Actualizar referencias (un nivel nuevo invalida la imagen fija)"""
+        if level is not self.level:
+            self.invalidate()
         self.level = level
         self.player = player
+        self.enemies = enemies
         
-        # Ajustar escala según tamaño del nivel
-        if level.linear:
-            self.scale_x = self.width / level.scroll_width
-            self.scale_y = self.height / HEIGHT
+        # Ajustar escala al tamaño del nivel
+        if level:
+            _, _, level_width, level_height = level.get_level_bounds()
+            self.scale_x = self.width / level_width
+            self.scale_y = self.height / level_height
     
-    def draw(self, surface):
-        """Dibujar minimapa"""
-        # Dibujar fondo
+    def invalidate(self):
+        """Volver a componer la imagen fija en el próximo dibujo"""
+        self.static = None
+    
+    def render_static(self):
+        """Fondo, obstáculos y salida del nivel en coordenadas del minimapa"""
+        surface = pygame.Surface((self.width, self.height), pygame.SRCALPHA)
         if self.background:
-            surface.blit(self.background, (self.x, self.y))
+            surface.blit(self.background, (0, 0))
         else:
-            map_rect = pygame.Rect(self.x, self.y, self.width, self.height)
-            pygame.draw.rect(surface, (0, 0, 0, 150), map_rect)
-            pygame.draw.rect(surface, POTATO_BROWN, map_rect, 2)
+            surface.fill((0, 0, 0, 150))
+            pygame.draw.rect(surface, POTATO_BROWN, surface.get_rect(), 2)
         
-        # Dibujar elementos del nivel si hay nivel
         if self.level:
-            # Obstáculos
+            # Obstáculos (en coordenadas del nivel, sin desplazamiento)
             for obstacle in self.level.obstacles:
-                # Convertir coordenadas del nivel a coordenadas del minimapa
-                if self.level.linear:
-                    map_x = self.x + (obstacle.x - self.level.scroll_offset_x) * self.scale_x
-                    map_y = self.y + obstacle.y * self.scale_y
-                else:
-                    map_x = self.x + obstacle.x * self.scale_x
-                    map_y = self.y + obstacle.y * self.scale_y
-                
-                # Dibujar punto para el obstáculo
-                map_width = max(2, obstacle.width * self.scale_x)
-                map_height = max(2, obstacle.height * self.scale_y)
-                
-                # Seleccionar color según tipo
                 if obstacle.type == "wall":
                     color = GRAY
                 elif obstacle.type == "table":
                     color = POTATO_BROWN
                 else:
                     color = DARK_RED
-                    
-                pygame.draw.rect(surface, color, (map_x, map_y, map_width, map_height))
-            
-            # Checkpoints
-            for checkpoint in self.level.checkpoints:
-                if self.level.linear:
-                    map_x = self.x + (checkpoint.x - self.level.scroll_offset_x) * self.scale_x
-                    map_y = self.y + checkpoint.y * self.scale_y
-                else:
-                    map_x = self.x + checkpoint.x * self.scale_x
-                    map_y = self.y + checkpoint.y * self.scale_y
-                
-                # Usar color según estado
-                color = GREEN if checkpoint.active else WHITE
-                pygame.draw.circle(surface, color, (int(map_x), int(map_y)), 3)
+                pygame.draw.rect(surface, color, (obstacle.x * self.scale_x, obstacle.y * self.scale_y,
+                                                  max(2, obstacle.width * self.scale_x),
+                                                  max(2, obstacle.height * self.scale_y)))
             
             # Punto de salida
-            exit_x, exit_y = self.level.get_exit_point()
-            if self.level.linear:
-                map_exit_x = self.x + (exit_x) * self.scale_x
-                map_exit_y = self.y + exit_y * self.scale_y
-            else:
-                map_exit_x = self.x + exit_x * self.scale_x
-                map_exit_y = self.y + exit_y * self.scale_y
-            
-            pygame.draw.circle(surface, BLUE, (int(map_exit_x), int(map_exit_y)), 4)
-        
-        # Dibujar jugador en el minimapa
+            exit_x, exit_y = self.level.exit_point
+            pygame.draw.circle(surface, BLUE, (int(exit_x * self.scale_x), int(exit_y * self.scale_y)), 4)
+        return surface
+    
+    def batch(self, commands):
+        """Añadir a `commands` la imagen fija y los puntos del frame"""
+        level = self.level
+        obstacles = level.obstacles if level else ()
+        if self.static is None or len(obstacles) != self.obstacle_count:
+            # Nivel nuevo o algún obstáculo destruido
+            self.static = self.render_static()
+            self.obstacle_count = len(obstacles)
+        commands.append((self.static, (self.x, self.y)))
+        
+        # Desplazamiento de pantalla a nivel (las entidades están en coordenadas de pantalla)
+        offset_x = level.scroll_offset_x if level and level.linear else 0
+        offset_y = level.scroll_offset_y if level and level.linear else 0
+        origin_x, origin_y = self.x, self.y
+        scale_x, scale_y = self.scale_x, self.scale_y
+        
+        # Checkpoints según su estado
+        if level:
+            active, inactive = circle_sprite(GREEN + (255,), 3), circle_sprite(WHITE + (255,), 3)
+            for checkpoint in level.checkpoints:
+                commands.append((active if checkpoint.active else inactive,
+                                 (int(origin_x + checkpoint.x * scale_x) - 3,
+                                  int(origin_y + checkpoint.y * scale_y) - 3)))
+        
+        # Enemigos: un punto pequeño cada uno (los que aún entran desde fuera no se ven)
+        blip = circle_sprite((255, 165, 0, 255), 2)
+        width, height = self.width, self.height
+        for enemy in self.enemies:
+            map_x = (enemy.x + offset_x) * scale_x
+            map_y = (enemy.y + offset_y) * scale_y
+            if 0 <= map_x < width and 0 <= map_y < height:
+                commands.append((blip, (int(origin_x + map_x) - 2, int(origin_y + map_y) - 2)))
+        
+        # Jugador como punto más grande
         if self.player:
-            if self.level and self.level.linear:
-                # En niveles lineales, el jugador se mueve relativo al nivel
-                map_player_x = self.x + (self.player.x + self.level.scroll_offset_x) * self.scale_x
-                map_player_y = self.y + self.player.y * self.scale_y
-            else:
-                # En niveles normales, posición directa
-                map_player_x = self.x + self.player.x * self.scale_x
-                map_player_y = self.y + self.player.y * self.scale_y
-            
-            # Dibujar jugador como punto más grande
-            pygame.draw.circle(surface, RED, (int(map_player_x), int(map_player_y)), 5)
+            commands.append((circle_sprite(RED + (255,), 5),
+                             (int(origin_x + (self.player.x + offset_x) * scale_x) - 5,
+                              int(origin_y + (self.player.y + offset_y) * scale_y) - 5)))
+    
+    def draw(self, surface):
+        """Dibujar minimapa"""
+        commands = []
+        self.batch(commands)
+        draw_commands(surface, commands)
 
 # Ejemplo de uso
 if __name__ == "__main__":
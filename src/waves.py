@@ -0,0 +1,131 @@
+"""
+Módulo de oleadas para Killer Potato
+Director que decide cuándo y cuántos enemigos aparecen en cada nivel
+
+Cada nivel puede definir un guion de oleadas en su JSON:
+
+    "waves": [
+        {"count": 4, "types": {"guard": 0.7, "minion": 0.3}},
+        {"count": 6, "pause": 240, "group": 2, "spawn_rate": 40}
+    ]
+
+Si no hay guion se generan oleadas a partir de enemies_count, cada vez más
+grandes y rápidas en los niveles avanzados. Si el nivel tiene jefe, aparece
+en una última oleada propia tras la pausa habitual. El director respeta spawn_rate,
+limita los enemigos vivos y frena la generación mientras el frame se pase del
+presupuesto de tiempo: nunca con la pantalla vacía ni más de max_throttle
+frames seguidos, así que el nivel siempre termina aunque la máquina vaya lenta.
+"""
+
+import random
+
+# Configuración de oleadas (tomar de config o usar valores por defecto)
+try:
+    from config.settings import WAVE_SETTINGS
+except ImportError:
+    WAVE_SETTINGS = {
+        "wave_size": 3,
+        "wave_growth": 0.35,
+        "wave_pause": 180,
+        "group_levels": 8,
+        "max_alive_base": 8,
+        "max_alive_per_level": 1,
+        "max_alive_limit": 40,
+        "ramp_per_level": 0.03,
+        "min_rate_factor": 0.4,
+        "throttle_ratio": 0.9,
+        "max_throttle": 60
+    }
+
+def generate_waves(level_number, total_enemies, settings=WAVE_SETTINGS):
+    """Repartir los enemigos de un nivel en oleadas crecientes"""
+    wave_size = max(1, round(settings.get("wave_size", 3) + settings.get("wave_growth", 0.35) * level_number))
+    pause = settings.get("wave_pause", 180)
+
+    waves = []
+    remaining = total_enemies
+    while remaining > 0:
+        count = min(wave_size, remaining)
+        waves.append({"count": count, "pause": pause if waves else 0})
+        remaining -= count
+        wave_size += 1  # Cada oleada trae un enemigo más que la anterior
+    return waves
+
+# Clase que programa la aparición de enemigos
+class WaveDirector:
+    def __init__(self, level_number, total_enemies, spawn_rate=60, waves=None, settings=WAVE_SETTINGS, boss=None):
+        self.level_number = level_number
+        self.waves = list(waves) if waves else generate_waves(level_number, total_enemies, settings)
+        if boss:
+            self.waves.append({"count": 1, "types": {boss: 1}, "pause": settings.get("wave_pause", 180)})
+        self.throttle_ratio = settings.get("throttle_ratio", 0.9)
+        self.max_throttle = settings.get("max_throttle", 60)
+
+        # Intensidad según el nivel: más enemigos vivos, grupos más grandes, menos espera
+        self.max_alive = min(settings.get("max_alive_limit", 40),
+                             settings.get("max_alive_base", 8) + settings.get("max_alive_per_level", 1) * level_number)
+        self.group_size = 1 + level_number // max(1, settings.get("group_levels", 8))
+        ramp = max(settings.get("min_rate_factor", 0.4), 1 - settings.get("ramp_per_level", 0.03) * (level_number - 1))
+        self.spawn_interval = max(1, int(spawn_rate * ramp))
+
+        self.wave_index = 0
+        self.spawned_in_wave = 0
+        self.total = sum(wave.get("count", 0) for wave in self.waves)
+        self.spawned = 0
+        self.timer = self.waves[0].get("pause", 0) if self.waves else 0
+        self.throttled_frames = 0  # Frames en los que se frenó por falta de tiempo
+        self.throttle_streak = 0  # Frames seguidos frenados
+
+    @property
+    def remaining(self):
+        """Enemigos que quedan por generar en el nivel"""
+        return self.total - self.spawned
+
+    def is_finished(self):
+        return self.wave_index >= len(self.waves)
+
+    def choose_type(self, wave):
+        """Tipo de enemigo según los pesos de la oleada (None = aleatorio por nivel)"""
+        types = wave.get("types")
+        if not types:
+            return None
+        return random.choices(list(types), weights=list(types.values()))[0]
+
+    def update(self, alive_count, profiler=None):
+        """Avanzar un frame y devolver la lista de tipos de enemigo a generar"""
+        if self.is_finished():
+            return []
+
+        if self.timer > 0:
+            self.timer -= 1
+            return []
+
+        # Sin margen de tiempo en el frame: esperar en lugar de empeorar el FPS,
+        # salvo si no queda nadie vivo o ya se ha esperado demasiado
+        if (profiler is not None and alive_count > 0 and self.throttle_streak < self.max_throttle
+                and profiler.over_budget(self.throttle_ratio)):
+            self.throttled_frames += 1
+            self.throttle_streak += 1
+            return []
+        self.throttle_streak = 0
+
+        free_slots = self.max_alive - alive_count
+        if free_slots <= 0:
+            return []
+
+        wave = self.waves[self.wave_index]
+        count = min(wave.get("group", self.group_size), free_slots, wave.get("count", 0) - self.spawned_in_wave)
+        spawns = [self.choose_type(wave) for _ in range(count)]
+        self.spawned_in_wave += count
+        self.spawned += count
+
+        if self.spawned_in_wave >= wave.get("count", 0):
+            # Oleada completa: pasar a la siguiente tras su pausa
+            self.wave_index += 1
+            self.spawned_in_wave = 0
+            if not self.is_finished():
+                self.timer = self.waves[self.wave_index].get("pause", 0)
+        else:
+            self.timer = wave.get("spawn_rate", self.spawn_interval)
+
+        return spawns
@@ -58,14 +58,34 @@ except ImportError:
         }
     }
 
+# Atlas de texturas compartido (caché de sprites)
+try:
+    from src.atlas import load_sprite
+except ImportError:
+    from atlas import load_sprite
+
+# Cachés de sprites derivados (giros, tintes, círculos)
+try:
+    from src.render import ROTATION_STEPS, rotation_frames, rotated, circle_sprite, draw_commands
+except ImportError:
+    from render import ROTATION_STEPS, rotation_frames, rotated, circle_sprite, draw_commands
+
+# Ancho del frente de una onda expansiva que causa daño
+WAVE_FRONT_WIDTH = 30
+
+# Rumbos (vectores unitarios) en los bordes entre sprites girados: el frame f
+# cubre los rumbos entre FRAME_EDGES[f] y FRAME_EDGES[f + 1]
+FRAME_EDGES = [(math.cos((f - 0.5) * 2 * math.pi / ROTATION_STEPS),
+                math.sin((f - 0.5) * 2 * math.pi / ROTATION_STEPS)) for f in range(ROTATION_STEPS + 1)]
+
+# Apertura del fuego de propulsión de los misiles (coseno y seno de 0.2 rad)
+EXHAUST_COS, EXHAUST_SIN = math.cos(0.2), math.sin(0.2)
+
 # Función para cargar imágenes con manejo de errores
 def load_image(path, scale=None):
     try:
-        image = pygame.image.load(path).convert_alpha()
-        if scale:
-            image = pygame.transform.scale(image, scale)
-        return image
-    except pygame.error as e:
+        return load_sprite(path, scale)
+    except (pygame.error, FileNotFoundError) as e:
         print(f"No se pudo cargar la imagen {path}: {e}")
         # Crear una superficie de reemplazo
         surface = pygame.Surface((50, 50), pygame.SRCALPHA)
@@ -76,9 +96,19 @@ def load_image(path, scale=None):
 
 # Clase base para proyectiles
 class Projectile:
+    # Atributos fijos por instancia (sin __dict__: menos memoria y acceso más rápido)
+    __slots__ = (
+        "x", "y", "prev_x", "prev_y", "speed", "dx", "dy", "radius", "damage", "angle", "owner",
+        "is_critical", "lifetime", "explosive", "image", "angle_degrees",
+        "rotated_image", "rect", "critical_effect"
+    )
+    
+    kind = "projectile"  # Arquetipo en el mundo ECS
+    
     def __init__(self, x, y, angle, damage, owner="player", speed=12, is_critical=False):
         self.x = x
         self.y = y
+        self.prev_x, self.prev_y = x, y  # Posición antes del último movimiento (colisión continua)
         self.speed = speed
         self.dx = math.cos(angle) * self.speed
         self.dy = math.sin(angle) * self.speed
@@ -111,6 +141,7 @@ class Projectile:
     
     def update(self):
         """Actualizar posición y estado del proyectil"""
+        self.prev_x, self.prev_y = self.x, self.y
         self.x += self.dx
         self.y += self.dy
         self.rect.center = (self.x, self.y)
@@ -118,48 +149,37 @@ class Projectile:
         # Reducir tiempo de vida
         self.lifetime -= 1
     
-    def draw(self, screen):
-        """Dibujar proyectil en pantalla"""
-        # Dibujar proyectil
-        screen.blit(self.rotated_image, self.rect.topleft)
+    def batch(self, commands):
+        """Órdenes de dibujo del proyectil (ver render.Renderer)"""
+        commands.append((self.rotated_image, self.rect))
         
-        # Dibujar efecto de golpe crítico si corresponde
+        # Efecto de golpe crítico girando sobre el proyectil
         if self.is_critical and self.critical_effect:
-            # Posición con offset para que el efecto siga al proyectil
-            effect_x = self.x - self.critical_effect.get_width() // 2
-            effect_y = self.y - self.critical_effect.get_height() // 2
-            
-            # Efecto de rotación para el crítico
-            critical_angle = pygame.time.get_ticks() % 360
-            rotated_effect = pygame.transform.rotate(self.critical_effect, critical_angle)
-            effect_rect = rotated_effect.get_rect(center=(self.x, self.y))
-            
-            screen.blit(rotated_effect, effect_rect.topleft)
+            rotated_effect = rotated(self.critical_effect, -(pygame.time.get_ticks() % 360))
+            commands.append((rotated_effect, rotated_effect.get_rect(center=(self.x, self.y))))
         
-        # Efecto de estela
+        # Efecto de estela (partículas cacheadas que se desvanecen)
         if self.owner == "player":
             trail_length = 3
-            trail_color = (255, 200, 0, 150)  # Amarillo para jugador
+            trail_color = (255, 200, 0)  # Amarillo para jugador
         else:
             trail_length = 2
-            trail_color = (200, 0, 0, 150)  # Rojo para enemigos
+            trail_color = (200, 0, 0)  # Rojo para enemigos
             
         for i in range(1, trail_length + 1):
             alpha = 200 - i * 60  # La estela se desvanece
-            if alpha > 0:
-                trail_pos = (int(self.x - self.dx * i * 0.5), int(self.y - self.dy * i * 0.5))
-                
-                # Crear superficie para partícula con alpha
-                trail_size = self.radius - i
-                if trail_size > 0:
-                    trail_surf = pygame.Surface((trail_size*2, trail_size*2), pygame.SRCALPHA)
-                    pygame.draw.circle(
-                        trail_surf, 
-                        (trail_color[0], trail_color[1], trail_color[2], alpha), 
-                        (trail_size, trail_size), 
-                        trail_size
-                    )
-                    screen.blit(trail_surf, (trail_pos[0]-trail_size, trail_pos[1]-trail_size))
+            trail_size = self.radius - i
+            if alpha > 0 and trail_size > 0:
+                trail_x = int(self.x - self.dx * i * 0.5)
+                trail_y = int(self.y - self.dy * i * 0.5)
+                commands.append((circle_sprite((*trail_color, alpha), trail_size),
+                                 (trail_x - trail_size, trail_y - trail_size)))
+    
+    def draw(self, screen):
+        """Dibujar proyectil en pantalla"""
+        commands = []
+        self.batch(commands)
+        screen.blits(commands, False)
     
     def is_offscreen(self):
         """Comprobar si el proyectil está fuera de la pantalla"""
@@ -172,11 +192,13 @@ class Projectile:
     def explode(self):
         """Método para proyectiles explosivos"""
         if self.explosive:
-            return ShockWave(self.x, self.y, self.damage * 0.8, 80, (255, 100, 0))
+            return ShockWave(self.x, self.y, self.damage * 0.8, 80, (255, 100, 0), self.owner)
         return None
 
 # Clase para proyectiles lanzados por el chef
 class ThrownUtensil(Projectile):
+    __slots__ = ("utensil_type", "rotation_speed", "current_rotation", "base_image")
+    
     def __init__(self, x, y, angle, damage, utensil_type):
         super().__init__(x, y, angle, damage, "enemy", 8)
         self.utensil_type = utensil_type  # "cuchillo", "tenedor", "sartén"
@@ -201,13 +223,86 @@ class ThrownUtensil(Projectile):
         # Actualizar rotación
         self.current_rotation += self.rotation_speed
         
-        # Recalcular imagen rotada
-        total_rotation = self.angle_degrees + self.current_rotation
-        self.rotated_image = pygame.transform.rotate(self.base_image, -total_rotation)
+        # Imagen girada (precalculada)
+        self.rotated_image = rotated(self.base_image, self.angle_degrees + self.current_rotation)
         self.rect = self.rotated_image.get_rect(center=(self.x, self.y))
 
+def steer_missiles(missiles, target=None):
+    """Guiar todos los misiles en un solo recorrido
+
+    El rumbo de cada misil es un vector unitario. El signo del producto
+    cruzado indica hacia qué lado girar y el giro limitado se aplica con el
+    seno y coseno precalculados de turning_speed, sin atan2 ni bucles para
+    normalizar ángulos. Si el objetivo queda dentro del giro máximo el
+    misil apunta directamente a él. El sprite girado también sale del rumbo
+    (ver HomingMissile.set_frame).
+
+    `target` es la posición viva del objetivo (x, y); si es None cada misil
+    usa el suyo.
+    """
+    turn = None
+    for missile in missiles:
+        goal = target or missile.target
+        x, y = missile.x, missile.y
+        heading_x, heading_y = missile.heading_x, missile.heading_y
+        speed = missile.speed
+        
+        if goal:
+            if missile.turning_speed != turn:
+                turn = missile.turning_speed
+                turn_cos, turn_sin = math.cos(turn), math.sin(turn)
+            
+            to_x = goal[0] - x
+            to_y = goal[1] - y
+            cross = heading_x * to_y - heading_y * to_x
+            dot = heading_x * to_x + heading_y * to_y
+            distance_sq = to_x * to_x + to_y * to_y
+            
+            if dot > 0 and cross * cross <= turn_sin * turn_sin * distance_sq:
+                # El objetivo está dentro del giro máximo
+                distance = math.sqrt(distance_sq)
+                heading_x, heading_y = to_x / distance, to_y / distance
+            elif cross >= 0:
+                heading_x, heading_y = (heading_x * turn_cos - heading_y * turn_sin,
+                                        heading_x * turn_sin + heading_y * turn_cos)
+            else:
+                heading_x, heading_y = (heading_x * turn_cos + heading_y * turn_sin,
+                                        heading_y * turn_cos - heading_x * turn_sin)
+            missile.heading_x, missile.heading_y = heading_x, heading_y
+            missile.dx = heading_x * speed
+            missile.dy = heading_y * speed
+            
+            # Aplicar aceleración
+            if speed < missile.max_speed:
+                missile.speed = speed + missile.acceleration
+            
+            # Sprite girado
+            missile.set_frame()
+        
+        # Posición
+        missile.prev_x, missile.prev_y = x, y
+        x += missile.dx
+        y += missile.dy
+        missile.x, missile.y = x, y
+        missile.rect.center = (x, y)
+        missile.lifetime -= 1
+        
+        # Humo cada 3 frames (tuplas: x, y, tamaño, frame de nacimiento, frame de muerte)
+        age = missile.age = missile.age + 1
+        smoke = missile.smoke_particles
+        if age % 3 == 0:
+            smoke.append((x - missile.dx * 0.8, y - missile.dy * 0.8,
+                          random.uniform(3, 6), age, age + random.randint(20, 30)))
+        while smoke and smoke[0][4] <= age:
+            smoke.pop(0)
+
 # Clase para proyectiles teledirigidos (misiles, etc)
 class HomingMissile(Projectile):
+    __slots__ = ("target", "turning_speed", "acceleration", "max_speed", "heading_x",
+                 "heading_y", "frame", "age", "smoke_particles", "base_image")
+    
+    kind = "missile"  # Arquetipo propio: los guía homing_system en bloque
+    
     def __init__(self, x, y, damage, speed=6, target=None):
         # Ángulo inicial aleatorio si no hay objetivo
         if target:
@@ -219,115 +314,89 @@ class HomingMissile(Projectile):
             
         super().__init__(x, y, angle, damage, "enemy", speed)
         
-        self.target = target  # Coordenadas del objetivo o None
+        self.target = target  # Punto de lanzamiento o None (en juego se sigue al jugador vivo)
         self.turning_speed = 0.04  # Velocidad de giro en radianes
         self.acceleration = 0.1  # Aceleración
         self.max_speed = speed + 2  # Velocidad máxima
-        self.smoke_timer = 0  # Temporizador para efectos de humo
+        self.heading_x = math.cos(angle)  # Rumbo como vector unitario
+        self.heading_y = math.sin(angle)
+        self.age = 0  # Frames de vuelo (para el humo)
         self.smoke_particles = []  # Partículas de humo
         self.explosive = True  # Es explosivo
         
         # Cargar imagen
         self.base_image = load_image("assets/images/items/missile.png", (20, 8))
+        self.frame = None
+        self.set_frame()
+    
+    def set_frame(self):
+        """Elegir el sprite precalculado más cercano al rumbo actual
+
+        Parte del frame anterior y avanza o retrocede mientras el rumbo quede
+        fuera de sus bordes (signo del producto cruzado con FRAME_EDGES). El
+        giro por frame es menor que un paso de sprite, así que casi siempre
+        basta una comparación.
+        """
+        frame = self.frame
+        if frame is None:
+            frame = round(self.angle * ROTATION_STEPS / (2 * math.pi)) % ROTATION_STEPS  # Ángulo de lanzamiento
+        heading_x, heading_y = self.heading_x, self.heading_y
+        for _ in range(ROTATION_STEPS):
+            edge_x, edge_y = FRAME_EDGES[frame + 1]
+            if edge_x * heading_y - edge_y * heading_x >= 0:
+                frame = (frame + 1) % ROTATION_STEPS
+                continue
+            edge_x, edge_y = FRAME_EDGES[frame]
+            if edge_x * heading_y - edge_y * heading_x < 0:
+                frame = (frame - 1) % ROTATION_STEPS
+                continue
+            break
+        if frame != self.frame:
+            self.frame = frame
+            self.rotated_image = rotation_frames(self.base_image)[frame]
+            self.rect = self.rotated_image.get_rect(center=(self.x, self.y))
     
     def update(self):
-        """Actualizar posición, dirección y efectos"""
-        # Actualizar humo
-        self.smoke_timer += 1
-        if self.smoke_timer >= 3:  # Generar humo cada 3 frames
-            self.smoke_timer = 0
-            
-            # Añadir partícula de humo
-            self.smoke_particles.append({
-                'x': self.x - self.dx * 0.8,  # Posición detrás del misil
-                'y': self.y - self.dy * 0.8,
-                'size': random.uniform(3, 6),
-                'lifetime': random.randint(20, 30),
-                'max_lifetime': 30,
-                'color': (200, 200, 200)  # Gris
-            })
-        
-        # Actualizar partículas de humo
-        for particle in self.smoke_particles[:]:
-            particle['lifetime'] -= 1
-            if particle['lifetime'] <= 0:
-                self.smoke_particles.remove(particle)
-        
-        # Seguir al objetivo si existe
-        if self.target:
-            # Calcular dirección al objetivo
-            dx = self.target[0] - self.x
-            dy = self.target[1] - self.y
-            target_angle = math.atan2(dy, dx)
-            
-            # Calcular diferencia de ángulo (menor camino)
-            angle_diff = target_angle - self.angle
-            while angle_diff > math.pi:
-                angle_diff -= 2 * math.pi
-            while angle_diff < -math.pi:
-                angle_diff += 2 * math.pi
-            
-            # Girar hacia el objetivo
-            if abs(angle_diff) < self.turning_speed:
-                self.angle = target_angle
-            elif angle_diff > 0:
-                self.angle += self.turning_speed
-            else:
-                self.angle -= self.turning_speed
-            
-            # Actualizar dirección
-            self.dx = math.cos(self.angle) * self.speed
-            self.dy = math.sin(self.angle) * self.speed
-            
-            # Aplicar aceleración
-            if self.speed < self.max_speed:
-                self.speed += self.acceleration
-        
-        # Posición
-        self.x += self.dx
-        self.y += self.dy
-        
-        # Actualizar imagen rotada
-        self.angle_degrees = math.degrees(self.angle)
-        self.rotated_image = pygame.transform.rotate(self.base_image, -self.angle_degrees)
-        self.rect = self.rotated_image.get_rect(center=(self.x, self.y))
+        """Actualizar posición, dirección y efectos (fuera del mundo ECS)"""
+        steer_missiles((self,))
+    
+    def batch(self, commands):
+        """Órdenes de dibujo: humo y misil en lote, fuego de propulsión aparte"""
+        # Partículas de humo (sprites cacheados; 16 niveles de transparencia bastan)
+        for x, y, size, born, dies in self.smoke_particles:
+            remaining = (dies - self.age) / 30
+            size = int(size * remaining)
+            if size > 0:
+                commands.append((circle_sprite((200, 200, 200, int(255 * remaining) & 0xF0), size),
+                                 (x - size, y - size)))
         
-        # Reducir tiempo de vida
-        self.lifetime -= 1
+        commands.append((self.rotated_image, self.rect))
+        commands.append(self.draw_exhaust)
     
     def draw(self, screen):
         """Dibujar misil y efectos de humo"""
-        # Dibujar partículas de humo
-        for particle in self.smoke_particles:
-            alpha = int(255 * (particle['lifetime'] / particle['max_lifetime']))
-            size = particle['size'] * (particle['lifetime'] / particle['max_lifetime'])
-            
-            particle_surface = pygame.Surface((size*2, size*2), pygame.SRCALPHA)
-            pygame.draw.circle(
-                particle_surface, 
-                (*particle['color'], alpha), 
-                (size, size), 
-                size
-            )
-            screen.blit(particle_surface, (particle['x'] - size, particle['y'] - size))
-        
-        # Dibujar misil
-        screen.blit(self.rotated_image, self.rect.topleft)
-        
-        # Dibujar fuego de propulsión
+        commands = []
+        self.batch(commands)
+        draw_commands(screen, commands)
+    
+    def draw_exhaust(self, screen):
+        """Dibujar fuego de propulsión"""
         exhaust_length = random.randint(5, 15)
         exhaust_width = 3
         
-        # Calcular posición trasera del misil
-        back_x = self.x - math.cos(self.angle) * (self.rotated_image.get_width() // 2)
-        back_y = self.y - math.sin(self.angle) * (self.rotated_image.get_height() // 2)
+        # Calcular posición trasera del misil (según su rumbo)
+        heading_x, heading_y = self.heading_x, self.heading_y
+        back_x = self.x - heading_x * (self.rotated_image.get_width() // 2)
+        back_y = self.y - heading_y * (self.rotated_image.get_height() // 2)
         
-        # Dibujar fuego
+        # Dibujar fuego (rumbo girado ±0.2 rad para los lados)
+        left_x, left_y = heading_x * EXHAUST_COS + heading_y * EXHAUST_SIN, heading_y * EXHAUST_COS - heading_x * EXHAUST_SIN
+        right_x, right_y = heading_x * EXHAUST_COS - heading_y * EXHAUST_SIN, heading_y * EXHAUST_COS + heading_x * EXHAUST_SIN
         exhaust_points = [
             (back_x, back_y),
-            (back_x - math.cos(self.angle - 0.2) * exhaust_width, back_y - math.sin(self.angle - 0.2) * exhaust_width),
-            (back_x - math.cos(self.angle) * exhaust_length, back_y - math.sin(self.angle) * exhaust_length),
-            (back_x - math.cos(self.angle + 0.2) * exhaust_width, back_y - math.sin(self.angle + 0.2) * exhaust_width)
+            (back_x - left_x * exhaust_width, back_y - left_y * exhaust_width),
+            (back_x - heading_x * exhaust_length, back_y - heading_y * exhaust_length),
+            (back_x - right_x * exhaust_width, back_y - right_y * exhaust_width)
         ]
         
         # Colores del fuego
@@ -341,7 +410,7 @@ class HomingMissile(Projectile):
                 points = [
                     exhaust_points[0],
                     exhaust_points[1],
-                    (back_x - math.cos(self.angle) * shorter, back_y - math.sin(self.angle) * shorter),
+                    (back_x - heading_x * shorter, back_y - heading_y * shorter),
                     exhaust_points[3]
                 ]
                 
@@ -353,20 +422,23 @@ class HomingMissile(Projectile):
     
     def explode(self):
         """Crear explosión al impactar"""
-        return ShockWave(self.x, self.y, self.damage, 100, (255, 100, 0))
+        return ShockWave(self.x, self.y, self.damage, 100, (255, 100, 0), self.owner)
 
 # Clase para ondas expansivas o ataques en área
 class ShockWave:
-    def __init__(self, x, y, damage, max_radius, wave_color=None):
+    kind = "hazard"  # Arquetipo en el mundo ECS
+    
+    def __init__(self, x, y, damage, max_radius, wave_color=None, owner="enemy"):
         self.x = x
         self.y = y
         self.damage = damage
+        self.owner = owner
         self.current_radius = 10
         self.max_radius = max_radius
         self.growth_speed = 5
         self.alpha = 200
         self.fade_speed = 2
-        self.hits = set()  # Conjunto para registrar qué ya ha sido golpeado
+        self.hits = set()  # Claves de los objetivos ya golpeados (toda la vida de la onda)
         
         # Color de la onda
         if wave_color:
@@ -411,28 +483,14 @@ class ShockWave:
         # Dibujar en pantalla
         screen.blit(wave_surface, (self.x - self.current_radius, self.y - self.current_radius))
     
-    def check_collision(self, entity_rect):
-        """Comprobar si un rectángulo está dentro de la onda y no ha sido golpeado antes"""
-        # Calcular distancia al centro
-        entity_center_x = entity_rect.centerx
-        entity_center_y = entity_rect.centery
-        
-        distance = math.sqrt((entity_center_x - self.x)**2 + (entity_center_y - self.y)**2)
-        
-        # Comprobar si está dentro del radio de daño
-        wave_front_width = 30  # Ancho del frente de onda que causa daño
-        in_damage_zone = self.current_radius - wave_front_width <= distance <= self.current_radius
-        
-        if in_damage_zone:
-            # Convertir rect a tupla para poder añadirlo al conjunto
-            entity_key = (entity_rect.x, entity_rect.y, entity_rect.width, entity_rect.height)
-            
-            # Si no ha sido golpeado antes, marcar como golpeado y devolver True
-            if entity_key not in self.hits:
-                self.hits.add(entity_key)
-                return True
-        
-        return False
+    def damage_zone(self):
+        """Anillo que daña en este frame como (radio interior², radio exterior²)"""
+        inner = max(0, self.current_radius - WAVE_FRONT_WIDTH)
+        return inner * inner, self.current_radius * self.current_radius
+    
+    def apply_damage(self):
+        """Daño de la onda (cada objetivo lo recibe una sola vez, ver self.hits)"""
+        return self.damage
     
     def is_finished(self):
         """Comprobar si la onda ha terminado su efecto"""
@@ -440,11 +498,14 @@ class ShockWave:
 
 # Clase para efectos de área persistentes (como fuego, ácido, etc)
 class AreaEffect:
-    def __init__(self, x, y, damage, duration, effect_type="fire"):
+    kind = "hazard"  # Arquetipo en el mundo ECS
+    
+    def __init__(self, x, y, damage, duration, effect_type="fire", owner="enemy"):
         self.x = x
         self.y = y
         self.radius = 50
         self.damage = damage
+        self.owner = owner
         self.duration = duration
         self.effect_type = effect_type
         self.damage_timer = 0
@@ -642,19 +703,14 @@ class AreaEffect:
                 'max_lifetime': 40
             })
     
-    def check_collision(self, entity_rect):
-        """Comprobar si un rectángulo está dentro del área de efecto"""
-        # Calcular distancia al centro
-        entity_center_x = entity_rect.centerx
-        entity_center_y = entity_rect.centery
-        
-        distance = math.sqrt((entity_center_x - self.x)**2 + (entity_center_y - self.y)**2)
-        
-        # Comprobar si está dentro del radio y si es momento de aplicar daño
-        return distance <= self.radius and self.damage_timer >= self.damage_interval
+    def damage_zone(self):
+        """Disco que daña en este frame (None mientras no toque aplicar daño)"""
+        if self.damage_timer < self.damage_interval:
+            return None
+        return 0, self.radius * self.radius
     
     def apply_damage(self):
-        """Aplicar daño y reiniciar timer"""
+        """Cerrar el pulso de daño (cada pulso se resuelve en una sola pasada)"""
         self.damage_timer = 0
         return self.damage
     
@@ -662,8 +718,53 @@ class AreaEffect:
         """Comprobar si el efecto ha terminado"""
         return self.duration <= 0
 
+def resolve_area_damage(effects, targets, key=id):
+    """Resolver en una pasada el daño de ondas y áreas sobre todos los objetivos
+
+    Los centros de los objetivos se leen una sola vez y cada efecto compara
+    distancias al cuadrado (sin sqrt) con su anillo o disco. Los efectos con
+    `hits` (ondas) recuerdan durante toda su vida la clave de cada objetivo
+    golpeado, así que moverse no permite recibir dos veces la misma onda.
+    `key` debe ser estable y no repetirse entre objetivos que vivan menos que
+    el efecto (el handle del mundo para los enemigos; id() solo sirve para
+    objetivos que duran más, como el jugador). Devuelve la lista de (objetivo, daño).
+    """
+    centers = [(target, target.rect.centerx, target.rect.centery) for target in targets]
+    events = []
+    if not centers:
+        return events
+    
+    for effect in effects:
+        zone = effect.damage_zone()
+        if zone is None:
+            continue
+        inner_sq, outer_sq = zone
+        x, y, hits = effect.x, effect.y, getattr(effect, "hits", None)
+        damage = effect.damage
+        hit = False
+        
+        for target, center_x, center_y in centers:
+            dx = center_x - x
+            dy = center_y - y
+            if inner_sq <= dx * dx + dy * dy <= outer_sq:
+                if hits is not None:
+                    target_key = key(target)
+                    if target_key in hits:
+                        continue
+                    hits.add(target_key)
+                events.append((target, damage))
+                hit = True
+        
+        # El pulso se consume solo si ha alcanzado a alguien
+        if hit:
+            effect.apply_damage()
+    
+    return events
+
 # Clase especial para crear explosivo dirigido
 class ExplosiveProjectile(Projectile):
+    __slots__ = ("explosion_radius", "explosion_damage")
+    
     def __init__(self, x, y, angle, damage, owner="player", speed=10, is_critical=False):
         super().__init__(x, y, angle, damage, owner, speed, is_critical)
         self.explosive = True
@@ -672,10 +773,12 @@ class ExplosiveProjectile(Projectile):
     
     def explode(self):
         """Crear explosión al impactar"""
-        return ShockWave(self.x, self.y, self.explosion_damage, self.explosion_radius, (255, 100, 0))
+        return ShockWave(self.x, self.y, self.explosion_damage, self.explosion_radius, (255, 100, 0), self.owner)
 
 # Clase para rayos/láseres
 class BeamProjectile(Projectile):
+    __slots__ = ("length",)
+    
     def __init__(self, x, y, angle, damage, owner="player", is_critical=False):
         super().__init__(x, y, angle, damage, owner, 30, is_critical)
         # Radio más grande para simular un rayo
@@ -684,6 +787,10 @@ class BeamProjectile(Projectile):
         self.lifetime = 10
         # Longitud del rayo
         self.length = 1000
+    
+    def batch(self, commands):
+        """El rayo se dibuja con primitivas, fuera del lote de imágenes"""
+        commands.append(self.draw)
         
     def draw(self, screen):
         """Dibujar como línea en lugar de imagen"""
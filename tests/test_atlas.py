@@ -0,0 +1,73 @@
+"""
+Pruebas del atlas de texturas
+Ejecutar desde la raíz del proyecto: python -m pytest tests
+"""
+
+import os
+import shutil
+import sys
+import tempfile
+import unittest
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(root, "src"))
+sys.path.insert(0, root)
+os.chdir(root)
+
+import pygame
+
+pygame.init()
+
+from atlas import TextureAtlas, build_atlas, atlas_is_current
+
+class TextureAtlasTest(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.directory)
+        self.sprites = os.path.join(self.directory, "sprites")
+        self.output = os.path.join(self.directory, "atlas")
+        os.makedirs(self.sprites)
+        self.save_sprite("a.png", (255, 0, 0, 255), (20, 10))
+        self.save_sprite("b.png", (0, 255, 0, 255), (8, 8))
+        build_atlas([self.sprites], self.output)
+        self.index = os.path.join(self.output, "atlas.json")
+
+    def save_sprite(self, name, color, size):
+        image = pygame.Surface(size, pygame.SRCALPHA)
+        image.fill(color)
+        pygame.image.save(image, os.path.join(self.sprites, name))
+
+    def is_current(self):
+        return atlas_is_current([self.sprites], self.index)
+
+    def test_committed_atlas_matches_sprites(self):
+        self.assertTrue(atlas_is_current(), "assets/images/atlas está desfasado: python src/atlas.py")
+
+    def test_fresh_atlas_is_current(self):
+        self.assertTrue(self.is_current())
+
+    def test_edited_sprite_makes_atlas_stale(self):
+        self.save_sprite("a.png", (0, 0, 255, 255), (20, 10))  # Mismo nombre, otros píxeles
+        self.assertFalse(self.is_current())
+
+    def test_added_sprite_makes_atlas_stale(self):
+        self.save_sprite("c.png", (0, 0, 255, 255), (4, 4))
+        self.assertFalse(self.is_current())
+
+    def test_edited_sheet_makes_atlas_stale(self):
+        sheet = os.path.join(self.output, "atlas_0.png")
+        pygame.image.save(pygame.Surface((4, 4)), sheet)
+        self.assertFalse(self.is_current())
+
+    def test_serves_sprites_from_sheet(self):
+        atlas = TextureAtlas(self.index)
+        path = os.path.join(self.sprites, "a.png").replace("\\", "/")
+        sprite = atlas.get(path)
+        self.assertEqual(sprite.get_size(), (20, 10))
+        self.assertEqual(tuple(sprite.get_at((5, 5))), (255, 0, 0, 255))
+
+if __name__ == "__main__":
+    unittest.main()
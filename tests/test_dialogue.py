@@ -0,0 +1,61 @@
+"""
+Pruebas del paquete de diálogos
+Ejecutar desde la raíz del proyecto: python -m pytest tests
+"""
+
+import json
+import os
+import shutil
+import sys
+import tempfile
+import unittest
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(root, "src"))
+sys.path.insert(0, root)
+os.chdir(root)
+
+from dialogue import DialogueBundle, build_bundle, bundle_is_current
+
+class DialogueBundleTest(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.directory)
+        self.bundle_path = os.path.join(self.directory, "dialogues.json")
+        self.write_level(1, {"intro": [{"text": "Hola"}]})
+        build_bundle(self.directory, self.bundle_path)
+
+    def write_level(self, level, events):
+        with open(os.path.join(self.directory, f"level{level}.json"), 'w', encoding='utf-8') as file:
+            json.dump(events, file)
+
+    def test_committed_bundle_matches_sources(self):
+        self.assertTrue(bundle_is_current(),
+                        "assets/dialogue/dialogues.json está desfasado: python src/dialogue.py compilar")
+
+    def test_fresh_bundle_is_current(self):
+        self.assertTrue(bundle_is_current(self.directory, self.bundle_path))
+
+    def test_edited_source_makes_bundle_stale(self):
+        self.write_level(1, {"intro": [{"text": "Adiós"}]})
+        self.assertFalse(bundle_is_current(self.directory, self.bundle_path))
+
+    def test_added_source_makes_bundle_stale(self):
+        self.write_level(2, {"intro": [{"text": "Nivel 2"}]})
+        self.assertFalse(bundle_is_current(self.directory, self.bundle_path))
+
+    def test_loads_bundle_without_sources(self):
+        os.remove(os.path.join(self.directory, "level1.json"))
+        bundle = DialogueBundle(self.bundle_path, self.directory)
+        self.assertEqual(bundle.events(1)["intro"][0]["text"], "Hola")
+
+    def test_reads_sources_without_bundle(self):
+        os.remove(self.bundle_path)
+        bundle = DialogueBundle(self.bundle_path, self.directory)
+        self.assertEqual(bundle.events(1)["intro"][0]["text"], "Hola")
+
+if __name__ == "__main__":
+    unittest.main()
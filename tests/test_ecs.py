@@ -0,0 +1,92 @@
+"""
+Pruebas de las tablas de entidades del mundo ECS
+Ejecutar desde la raíz del proyecto: python -m pytest tests
+"""
+
+import os
+import pickle
+import sys
+import unittest
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(root, "src"))
+sys.path.insert(0, root)
+os.chdir(root)
+
+from ecs import EntityTable, HANDLE_MASK
+
+# Entidad mínima (a nivel de módulo para poder serializarla)
+class Thing:
+    def __init__(self, name):
+        self.name = name
+
+class EntityTableTest(unittest.TestCase):
+    def setUp(self):
+        self.table = EntityTable()
+        self.things = [Thing(name) for name in "abcd"]
+        self.handles = [self.table.add(thing) for thing in self.things]
+
+    def test_stale_handle_after_remove_and_compact(self):
+        a = self.things[0]
+        handle = self.handles[0]
+        self.table.remove(a)
+        self.table.compact()
+        self.assertIsNone(self.table.get(handle))
+
+        # El hueco se reutiliza con otra generación: el handle viejo sigue sin resolverse
+        e = Thing("e")
+        new_handle = self.table.add(e)
+        self.assertEqual(new_handle & HANDLE_MASK, handle & HANDLE_MASK)
+        self.assertNotEqual(new_handle, handle)
+        self.assertIsNone(self.table.get(handle))
+        self.assertIs(self.table.get(new_handle), e)
+
+    def test_remove_twice(self):
+        b = self.things[1]
+        self.assertTrue(self.table.remove(b))
+        self.assertFalse(self.table.remove(b))
+        self.table.compact()
+        self.assertFalse(self.table.remove(b))
+        self.assertEqual(len(self.table), 3)
+        self.assertEqual([thing.name for thing in self.table], ["a", "d", "c"])
+
+    def test_remove_while_iterating(self):
+        for thing in self.table:
+            self.table.remove(thing)
+        self.assertEqual(len(self.table), 0)
+        self.table.compact()
+        self.assertEqual(list(self.table), [])
+
+    def test_handle_of_after_swap_remove(self):
+        a, d = self.things[0], self.things[3]
+        self.table.remove(a)
+        self.table.compact()  # d pasa al hueco de a
+        self.assertEqual(self.table.handle_of(d), self.handles[3])
+        self.assertIs(self.table.get(self.handles[3]), d)
+        self.assertIsNone(self.table.handle_of(a))
+        for thing, handle in zip(self.things[1:], self.handles[1:]):
+            self.assertIs(self.table.get(handle), thing)
+
+    def test_pickle_round_trip(self):
+        self.table.remove(self.things[1])  # Con una lápida pendiente
+        table = pickle.loads(pickle.dumps(self.table))
+        self.assertNotIn("index", table.__getstate__())
+
+        # Las copias se indexan por su nuevo id() y los handles siguen valiendo
+        copies = list(table)
+        self.assertEqual([thing.name for thing in copies], ["a", "c", "d"])
+        for thing in copies:
+            self.assertIn(thing, table)
+            self.assertIs(table.get(table.handle_of(thing)), thing)
+        self.assertIsNone(table.get(self.handles[1]))
+        self.assertEqual(table.get(self.handles[3]).name, "d")
+
+        table.compact()
+        self.assertEqual(table.handle_of(copies[-1]), self.handles[3])
+        self.assertFalse(table.remove(self.things[0]))  # El original no está en la copia
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,86 @@
+"""
+Pruebas de las instantáneas (checkpoints)
+Ejecutar desde la raíz del proyecto: python -m pytest tests
+"""
+
+import os
+import sys
+import unittest
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(root, "src"))
+sys.path.insert(0, root)
+os.chdir(root)
+
+import pygame
+
+pygame.init()
+pygame.display.set_mode((1, 1))
+
+from snapshot import take_snapshot, restore_snapshot
+from ecs import World
+from pool import ObjectPool
+from player import Player, AttackEffect
+from enemies import Enemy, create_boss
+
+class SnapshotTest(unittest.TestCase):
+    def setUp(self):
+        self.player = Player()
+        self.world = World()
+
+        # Ataque recién hecho: su efecto sigue vivo unos frames
+        projectile, effect = self.player.attack()
+        self.world.spawn(projectile, "projectile")
+        self.world.spawn(effect, "effect")
+
+        # Jefe con proyectiles sacados de la reserva (uno ya devuelto y reutilizado)
+        Enemy.projectile_pool = self.pool = ObjectPool()
+        self.boss = create_boss(5)
+        self.world.spawn(self.boss, "enemy")
+        cls, args = self.boss.projectile_spec("bullet", 0, 5, 12)
+        self.pool.reserve(cls, 2, *args)
+        first = self.boss.make_projectile("bullet", 0, 5, 12)
+        self.world.spawn(first)
+        self.world.destroy(first)
+        self.world.flush(self.pool)
+        for angle in (0, 1):
+            self.world.spawn(self.boss.make_projectile("bullet", angle, 5, 12))
+        self.assertEqual(self.pool.reused, 3)
+
+    def tearDown(self):
+        Enemy.projectile_pool = None
+
+    def snapshot(self):
+        return take_snapshot({"player": self.player, "world": self.world})
+
+    def test_restores_attack_effect_boss_and_projectiles(self):
+        state = restore_snapshot(self.snapshot())
+        world = state["world"]
+
+        effects = list(world.query("effect"))
+        self.assertEqual(len(effects), 1)
+        self.assertIsInstance(effects[0], AttackEffect)
+        self.assertEqual(effects[0].lifetime, 5)
+
+        bosses = list(world.query("enemy"))
+        self.assertEqual(len(bosses), 1)
+        self.assertEqual(bosses[0].name, self.boss.name)
+        self.assertEqual(bosses[0].health, self.boss.health)
+        self.assertEqual(len(world.query("projectile")), 3)
+
+        # Las entidades restauradas son copias con sus handles intactos
+        self.assertIsNot(bosses[0], self.boss)
+        table = world.query("enemy")
+        self.assertIs(table.get(table.handle_of(bosses[0])), bosses[0])
+
+    def test_restores_more_than_once(self):
+        snapshot = self.snapshot()
+        first = restore_snapshot(snapshot)["world"]
+        second = restore_snapshot(snapshot)["world"]
+        self.assertIsNot(next(iter(first.query("effect"))), next(iter(second.query("effect"))))
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,50 @@
+"""
+Pruebas del director de oleadas
+Ejecutar desde la raíz del proyecto: python -m pytest tests
+"""
+
+import os
+import sys
+import unittest
+
+root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(root, "src"))
+sys.path.insert(0, root)
+
+from waves import WaveDirector
+
+# Perfilador que siempre se pasa del presupuesto (máquina lenta)
+class SlowProfiler:
+    def over_budget(self, ratio=1.0):
+        return True
+
+class WaveDirectorTest(unittest.TestCase):
+    def run_level(self, director, profiler, alive_limit=3, frames=100000):
+        """Simular un nivel: los enemigos mueren al llegar al límite de vivos"""
+        alive = 0
+        for frame in range(frames):
+            if director.is_finished():
+                return frame
+            alive += len(director.update(alive, profiler))
+            if alive >= alive_limit:
+                alive = 0
+        self.fail("las oleadas no terminaron")
+
+    def test_finishes_when_always_over_budget(self):
+        director = WaveDirector(3, 20)
+        self.run_level(director, SlowProfiler())
+        self.assertEqual(director.remaining, 0)
+        self.assertGreater(director.throttled_frames, 0)
+
+    def test_spawns_on_empty_screen_when_over_budget(self):
+        director = WaveDirector(1, 5, waves=[{"count": 5}])
+        self.assertTrue(director.update(0, SlowProfiler()))
+
+    def test_throttle_streak_is_capped(self):
+        director = WaveDirector(1, 5, waves=[{"count": 5}])
+        spawns = [director.update(1, SlowProfiler()) for _ in range(director.max_throttle + 1)]
+        self.assertEqual(sum(map(len, spawns[:-1])), 0)
+        self.assertTrue(spawns[-1])
+
+if __name__ == "__main__":
+    unittest.main()